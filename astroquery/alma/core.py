@@ -400,30 +400,36 @@ class AlmaClass(QueryWithLogin):
 
         return data_sizes, totalsize.to(u.GB)
 
-    def download_files(self, files, savedir=None, cache=True, continuation=True):
+    def download_files(self, files, savedir=None, cache=True,
+                       continuation=True, max_workers=4):
         """
         Given a list of file URLs, download them
 
         Note: Given a list with repeated URLs, each will only be downloaded
         once, so the return may have a different length than the input list
+
+        Up to ``max_workers`` files are downloaded at the same time.  Files
+        that cannot be accessed (HTTP 401) are skipped; any other download
+        error is raised once all the downloads are finished.
         """
-        downloaded_files = []
         if savedir is None:
             savedir = self.cache_location
-        for fileLink in unique(files):
-            try:
-                filename = self._request("GET", fileLink, save=True,
-                                         savedir=savedir,
-                                         timeout=self.TIMEOUT, cache=cache,
-                                         continuation=continuation)
-                downloaded_files.append(filename)
-            except requests.HTTPError as ex:
-                if ex.response.status_code == 401:
-                    log.info("Access denied to {url}.  Skipping to"
-                             " next file".format(url=fileLink))
-                    continue
-                else:
-                    raise ex
+        file_links = list(unique(files))
+        manifest = self._download_files_parallel(
+            file_links, [self._local_filepath(fileLink, savedir)
+                         for fileLink in file_links],
+            max_workers=max_workers, timeout=self.TIMEOUT, cache=cache,
+            continuation=continuation)
+
+        downloaded_files = []
+        for row in manifest:
+            if row['Status'] == 'COMPLETE':
+                downloaded_files.append(row['Local Path'])
+            elif row['HTTP Status'] == 401:
+                log.info("Access denied to {url}.  Skipping to"
+                         " next file".format(url=row['URL']))
+            else:
+                raise row['Exception']
         return downloaded_files
 
     def retrieve_data_from_uid(self, uids, cache=True):
@@ -2,6 +2,7 @@
 import numpy as np
 import os
 import pytest
+import requests
 from ...utils.testing_tools import MockResponse
 from ...exceptions import (InvalidQueryError)
 
@@ -195,3 +196,26 @@ def test_parse_staging_request_page_mous_cycle0(monkeypatch):
     assert tbl[0]['uid'] == 'uid://A002/X327408/X246'
     np.testing.assert_approx_equal(tbl[0]['size'], 5.9)
     assert len(tbl) == 32
+
+
+def test_download_files_errors(tmpdir, monkeypatch):
+    def download_file(url, local_filepath, **kwargs):
+        if url.endswith('denied.tar'):
+            response = requests.Response()
+            response.status_code = 401
+            raise requests.HTTPError('401 Unauthorized', response=response)
+        if url.endswith('slow.tar'):
+            raise requests.Timeout('Read timed out')
+        with open(local_filepath, 'wb') as f:
+            f.write(b'data')
+
+    alma = Alma()
+    alma.cache_location = str(tmpdir)
+    monkeypatch.setattr(alma, '_download_file', download_file)
+    base = 'https://almascience.eso.org/dataPortal/'
+    files = alma.download_files([base + 'ok.tar', base + 'denied.tar'])
+    assert files == [str(tmpdir.join('ok.tar'))]
+
+    # other errors are raised as they occurred
+    with pytest.raises(requests.Timeout):
+        alma.download_files([base + 'ok.tar', base + 'slow.tar'])
@@ -0,0 +1,518 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Response cache backends used by `~astroquery.query.BaseQuery`.
+
+Every query class stores the HTTP responses it receives below its
+``cache_location``.  The default backend keeps them in a single indexed
+SQLite database per service, holding only the status, headers and body of
+each response, with a bounded size (least recently used entries are evicted
+first) and an optional time-to-live.  The legacy one-pickle-per-request
+layout is still available as the ``pickle`` backend.
+
+Python objects derived from the responses, such as parsed tables, are kept
+in the same database (see `ObjectCache`), with the same size bound and
+eviction.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import abc
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import six
+from astropy import config as _config
+from astropy.logger import log
+import astropy.units as u
+
+__all__ = ['Conf', 'conf', 'CacheBackend', 'SQLiteCache', 'ObjectCache',
+           'PickleCache', 'get_cache_backend', 'get_object_cache']
+
+
+class Conf(_config.ConfigNamespace):
+    """
+    Configuration parameters for the astroquery response cache.
+    """
+    backend = _config.ConfigItem(
+        ['sqlite', 'pickle'],
+        'Storage used for cached HTTP responses: a single indexed SQLite '
+        'database per service, or one pickle file per request.')
+    max_size = _config.ConfigItem(
+        1024,
+        'Maximum size of the response cache of each service, in megabytes. '
+        'Least recently used responses are evicted first.  Set to 0 for an '
+        'unbounded cache.')
+    ttl = _config.ConfigItem(
+        0,
+        'Default time, in seconds, after which a cached response expires. '
+        'Set to 0 for responses that never expire.')
+
+
+conf = Conf()
+
+
+def _to_seconds(value):
+    if value is None:
+        return None
+    if hasattr(value, 'total_seconds'):
+        return value.total_seconds()
+    if hasattr(value, 'to'):
+        return value.to(u.s).value
+    return float(value)
+
+
+def _body_to_blob(body):
+    """Encode a request body for storage, remembering whether it was text."""
+    if body is None:
+        return None, False
+    if isinstance(body, six.text_type):
+        return body.encode('utf-8'), True
+    if isinstance(body, bytes):
+        return body, False
+    # generators and file-like bodies (streamed uploads) are not replayable
+    return None, False
+
+
+def _blob_to_body(blob, is_text):
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    return blob.decode('utf-8') if is_text else blob
+
+
+@six.add_metaclass(abc.ABCMeta)
+class CacheBackend(object):
+    """
+    Interface shared by all response cache backends.
+
+    Entries are keyed on `~astroquery.query.AstroQuery.hash`.  A backend
+    must be safe to use from several threads of the same process.
+    """
+
+    def __init__(self, location):
+        self.location = location
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def get(self, key, ttl=None):
+        """
+        Return the cached `requests.Response` for ``key``, or `None` if it is
+        not in the cache or is older than ``ttl`` seconds.
+        """
+
+    @abc.abstractmethod
+    def set(self, key, response):
+        """Store ``response`` under ``key``."""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """Remove ``key`` from the cache, if present."""
+
+    @abc.abstractmethod
+    def clear(self, older_than=None):
+        """
+        Remove all entries, or only those stored more than ``older_than``
+        seconds ago.  Returns the number of removed entries.
+        """
+
+    @abc.abstractmethod
+    def stats(self):
+        """Return a dictionary describing the content of the cache."""
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Response cache stored in a single SQLite database.
+
+    Parameters
+    ----------
+    location : str
+        Directory holding the ``responses.sqlite`` database.
+    max_size : int or None
+        Maximum total size of the stored bodies, in bytes.  `None` or 0
+        means unbounded.
+    """
+
+    filename = 'responses.sqlite'
+    table = 'responses'
+    # columns stored between the key and the size and times of each entry
+    columns = ('url TEXT', 'status INTEGER', 'reason TEXT', 'encoding TEXT',
+               'headers TEXT', 'content BLOB', 'request_method TEXT',
+               'request_url TEXT', 'request_body BLOB',
+               'request_body_is_text INTEGER')
+
+    def __init__(self, location, max_size=None):
+        super(SQLiteCache, self).__init__(location)
+        self.max_size = max_size or None
+        self.path = os.path.join(location, self.filename)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30,
+                                           check_same_thread=False,
+                                           isolation_level=None)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS {0} (key TEXT PRIMARY KEY, {1}, "
+                "size INTEGER, created REAL, accessed REAL)".format(
+                    self.table, ', '.join(self.columns)))
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS {0}_accessed "
+                "ON {0} (accessed)".format(self.table))
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS {0}_created "
+                "ON {0} (created)".format(self.table))
+            # running total of the stored bodies, kept up to date by set,
+            # delete and clear so that eviction does not scan the table
+            self._size, = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM {0}".format(
+                    self.table)).fetchone()
+
+    def _execute(self, statement, parameters=()):
+        with self._lock:
+            return self._connection.execute(
+                statement.format(self.table), parameters).fetchall()
+
+    def _get_row(self, key, columns, ttl=None):
+        """
+        Return the ``columns`` of the entry stored under ``key``, marking it
+        as used, or `None` if it is missing or older than ``ttl`` seconds.
+        """
+        rows = self._execute(
+            "SELECT created, " + ', '.join(columns) +
+            " FROM {0} WHERE key = ?", (key,))
+        if not rows:
+            return None
+        now = time.time()
+        if ttl and rows[0][0] < now - ttl:
+            log.debug("Cached entry {0} of {1} has expired".format(
+                key, self.path))
+            self.delete(key)
+            return None
+        self._execute("UPDATE {0} SET accessed = ? WHERE key = ?",
+                      (now, key))
+        return rows[0][1:]
+
+    def _set_row(self, key, values, size):
+        """
+        Store ``values`` (one per column) under ``key``, then evict the least
+        recently used entries if the cache is over ``max_size``.
+        """
+        now = time.time()
+        with self._lock:
+            replaced = self._connection.execute(
+                "SELECT size FROM {0} WHERE key = ?".format(self.table),
+                (key,)).fetchall()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO {0} VALUES ({1})".format(
+                    self.table, ', '.join('?' * (len(values) + 4))),
+                (key,) + tuple(values) + (size, now, now))
+            self._size += size - sum(old for old, in replaced)
+        if self.max_size:
+            self._evict()
+
+    def get(self, key, ttl=None):
+        row = self._get_row(key, ('url', 'status', 'reason', 'encoding',
+                                  'headers', 'content', 'request_method',
+                                  'request_url', 'request_body',
+                                  'request_body_is_text'), ttl=ttl)
+        if row is None:
+            self.misses += 1
+            return None
+
+        (url, status, reason, encoding, headers, content, request_method,
+         request_url, request_body, request_body_is_text) = row
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.encoding = encoding
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = bytes(content)
+        response._content_consumed = True
+        if request_method is not None:
+            request = requests.PreparedRequest()
+            request.method = request_method
+            request.url = request_url
+            request.headers = CaseInsensitiveDict()
+            request.body = _blob_to_body(request_body, request_body_is_text)
+            response.request = request
+
+        self.hits += 1
+        log.debug("Retrieving data from {0} ({1})".format(self.path, key))
+        return response
+
+    def set(self, key, response):
+        content = response.content or b''
+        request = getattr(response, 'request', None)
+        if request is not None:
+            request_body, request_body_is_text = _body_to_blob(request.body)
+            request_method, request_url = request.method, request.url
+        else:
+            request_body, request_body_is_text = None, False
+            request_method = request_url = None
+        log.debug("Caching data to {0} ({1})".format(self.path, key))
+        self._set_row(
+            key,
+            (response.url, response.status_code,
+             getattr(response, 'reason', None),
+             getattr(response, 'encoding', None),
+             json.dumps(dict(response.headers or {})),
+             sqlite3.Binary(content), request_method, request_url,
+             None if request_body is None else sqlite3.Binary(request_body),
+             int(request_body_is_text)),
+            len(content))
+
+    def _evict(self):
+        """Drop least recently used entries until under ``max_size``."""
+        with self._lock:
+            if self._size <= self.max_size:
+                return
+            cursor = self._connection.execute(
+                "SELECT key, size FROM {0} ORDER BY accessed".format(
+                    self.table))
+            evicted = []
+            for key, size in cursor:
+                if self._size <= self.max_size:
+                    break
+                evicted.append((key,))
+                self._size -= size
+            self._connection.executemany(
+                "DELETE FROM {0} WHERE key = ?".format(self.table), evicted)
+        log.debug("Evicted {0} entries from {1} ({2})".format(
+            len(evicted), self.path, self.table))
+
+    def delete(self, key):
+        with self._lock:
+            deleted = self._connection.execute(
+                "SELECT size FROM {0} WHERE key = ?".format(self.table),
+                (key,)).fetchall()
+            self._connection.execute(
+                "DELETE FROM {0} WHERE key = ?".format(self.table), (key,))
+            self._size -= sum(old for old, in deleted)
+
+    def clear(self, older_than=None):
+        with self._lock:
+            if older_than is None:
+                cursor = self._connection.execute(
+                    "DELETE FROM {0}".format(self.table))
+                self._size = 0
+            else:
+                cutoff = time.time() - older_than
+                cleared, = self._connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM {0} "
+                    "WHERE created < ?".format(self.table),
+                    (cutoff,)).fetchone()
+                cursor = self._connection.execute(
+                    "DELETE FROM {0} WHERE created < ?".format(self.table),
+                    (cutoff,))
+                self._size -= cleared
+            removed = cursor.rowcount
+            self._connection.execute("VACUUM")
+        return removed
+
+    def stats(self):
+        (entries, size, oldest, newest), = self._execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created), "
+            "MAX(created) FROM {0}")
+        return {'backend': 'sqlite', 'location': self.path,
+                'entries': entries, 'size': size, 'max_size': self.max_size,
+                'oldest': oldest, 'newest': newest,
+                'hits': self.hits, 'misses': self.misses}
+
+
+class ObjectCache(SQLiteCache):
+    """
+    Cache of Python objects, such as the tables parsed from downloaded
+    files, stored pickled in their own table of the ``responses.sqlite``
+    database of a service.
+
+    Entries that cannot be unpickled any more (written by an incompatible
+    version) are dropped and reported as missing.
+
+    Parameters
+    ----------
+    location : str
+        Directory holding the ``responses.sqlite`` database.
+    namespace : str
+        Name of the set of objects, made of letters, digits and underscores.
+    max_size : int or None
+        Maximum total size of the pickled objects, in bytes.  `None` or 0
+        means unbounded.
+    """
+
+    columns = ('value BLOB',)
+
+    def __init__(self, location, namespace, max_size=None):
+        if not re.match(r'^\w+$', namespace):
+            raise ValueError("Invalid object cache namespace "
+                             "'{0}'".format(namespace))
+        self.namespace = namespace
+        self.table = 'objects_' + namespace
+        super(ObjectCache, self).__init__(location, max_size=max_size)
+
+    def get(self, key, ttl=None):
+        """
+        Return the object stored under ``key``, or `None` if it is not in
+        the cache or is older than ``ttl`` seconds.
+        """
+        row = self._get_row(key, ('value',), ttl=ttl)
+        obj = None
+        if row is not None:
+            try:
+                obj = pickle.loads(bytes(row[0]))
+            except Exception as ex:
+                log.debug("Dropping unreadable cached entry {0} of {1} "
+                          "({2})".format(key, self.table, ex))
+                self.delete(key)
+        if obj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            log.debug("Retrieving {0} from {1} ({2})".format(
+                self.namespace, self.path, key))
+        return obj
+
+    def set(self, key, obj):
+        """Store ``obj`` under ``key``."""
+        value = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        log.debug("Caching {0} to {1} ({2})".format(self.namespace,
+                                                   self.path, key))
+        self._set_row(key, (sqlite3.Binary(value),), len(value))
+
+    def stats(self):
+        stats = super(ObjectCache, self).stats()
+        stats['namespace'] = self.namespace
+        return stats
+
+
+class PickleCache(CacheBackend):
+    """
+    Legacy response cache storing each `requests.Response` as its own
+    ``<hash>.pickle`` file.  Kept for compatibility with existing caches;
+    it is neither size bounded nor indexed.
+    """
+
+    def _path(self, key):
+        return os.path.join(self.location, key + ".pickle")
+
+    def _entries(self):
+        for filename in os.listdir(self.location):
+            if filename.endswith('.pickle'):
+                yield os.path.join(self.location, filename)
+
+    def get(self, key, ttl=None):
+        path = self._path(key)
+        try:
+            if ttl and os.path.getmtime(path) < time.time() - ttl:
+                os.remove(path)
+                response = None
+            else:
+                with open(path, "rb") as f:
+                    response = pickle.load(f)
+                if not isinstance(response, requests.Response):
+                    response = None
+        except (IOError, OSError):  # TODO: change to FileNotFoundError once drop py2 support
+            response = None
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            log.debug("Retrieving data from {0}".format(path))
+        return response
+
+    def set(self, key, response):
+        path = self._path(key)
+        log.debug("Caching data to {0}".format(path))
+        with open(path, "wb") as f:
+            pickle.dump(response, f)
+
+    def delete(self, key):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def clear(self, older_than=None):
+        removed = 0
+        for path in list(self._entries()):
+            if (older_than is None or
+                    os.path.getmtime(path) < time.time() - older_than):
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self):
+        paths = list(self._entries())
+        mtimes = [os.path.getmtime(path) for path in paths]
+        return {'backend': 'pickle', 'location': self.location,
+                'entries': len(paths),
+                'size': sum(os.path.getsize(path) for path in paths),
+                'max_size': None,
+                'oldest': min(mtimes) if mtimes else None,
+                'newest': max(mtimes) if mtimes else None,
+                'hits': self.hits, 'misses': self.misses}
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_cache_backend(location, backend=None):
+    """
+    Return the response cache for ``location``, shared by every query
+    instance using that directory.
+
+    Parameters
+    ----------
+    location : str
+        The cache directory, usually ``BaseQuery.cache_location``.
+    backend : str, optional
+        ``'sqlite'`` or ``'pickle'``.  Defaults to ``conf.backend``.
+    """
+    backend = backend or conf.backend
+    key = (os.path.abspath(location), backend)
+    with _backends_lock:
+        if key not in _backends:
+            if not os.path.exists(location):
+                os.makedirs(location)
+            if backend == 'sqlite':
+                _backends[key] = SQLiteCache(location,
+                                             max_size=conf.max_size * 2**20)
+            elif backend == 'pickle':
+                _backends[key] = PickleCache(location)
+            else:
+                raise ValueError("Unknown cache backend '{0}'; use 'sqlite' "
+                                 "or 'pickle'".format(backend))
+        return _backends[key]
+
+
+def get_object_cache(location, namespace, max_size=None):
+    """
+    Return the `ObjectCache` for ``namespace`` in ``location``, shared by
+    every user of that directory.
+
+    Parameters
+    ----------
+    location : str
+        The cache directory, usually ``BaseQuery.cache_location``.
+    namespace : str
+        Name of the set of objects.
+    max_size : int, optional
+        Maximum size of the cache, in bytes.  Defaults to ``conf.max_size``.
+    """
+    key = (os.path.abspath(location), 'objects', namespace)
+    with _backends_lock:
+        if key not in _backends:
+            if not os.path.exists(location):
+                os.makedirs(location)
+            if max_size is None:
+                max_size = conf.max_size * 2**20
+            _backends[key] = ObjectCache(location, namespace,
+                                         max_size=max_size)
+        return _backends[key]
@@ -9,10 +9,14 @@ from ..utils import async_to_sync
 from . import conf
 
 import os
+import re
+import six
 from astropy import units as u
 from astropy.table import Table
 from astropy.table import MaskedColumn
 from copy import copy
+from collections import OrderedDict
+import numpy as np
 
 try:
     from mocpy import MOC
@@ -30,6 +34,9 @@ except ImportError:
 
 __all__ = ['cds', 'CdsClass']
 
+# matches the strings which `float` cannot convert because of their first character
+_NOT_A_NUMBER = re.compile(r'\s*[^\d\s+\-.nNiI]', re.UNICODE)
+
 
 @async_to_sync
 class CdsClass(BaseQuery):
@@ -55,6 +62,7 @@ class CdsClass(BaseQuery):
         super(CdsClass, self).__init__()
         self.path_moc_file = None
         self.return_moc = False
+        self.fields = None
 
     def query_region(self, region=None, get_query_payload=False, verbose=False, **kwargs):
         """
@@ -90,7 +98,7 @@ class CdsClass(BaseQuery):
             Has sense only if ``return_moc`` is set to True. Specifies the maximum precision order of the returned MOC.
         fields : [str], optional
             Has sense only if ``return_moc`` is set to False. Specifies which meta datas to retrieve. The returned
-            `astropy.table.Table` table will only contain the column names given in ``fields``.
+            `astropy.table.Table` table will only contain the column names given in ``fields``, in that order.
 
             Specifying the fields we want to retrieve allows the request to be faster because of the reduced chunk of
             data moving from the MOCServer to the client.
@@ -146,7 +154,7 @@ class CdsClass(BaseQuery):
             <http://alasky.unistra.fr/MocServer/example>`_ (especially see the urls).
         fields : [str], optional
             Has sense only if ``return_moc`` is set to False. Specifies which meta datas to retrieve. The returned
-            `astropy.table.Table` table will only contain the column names given in ``fields``.
+            `astropy.table.Table` table will only contain the column names given in ``fields``, in that order.
 
             Specifying the fields we want to retrieve allows the request to be faster because of the reduced chunk of
             data moving from the MOCServer to the client.
@@ -239,6 +247,7 @@ class CdsClass(BaseQuery):
             The payload submitted to the MOCServer.
         """
         request_payload = dict()
+        self.fields = None
         intersect = kwargs.get('intersect', 'overlaps')
         if intersect == 'encloses':
             intersect = 'enclosed'
@@ -285,13 +294,16 @@ class CdsClass(BaseQuery):
             # The CDS MOC service responds badly to record queries which do not ask
             # for the ID field. To prevent that, we add it to the list of requested fields
             field_l.append('ID')
-            field_l = list(set(field_l))
+            # remove the doubles, keeping the order of the fields
+            field_l = [field for i, field in enumerate(field_l)
+                       if field not in field_l[:i]]
             fields_str = str(field_l[0])
             for field in field_l[1:]:
                 fields_str += ', '
                 fields_str += field
 
             request_payload.update({"fields": fields_str})
+            self.fields = field_l
 
         if 'max_rec' in kwargs:
             max_rec = kwargs['max_rec']
@@ -333,53 +345,7 @@ class CdsClass(BaseQuery):
             """
             The user will get `astropy.table.Table` object whose columns refer to the returned data-set meta-datas.
             """
-            # cast the data-sets meta-datas values to their correct Python type.
-            typed_result = []
-            for d in result:
-                typed_d = {k: self._cast_to_float(v) for k, v in d.items()}
-                typed_result.append(typed_d)
-
-            # looping over all the record's keys to find all the existing keys
-            column_names_l = []
-            for d in typed_result:
-                column_names_l.extend(d.keys())
-
-            # remove all the doubles
-            column_names_l = list(set(column_names_l))
-            # init a dict mapping all the meta-data's name to an empty list
-            table_d = {key: [] for key in column_names_l}
-            type_d = {key: None for key in column_names_l}
-
-            masked_array_d = {key: [] for key in column_names_l}
-            # fill the dict with the value of each returned data-set one by one.
-            for d in typed_result:
-                row_table_d = {key: None for key in column_names_l}
-                row_table_d.update(d)
-
-                for k, mask_l in masked_array_d.items():
-                    entry_masked = False if k in d.keys() else True
-                    mask_l.append(entry_masked)
-
-                for k, v in row_table_d.items():
-                    if v:
-                        type_d[k] = type(v)
-
-                    table_d[k].append(v)
-
-            # define all the columns using astropy.table.MaskedColumn objects
-            columns_l = []
-            for k, v in table_d.items():
-                try:
-                    if k != '#':
-                        columns_l.append(MaskedColumn(v, name=k, mask=masked_array_d[k], dtype=type_d[k]))
-                except ValueError:
-                    # some metadata can be of multiple types when looking on all the datasets.
-                    # this can be due to internal typing errors of the metadatas.
-                    columns_l.append(MaskedColumn(v, name=k, mask=masked_array_d[k], dtype=object))
-                    pass
-
-            # return an `astropy.table.Table` object created from columns_l
-            return Table(columns_l)
+            return self._records_to_table(result, fields=self.fields)
 
         """
         The user will get `mocpy.MOC` object.
@@ -393,6 +359,74 @@ class CdsClass(BaseQuery):
         # return a `mocpy.MOC` object. See https://github.com/cds-astro/mocpy and the MOCPy's doc
         return MOC.from_json(empty_order_removed_d)
 
+    def _records_to_table(self, records, fields=None):
+        """
+        Build a table from the data-set records in a single sweep.
+
+        Every meta-data gets a list of values for all the records the first time it is met, and the indices of the
+        records giving it a value are collected. The values are then cast to float column by column, and each column
+        is typed after its last non-empty value.
+
+        Parameters
+        ----------
+        records : [dict]
+            The data-set records returned by the MOCServer.
+        fields : [str], optional
+            The requested meta-datas, whose columns come first and in this order.
+
+        Returns
+        -------
+        table : `astropy.table.Table`
+        """
+        n_records = len(records)
+        values_d = OrderedDict()
+        present_d = {}
+        for i, record in enumerate(records):
+            for k, v in record.items():
+                try:
+                    values = values_d[k]
+                except KeyError:
+                    values = values_d[k] = [None] * n_records
+                    present_d[k] = []
+                values[i] = v
+                present_d[k].append(i)
+        values_d.pop('#', None)
+
+        keys = list(values_d)
+        if fields is not None:
+            # the requested meta-datas come first, in the order they were asked for
+            keys = ([key for key in fields if key in values_d] +
+                    [key for key in keys if key not in fields])
+
+        # define all the columns using astropy.table.MaskedColumn objects
+        columns_l = []
+        for k in keys:
+            values = values_d[k]
+            present = present_d[k]
+            mask = np.ones(n_records, dtype=bool)
+            mask[present] = False
+            try:
+                # cast the whole column in one go when all its values are numbers
+                for i in present:
+                    values[i] = float(values[i])
+            except (ValueError, TypeError):
+                for i in present:
+                    value = values[i]
+                    # strings that cannot start a number are left as they are
+                    if not (isinstance(value, six.string_types) and
+                            _NOT_A_NUMBER.match(value)):
+                        values[i] = self._cast_to_float(value)
+            dtype = next((type(v) for v in reversed(values) if v), None)
+            try:
+                columns_l.append(MaskedColumn(values, name=k, mask=mask, dtype=dtype))
+            except ValueError:
+                # some metadata can be of multiple types when looking on all the datasets.
+                # this can be due to internal typing errors of the metadatas.
+                columns_l.append(MaskedColumn(values, name=k, mask=mask, dtype=object))
+
+        # return an `astropy.table.Table` object created from columns_l
+        return Table(columns_l)
+
     @staticmethod
     def _cast_to_float(value):
         """
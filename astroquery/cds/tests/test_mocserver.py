@@ -148,3 +148,33 @@ def test_intersect_param(intersect):
         assert request_payload['intersect'] == 'enclosed'
     else:
         assert request_payload['intersect'] == intersect
+
+
+def test_records_to_table():
+    records = [{'ID': 'CDS/A', 'moc_sky_fraction': '0.5', 'obs_title': 'A',
+                '#': 'ignored'},
+               {'ID': 'CDS/B', 'obs_title': 'B', 'nb_rows': '12'},
+               {'ID': 'CDS/C', 'moc_sky_fraction': '1', 'nb_rows': 'many',
+                'obs_regime': ['Optical', 'Infrared']}]
+    table = cds._records_to_table(records)
+    assert table.colnames == ['ID', 'moc_sky_fraction', 'obs_title',
+                              'nb_rows', 'obs_regime']
+    assert table['moc_sky_fraction'].dtype.kind == 'f'
+    assert list(table['moc_sky_fraction'].mask) == [False, True, False]
+    assert table['moc_sky_fraction'][2] == 1.
+    # columns mixing numbers and strings are typed after their last value
+    assert table['nb_rows'].dtype.kind == 'U'
+    assert table['nb_rows'][2] == 'many'
+    assert table['obs_regime'][2] == ['Optical', 'Infrared']
+
+    table = cds._records_to_table(records, fields=['obs_title', 'ID'])
+    assert table.colnames[:2] == ['obs_title', 'ID']
+
+
+def test_fields_payload():
+    payload = cds.find_datasets(meta_data='ID=*SDSS*',
+                                fields=['obs_title', 'moc_sky_fraction',
+                                        'obs_title'],
+                                get_query_payload=True)
+    assert payload['fields'] == 'obs_title, moc_sky_fraction, ID'
+    assert cds.fields == ['obs_title', 'moc_sky_fraction', 'ID']
@@ -19,6 +19,10 @@ class Conf(_config.ConfigNamespace):
     query_instrument_url = _config.ConfigItem(
         "http://archive.eso.org/wdb/wdb/eso",
         'Root query URL for main and instrument queries.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Number of requests and downloads run concurrently against the ESO '
+        'archive.')
 
 
 conf = Conf()
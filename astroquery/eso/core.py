@@ -4,25 +4,36 @@ import time
 import sys
 import os.path
 import shutil
+import threading
 import webbrowser
 import warnings
 import keyring
 import numpy as np
 import re
+from collections import OrderedDict
 from bs4 import BeautifulSoup
 
 from six import BytesIO
 import six
+try:
+    from html import unescape as html_unescape
+except ImportError:  # Python 2
+    from six.moves.html_parser import HTMLParser
+    html_unescape = HTMLParser().unescape
 from astropy.table import Table, Column
 from astropy import log
 
 from ..exceptions import LoginError, RemoteServiceError, NoResultsWarning
 from ..utils import schema, system_tools
+from ..utils.concurrency import get_executor
 from ..query import QueryWithLogin, suspend_cache
 from . import conf
 
 __doctest_skip__ = ['EsoClass.*']
 
+_PRE_RE = re.compile(r'<pre\b[^>]*>(.*?)</pre>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]*>')
+
 
 def _check_response(content):
     """
@@ -37,6 +48,63 @@ def _check_response(content):
         return True
 
 
+def _header_text(content):
+    """
+    Returns the text of the first ``<pre>`` element of a header page
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    match = _PRE_RE.search(content)
+    if match is None:
+        # not the expected layout, let a full HTML parser find it
+        root = BeautifulSoup(content, 'html5lib')
+        return root.select('pre')[0].text
+    return html_unescape(_TAG_RE.sub('', match.group(1)))
+
+
+def _parse_header(dp_id, hdr):
+    """
+    Returns the keywords of a header as a dictionary, starting with
+    ``DP.ID``
+    """
+    header = OrderedDict([('DP.ID', dp_id)])
+    for key_value in hdr.split('\n'):
+        if "=" in key_value:
+            key, value = key_value.split('=', 1)
+            key = key.strip()
+            value = value.split('/', 1)[0].strip()
+            if key[0:7] != "COMMENT":  # drop comments
+                if value == "T":  # Convert boolean T to True
+                    value = True
+                elif value == "F":  # Convert boolean F to False
+                    value = False
+                # Convert to string, removing quotation marks
+                elif value[0] == "'":
+                    value = value[1:-1]
+                elif "." in value:  # Convert to float
+                    value = float(value)
+                else:  # Convert to integer
+                    value = int(value)
+                header[key] = value
+        elif key_value.startswith("END"):
+            break
+    return header
+
+
+def _map(function, items, max_workers):
+    """
+    Returns ``[function(item) for item in items]``, computed by up to
+    ``max_workers`` threads.
+    """
+    if max_workers > 1 and len(items) > 1:
+        executor = get_executor(min(max_workers, len(items)))
+        try:
+            return list(executor.map(function, items))
+        finally:
+            executor.shutdown(wait=True)
+    return [function(item) for item in items]
+
+
 class EsoClass(QueryWithLogin):
 
     ROW_LIMIT = conf.row_limit
@@ -48,6 +116,9 @@ class EsoClass(QueryWithLogin):
         self._instrument_list = None
         self._survey_list = None
         self.username = None
+        self.download_manifest = None
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
 
     def _activate_form(self, response, form_index=0, form_id=None, inputs={},
                        cache=True, method=None):
@@ -487,7 +558,7 @@ class EsoClass(QueryWithLogin):
             else:
                 warnings.warn("Query returned no results", NoResultsWarning)
 
-    def get_headers(self, product_ids, cache=True):
+    def get_headers(self, product_ids, cache=True, max_workers=None):
         """
         Get the headers associated to a list of data product IDs
 
@@ -502,6 +573,9 @@ class EsoClass(QueryWithLogin):
         ----------
         product_ids : either a list of strings or a `~astropy.table.Column`
             List of data product IDs.
+        max_workers : int
+            Number of headers requested at the same time. Defaults to
+            ``conf.max_workers``.
 
         Returns
         -------
@@ -512,51 +586,37 @@ class EsoClass(QueryWithLogin):
         _schema_product_ids = schema.Schema(
             schema.Or(Column, [schema.Or(*six.string_types)]))
         _schema_product_ids.validate(product_ids)
-        # Get all headers
-        result = []
-        for dp_id in product_ids:
+        if max_workers is None:
+            max_workers = conf.max_workers
+
+        def get_header(dp_id):
             response = self._request(
                 "GET", "http://archive.eso.org/hdr?DpId={0}".format(dp_id),
                 cache=cache)
-            root = BeautifulSoup(response.content, 'html5lib')
-            hdr = root.select('pre')[0].text
-            header = {'DP.ID': dp_id}
-            for key_value in hdr.split('\n'):
-                if "=" in key_value:
-                    key, value = key_value.split('=', 1)
-                    key = key.strip()
-                    value = value.split('/', 1)[0].strip()
-                    if key[0:7] != "COMMENT":  # drop comments
-                        if value == "T":  # Convert boolean T to True
-                            value = True
-                        elif value == "F":  # Convert boolean F to False
-                            value = False
-                        # Convert to string, removing quotation marks
-                        elif value[0] == "'":
-                            value = value[1:-1]
-                        elif "." in value:  # Convert to float
-                            value = float(value)
-                        else:  # Convert to integer
-                            value = int(value)
-                        header[key] = value
-                elif key_value.startswith("END"):
-                    break
-            result.append(header)
-        # Identify all columns
-        columns = []
-        column_types = []
-        for header in result:
-            for key in header:
+            return _parse_header(dp_id, _header_text(response.content))
+
+        # Get all headers
+        result = _map(get_header, list(product_ids), max_workers)
+
+        # Collect the columns in a single pass, in order of appearance
+        columns = OrderedDict()
+        for row, header in enumerate(result):
+            for key, value in header.items():
                 if key not in columns:
-                    columns.append(key)
-                    column_types.append(type(header[key]))
-        # Add all missing elements
-        for i in range(len(result)):
-            for (column, column_type) in zip(columns, column_types):
-                if column not in result[i]:
-                    result[i][column] = column_type()
+                    columns[key] = [None] * row
+                columns[key].append(value)
+            for values in columns.values():
+                if len(values) == row:
+                    values.append(None)
+        # Add all missing elements, with the default value of the type
+        # found first in each column
+        for key, values in columns.items():
+            missing = type(next(value for value in values
+                                if value is not None))()
+            columns[key] = [missing if value is None else value
+                            for value in values]
         # Return as Table
-        return Table(result)
+        return Table(columns)
 
     def _check_existing_files(self, datasets, continuation=False,
                               destination=None):
@@ -611,16 +671,27 @@ class EsoClass(QueryWithLogin):
         """
         trials = 1
         while trials <= 2:
+            generation = self._login_generation
             resp = super(EsoClass, self)._download_file(url, local_filepath,
                                                         **kwargs)
 
             # trying to detect the failing authentication:
             # - content type should not be html
-            if (resp.headers['Content-Type'] == 'text/html;charset=UTF-8' and
+            # (no response is returned for complete files found locally)
+            if (resp is not None and
+                    resp.headers['Content-Type'] ==
+                    'text/html;charset=UTF-8' and
                     resp.url.startswith('https://www.eso.org/sso/login')):
                 if trials == 1:
-                    log.warning("Session expired, trying to re-authenticate")
-                    self.login()
+                    # several files may be downloaded at once: only the
+                    # first one to notice the expired session logs in again,
+                    # the others retry with the renewed session
+                    with self._login_lock:
+                        if self._login_generation == generation:
+                            log.warning("Session expired, trying to "
+                                        "re-authenticate")
+                            self.login()
+                            self._login_generation += 1
                     trials += 1
                 else:
                     raise LoginError("Could not authenticate")
@@ -630,7 +701,8 @@ class EsoClass(QueryWithLogin):
         return resp
 
     def retrieve_data(self, datasets, continuation=False, destination=None,
-                      with_calib='none', request_all_objects=False):
+                      with_calib='none', request_all_objects=False,
+                      max_workers=None):
         """
         Retrieve a list of datasets form the ESO archive.
 
@@ -655,11 +727,18 @@ class EsoClass(QueryWithLogin):
             downloaded ones, to be sure to retrieve all calibration files.
             This is useful when the download was interrupted. `False` by
             default.
+        max_workers : int
+            Number of availability checks and file downloads run at the same
+            time. Defaults to ``conf.max_workers``.
 
         Returns
         -------
         files : list of strings or string
             List of files that have been locally downloaded from the archive.
+            The ``download_manifest`` attribute then holds a
+            `~astropy.table.Table` describing each downloaded file: its
+            ``URL``, ``Local Path``, ``Status``, ``Size`` (bytes), ``Time``
+            (s) and ``Throughput`` (bytes/s).
 
         Examples
         --------
@@ -682,6 +761,9 @@ class EsoClass(QueryWithLogin):
             return_list = True
         if not isinstance(datasets, (list, tuple, np.ndarray)):
             raise TypeError("Datasets must be given as a list of strings.")
+        if max_workers is None:
+            max_workers = conf.max_workers
+        self.download_manifest = None
 
         # First: Detect datasets already downloaded
         if with_calib != 'none' and request_all_objects:
@@ -693,8 +775,8 @@ class EsoClass(QueryWithLogin):
 
         # Second: Check that the datasets to download are in the archive
         log.info("Checking availability of datasets to download...")
-        valid_datasets = [self.verify_data_exists(ds)
-                          for ds in datasets_to_download]
+        valid_datasets = _map(self.verify_data_exists, datasets_to_download,
+                              max_workers)
         if not all(valid_datasets):
             invalid_datasets = [ds for ds, v in zip(datasets_to_download,
                                                     valid_datasets) if not v]
@@ -805,12 +887,23 @@ class EsoClass(QueryWithLogin):
             nfiles = len(fileLinks)
             log.info("Downloading {} files...".format(nfiles))
             log.debug("Files:\n{}".format('\n'.join(fileLinks)))
-            for i, fileLink in enumerate(fileLinks, 1):
-                fileId = fileLink.rsplit('/', maxsplit=1)[1]
-                log.info("Downloading file {}/{}: {}..."
-                         .format(i, nfiles, fileId))
-                filename = self._request("GET", fileLink, save=True,
-                                         continuation=True)
+            manifest = self._download_files_parallel(
+                fileLinks, [self._local_filepath(fileLink)
+                            for fileLink in fileLinks],
+                max_workers=max_workers, cache=True, continuation=True)
+            manifest['Throughput'] = (manifest['Size'] /
+                                      np.maximum(manifest['Time'], 1e-6))
+            self.download_manifest = manifest
+
+            failed = []
+            for row in manifest:
+                fileId = row['URL'].rsplit('/', maxsplit=1)[1]
+                if row['Status'] != 'COMPLETE':
+                    failed.append("{0} ({1})".format(fileId, row['Message']))
+                    continue
+                log.debug("Downloaded file {0}: {1} bytes in {2:.1f}s"
+                          .format(fileId, row['Size'], row['Time']))
+                filename = row['Local Path']
 
                 if filename.endswith(('.gz', '.7z', '.bz2', '.xz', '.Z')):
                     log.info("Unzipping file {0}...".format(fileId))
@@ -823,6 +916,10 @@ class EsoClass(QueryWithLogin):
                     files.append(destfile)
                 else:
                     files.append(filename)
+            if failed:
+                raise RemoteServiceError("The following files could not be "
+                                         "downloaded: {0}"
+                                         .format(", ".join(failed)))
 
         # Empty the redirect cache of this request session
         # Only available and needed for requests versions < 2.17
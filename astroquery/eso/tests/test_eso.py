@@ -1,8 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import os
+import threading
+
 from ...utils.testing_tools import MockResponse
+from ...utils.concurrency import get_executor
 
 from ...eso import Eso
+from ...query import QueryWithLogin
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
@@ -94,3 +98,116 @@ def test_vvv(monkeypatch):
     assert result_s is not None
     assert 'Object' in result_s.colnames
     assert 'b333' in result_s['Object']
+
+
+HEADER_PAGE = """<html><head><title>Header of {0}</title></head><body>
+<h2>Header of {0}</h2>
+<pre>
+SIMPLE  =                    T / Standard FITS format
+BITPIX  =                   16 / # of bits storing pix values
+EXPTIME =               10.000 / Total integration time
+OBJECT  = 'Sgr A* &amp; IRS7'  / Original target
+{1}COMMENT = 'dropped'
+END
+</pre>
+</body></html>
+"""
+
+
+def test_get_headers(monkeypatch):
+    eso = Eso()
+
+    def header_request(request_type, url, **kwargs):
+        dp_id = url.split('DpId=')[1]
+        extra = ("<a href='x'>HIERARCH ESO DPR TYPE</a> = 'DARK' / "
+                 "type\n" if dp_id.endswith('2') else "")
+        return MockResponse(content=HEADER_PAGE.format(dp_id, extra)
+                            .encode('utf-8'), url=url)
+
+    monkeypatch.setattr(eso, '_request', header_request)
+    dp_ids = ['NACO.2008-01-0{0}'.format(ii) for ii in range(1, 6)]
+    for max_workers in (1, 3):
+        result = eso.get_headers(dp_ids, max_workers=max_workers)
+        assert result.colnames == ['DP.ID', 'SIMPLE', 'BITPIX', 'EXPTIME',
+                                   'OBJECT', 'HIERARCH ESO DPR TYPE']
+        assert list(result['DP.ID']) == dp_ids
+        assert list(result['OBJECT']) == ['Sgr A* & IRS7'] * 5
+        assert list(result['HIERARCH ESO DPR TYPE']) == ['', 'DARK', '', '',
+                                                         '']
+        assert result['BITPIX'][0] == 16
+        assert result['EXPTIME'][4] == 10.0
+        assert result['SIMPLE'][2]
+
+
+def test_retrieve_data_parallel(monkeypatch, tmpdir):
+    eso = Eso()
+    eso.cache_location = tmpdir.strpath
+    datasets = ['NACO.2008-01-0{0}'.format(ii) for ii in range(1, 5)]
+    download_form = ('<html><span id="requestState">COMPLETE</span>' +
+                     ''.join('<input name="fileId" value="{0} '
+                             '/file/{0}.fits"/>'.format(dataset)
+                             for dataset in datasets) + '</html>')
+    forms = [MockResponse(content=b'<html></html>', url='confirm'),
+             MockResponse(content=download_form.encode('utf-8'),
+                          url='download')]
+    checked = []
+
+    def verify_data_exists(dataset):
+        checked.append(dataset)
+        return True
+
+    def download_file(url, local_filepath, **kwargs):
+        assert kwargs['continuation']
+        with open(local_filepath, 'wb') as f:
+            f.write(url.encode('utf-8'))
+
+    monkeypatch.setattr(eso, 'authenticated', lambda: True)
+    monkeypatch.setattr(eso, 'verify_data_exists', verify_data_exists)
+    monkeypatch.setattr(eso, '_request',
+                        lambda *args, **kwargs: MockResponse(content=b''))
+    monkeypatch.setattr(eso, '_activate_form',
+                        lambda *args, **kwargs: forms.pop(0))
+    monkeypatch.setattr(eso, '_download_file', download_file)
+
+    files = eso.retrieve_data(datasets, max_workers=3)
+    assert sorted(checked) == datasets
+    assert files == [os.path.join(tmpdir.strpath, dataset + '.fits')
+                     for dataset in datasets]
+    manifest = eso.download_manifest
+    assert list(manifest['Status']) == ['COMPLETE'] * 4
+    assert list(manifest['Local Path']) == files
+    assert all(manifest['Throughput'] > 0)
+
+
+def test_download_file_relogin_once(monkeypatch, tmpdir):
+    eso = Eso()
+    nthreads = 4
+    # every thread sees the expired session before any of them logs in again
+    lock = threading.Lock()
+    arrived = []
+    all_expired = threading.Event()
+    logins = []
+
+    def download_file(self, url, local_filepath, **kwargs):
+        if not logins:
+            with lock:
+                arrived.append(url)
+                if len(arrived) == nthreads:
+                    all_expired.set()
+            assert all_expired.wait(10)
+            return MockResponse(
+                content=b'', url='https://www.eso.org/sso/login',
+                headers={'Content-Type': 'text/html;charset=UTF-8'})
+        return MockResponse(content=b'', url=url,
+                            headers={'Content-Type': 'application/fits'})
+
+    monkeypatch.setattr(QueryWithLogin, '_download_file', download_file)
+    monkeypatch.setattr(eso, 'login', lambda: logins.append(True))
+
+    urls = ['/file/{0}.fits'.format(ii) for ii in range(nthreads)]
+    with get_executor(nthreads) as executor:
+        responses = list(executor.map(
+            lambda url: eso._download_file(url, tmpdir.strpath),
+            urls))
+    assert len(logins) == 1
+    assert [resp.url for resp in responses] == urls
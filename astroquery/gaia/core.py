@@ -15,9 +15,14 @@ Created on 30 jun. 2016
 
 """
 
+import os
+import tempfile
+
+import numpy as np
 from astroquery.utils.tap import TapPlus
 from astroquery.utils import commons
 from astropy import units
+from astropy.table import Table, vstack
 from astropy.units import Quantity
 
 from . import conf
@@ -81,7 +86,8 @@ class GaiaClass(object):
 
     def launch_job(self, query, name=None, output_file=None,
                    output_format="votable", verbose=False, dump_to_file=False,
-                   upload_resource=None, upload_table_name=None):
+                   upload_resource=None, upload_table_name=None,
+                   cache=False):
         """Launches a synchronous job
         TAP & TAP+
 
@@ -102,6 +108,9 @@ class GaiaClass(object):
             resource to be uploaded to UPLOAD_SCHEMA
         upload_table_name: str, required if uploadResource is provided, default None
             resource temporary table name associated to the uploaded resource
+        cache : bool, optional, default 'False'
+            if True, the results are read from the local result cache when
+            the same query was run before, and are stored in it otherwise
 
         Returns
         -------
@@ -113,12 +122,14 @@ class GaiaClass(object):
                                          verbose=verbose,
                                          dump_to_file=dump_to_file,
                                          upload_resource=upload_resource,
-                                         upload_table_name=upload_table_name)
+                                         upload_table_name=upload_table_name,
+                                         cache=cache)
 
     def launch_job_async(self, query, name=None, output_file=None,
                          output_format="votable", verbose=False,
                          dump_to_file=False, background=False,
-                         upload_resource=None, upload_table_name=None):
+                         upload_resource=None, upload_table_name=None,
+                         cache=False):
         """Launches an asynchronous job
         TAP & TAP+
 
@@ -142,6 +153,9 @@ class GaiaClass(object):
             resource to be uploaded to UPLOAD_SCHEMA
         upload_table_name: str, required if uploadResource is provided, default None
             resource temporary table name associated to the uploaded resource
+        cache : bool, optional, default 'False'
+            if True, the results are read from the local result cache when
+            the same query was run before, and are stored in it otherwise
 
         Returns
         -------
@@ -155,7 +169,43 @@ class GaiaClass(object):
                                                dump_to_file=dump_to_file,
                                                background=background,
                                                upload_resource=upload_resource,
-                                               upload_table_name=upload_table_name)
+                                               upload_table_name=upload_table_name,
+                                               cache=cache)
+
+    def launch_jobs(self, queries, max_concurrent=4, output_format="votable",
+                    retries=2, timeout=None, verbose=False):
+        """Launches several asynchronous jobs concurrently
+        TAP & TAP+
+
+        Parameters
+        ----------
+        queries : list of str, mandatory
+            queries to be executed
+        max_concurrent : int, optional, default 4
+            maximum number of jobs running at the same time
+        output_format : str, optional, default 'votable'
+            results format
+        retries : int, optional, default 2
+            number of times the phase polling or the results download of a
+            job is retried after a connection error or a server side (5xx)
+            error. A job is only submitted again if the connection was
+            refused
+        timeout : float, optional, default None
+            maximum time to wait for each job, in seconds. No limit if None
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A list of Job objects, in the order of the queries, with their
+        results loaded. Jobs that did not complete are flagged as failed
+        """
+        return self.__gaiatap.launch_jobs(queries,
+                                          max_concurrent=max_concurrent,
+                                          output_format=output_format,
+                                          retries=retries,
+                                          timeout=timeout,
+                                          verbose=verbose)
 
     def load_async_job(self, jobid=None, name=None, verbose=False):
         """Loads an asynchronous job
@@ -445,6 +495,139 @@ class GaiaClass(object):
                                   verbose=verbose,
                                   dump_to_file=dump_to_file)
 
+    def cone_search_many(self, coordinates, radius=None, ids=None,
+                         background=False, output_file=None,
+                         output_format="votable", verbose=False,
+                         dump_to_file=False, stream=False):
+        """Cone searches around many positions in a single job (async)
+        TAP & TAP+
+
+        The positions are uploaded as a table and joined with the main Gaia
+        table on the server, so that a single asynchronous job is launched
+        whatever the number of positions. The results have a 'target_id'
+        column, with the identifier of the position each source matched,
+        and a 'dist' column, and are sorted by 'target_id' and by distance.
+        Positions without any source do not appear in the results.
+
+        Parameters
+        ----------
+        coordinates : astropy.coordinate or list, mandatory
+            coordinates of the center points: a SkyCoord array, or a list of
+            coordinates or strings
+        radius : astropy.units, mandatory
+            radius, either one for all the positions or one per position
+        ids : list, optional, default None
+            identifiers of the positions, used for the 'target_id' column.
+            If this parameter is not provided, the index of the position is
+            used instead
+        background : bool, optional, default 'False'
+            when the job is executed in asynchronous mode, this flag specifies
+            whether the execution will wait until results are available
+        output_file : str, optional, default None
+            file name where the results are saved if dumpToFile is True.
+            If this parameter is not provided, the jobid is used instead
+        output_format : str, optional, default 'votable'
+            results format
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+        dump_to_file : bool, optional, default 'False'
+            if True, the results are saved in a file instead of using memory
+        stream : bool, optional, default 'False'
+            if True, the results are not loaded in memory, and can be read
+            target by target with iter_cone_search_many
+
+        Returns
+        -------
+        A Job object
+        """
+        ra, dec = self.__getCoordArrays(coordinates, "coordinates")
+        if ids is None:
+            ids = np.arange(len(ra))
+        elif len(ids) != len(ra):
+            raise ValueError("There must be one id per coordinate")
+        radiusQuantity = self.__getQuantityInput(radius, "radius")
+        radiusDeg = radiusQuantity.to(units.deg).value
+        targets = Table([ids, ra, dec],
+                        names=['target_id', 'target_ra', 'target_dec'])
+        if np.ndim(radiusDeg) == 0:
+            circle_radius = str(float(radiusDeg))
+        elif len(radiusDeg) != len(ra):
+            raise ValueError("There must be one radius, or one per coordinate")
+        else:
+            targets['target_radius'] = radiusDeg
+            circle_radius = "t.target_radius"
+
+        upload_table_name = "cone_search_targets"
+        point = "POINT('ICRS',g."+str(self.MAIN_GAIA_TABLE_RA)+",g."\
+            + str(self.MAIN_GAIA_TABLE_DEC)+")"
+        query = "SELECT t.target_id, DISTANCE("+point+", \
+            POINT('ICRS',t.target_ra,t.target_dec)) AS dist, g.* \
+            FROM "+str(self.MAIN_GAIA_TABLE)+" AS g \
+            JOIN tap_upload."+upload_table_name+" AS t ON 1=CONTAINS("+point+", \
+            CIRCLE('ICRS',t.target_ra,t.target_dec,"+circle_radius+")) \
+            ORDER BY t.target_id ASC, dist ASC"
+
+        fd, upload_resource = tempfile.mkstemp(suffix='.xml')
+        os.close(fd)
+        try:
+            targets.write(upload_resource, format='votable', overwrite=True)
+            # the upload is read when the job is launched
+            return self.__gaiatap.launch_job_async(
+                query=query,
+                output_file=output_file,
+                output_format=output_format,
+                verbose=verbose,
+                dump_to_file=dump_to_file,
+                background=background,
+                upload_resource=upload_resource,
+                upload_table_name=upload_table_name,
+                stream=stream)
+        finally:
+            os.remove(upload_resource)
+
+    def iter_cone_search_many(self, job, chunk_rows=10000, verbose=False):
+        """Returns the results of cone_search_many target by target
+        TAP & TAP+
+
+        The results are read incrementally (see Job.iter_results), so that
+        the whole result is never held in memory.
+
+        Parameters
+        ----------
+        job : Job, mandatory
+            job launched by cone_search_many
+        chunk_rows : int, optional, default 10000
+            number of rows read at once
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A generator of (target_id, results) pairs, in the order of
+        'target_id'.
+        """
+        pending = []
+        for chunk in job.iter_results(chunk_rows=chunk_rows, verbose=verbose):
+            if len(chunk) == 0:
+                continue
+            target_ids = np.asarray(chunk['target_id'])
+            starts = np.concatenate(
+                ([0], np.flatnonzero(target_ids[1:] != target_ids[:-1]) + 1))
+            for start, end in zip(starts, np.append(starts[1:], len(chunk))):
+                # only the first group of a chunk can continue the last
+                # group of the previous one
+                if pending and \
+                        pending[0]['target_id'][0] != target_ids[start]:
+                    yield self.__target_results(pending)
+                    pending = []
+                pending.append(chunk[start:end])
+        if pending:
+            yield self.__target_results(pending)
+
+    def __target_results(self, tables):
+        results = tables[0] if len(tables) == 1 else vstack(tables)
+        return results['target_id'][0], results
+
     def remove_jobs(self, jobs_list, verbose=False):
         """Removes the specified jobs
         TAP+
@@ -534,6 +717,18 @@ class GaiaClass(object):
         else:
             return value
 
+    def __getCoordArrays(self, value, msg):
+        if isinstance(value, commons.CoordClasses) and not value.isscalar:
+            coords = value.transform_to('icrs')
+            return coords.ra.deg, coords.dec.deg
+        ra = []
+        dec = []
+        for item in value:
+            coord = self.__getCoordInput(item, msg).transform_to('icrs')
+            ra.append(coord.ra.deg)
+            dec.append(coord.dec.deg)
+        return np.array(ra), np.array(dec)
+
     def __checkCoordInput(self, value, msg):
         if not (isinstance(value, str) or isinstance(value, commons.CoordClasses)):
             raise ValueError(
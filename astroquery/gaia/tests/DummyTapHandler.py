@@ -78,7 +78,8 @@ class DummyTapHandler(object):
 
     def launch_job(self, query, name=None, output_file=None,
                    output_format="votable", verbose=False, dump_to_file=False,
-                   upload_resource=None, upload_table_name=None):
+                   upload_resource=None, upload_table_name=None,
+                   cache=False):
         self.__invokedMethod = 'launch_job'
         self.__parameters['query'] = query
         self.__parameters['name'] = name
@@ -88,12 +89,14 @@ class DummyTapHandler(object):
         self.__parameters['dump_to_file'] = dump_to_file
         self.__parameters['upload_resource'] = upload_resource
         self.__parameters['upload_table_name'] = upload_table_name
+        self.__parameters['cache'] = cache
         return None
 
     def launch_job_async(self, query, name=None, output_file=None,
                          output_format="votable", verbose=False,
                          dump_to_file=False, background=False,
-                         upload_resource=None, upload_table_name=None):
+                         upload_resource=None, upload_table_name=None,
+                         cache=False):
         self.__invokedMethod = 'launch_job_async'
         self.__parameters['query'] = query
         self.__parameters['name'] = name
@@ -104,6 +107,7 @@ class DummyTapHandler(object):
         self.__parameters['background'] = background
         self.__parameters['upload_resource'] = upload_resource
         self.__parameters['upload_table_name'] = upload_table_name
+        self.__parameters['cache'] = cache
         return None
 
     def load_async_job(self, jobid=None, name=None, verbose=False):
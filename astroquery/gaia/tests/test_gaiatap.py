@@ -25,9 +25,11 @@ from astroquery.utils.tap.conn.tests.DummyResponse import DummyResponse
 import astropy.units as u
 from astropy.coordinates.sky_coordinate import SkyCoord
 from astropy.units import Quantity
+from astropy.table import Table
 import numpy as np
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap.core import TapPlus
+from astroquery.utils.tap.model.job import Job
 
 
 def data_path(filename):
@@ -87,6 +89,7 @@ class TestTap(unittest.TestCase):
         parameters['dump_to_file'] = False
         parameters['upload_resource'] = None
         parameters['upload_table_name'] = None
+        parameters['cache'] = False
         tap.launch_job(query)
         dummyTapHandler.check_call('launch_job', parameters)
         # test with parameters
@@ -106,6 +109,7 @@ class TestTap(unittest.TestCase):
         parameters['dump_to_file'] = dump_to_file
         parameters['upload_resource'] = upload_resource
         parameters['upload_table_name'] = upload_table_name
+        parameters['cache'] = True
         tap.launch_job(query,
                        name=name,
                        output_file=output_file,
@@ -113,7 +117,8 @@ class TestTap(unittest.TestCase):
                        verbose=verbose,
                        dump_to_file=dump_to_file,
                        upload_resource=upload_resource,
-                       upload_table_name=upload_table_name)
+                       upload_table_name=upload_table_name,
+                       cache=True)
         dummyTapHandler.check_call('launch_job', parameters)
 
     def test_launch_async_job(self):
@@ -131,6 +136,7 @@ class TestTap(unittest.TestCase):
         parameters['background'] = False
         parameters['upload_resource'] = None
         parameters['upload_table_name'] = None
+        parameters['cache'] = False
         tap.launch_job_async(query)
         dummyTapHandler.check_call('launch_job_async', parameters)
         # test with parameters
@@ -152,6 +158,7 @@ class TestTap(unittest.TestCase):
         parameters['background'] = background
         parameters['upload_resource'] = upload_resource
         parameters['upload_table_name'] = upload_table_name
+        parameters['cache'] = True
         tap.launch_job_async(query,
                              name=name,
                              output_file=output_file,
@@ -160,7 +167,8 @@ class TestTap(unittest.TestCase):
                              dump_to_file=dump_to_file,
                              background=background,
                              upload_resource=upload_resource,
-                             upload_table_name=upload_table_name)
+                             upload_table_name=upload_table_name,
+                             cache=True)
         dummyTapHandler.check_call('launch_job_async', parameters)
 
     def test_list_async_jobs(self):
@@ -479,6 +487,59 @@ class TestTap(unittest.TestCase):
                                     None,
                                     np.int32)
 
+    def test_cone_search_many(self):
+        class UploadTapHandler(object):
+            def launch_job_async(self, query, upload_resource=None,
+                                 upload_table_name=None, **kwargs):
+                self.query = query
+                self.upload_table_name = upload_table_name
+                self.upload = Table.read(upload_resource, format='votable')
+                self.kwargs = kwargs
+                job = Job(async_job=True, query=query)
+                job.set_results(Table({'target_id': [0, 0, 0, 1, 3],
+                                       'dist': [0.1, 0.2, 0.3, 0.1, 0.5]},
+                                      names=['target_id', 'dist']))
+                return job
+
+        handler = UploadTapHandler()
+        tap = GaiaClass(handler)
+        coords = SkyCoord(ra=[10, 20, 30, 40], dec=[-5, 0, 5, 10],
+                          unit=(u.degree, u.degree), frame='icrs')
+        job = tap.cone_search_many(coords, Quantity(1.0, u.arcmin),
+                                   stream=True)
+        assert handler.upload_table_name == 'cone_search_targets'
+        assert list(handler.upload['target_id']) == [0, 1, 2, 3]
+        assert np.allclose(handler.upload['target_ra'], [10, 20, 30, 40])
+        assert np.allclose(handler.upload['target_dec'], [-5, 0, 5, 10])
+        assert "JOIN tap_upload.cone_search_targets AS t" in handler.query
+        assert "CIRCLE('ICRS',t.target_ra,t.target_dec,0.016666" \
+            in handler.query
+        assert "ORDER BY t.target_id ASC, dist ASC" in handler.query
+        assert handler.kwargs['stream'] is True
+
+        # groups spanning several chunks are stacked
+        results = list(tap.iter_cone_search_many(job, chunk_rows=2))
+        assert [target_id for target_id, _ in results] == [0, 1, 3]
+        assert [len(table) for _, table in results] == [3, 1, 1]
+        assert list(results[0][1]['dist']) == [0.1, 0.2, 0.3]
+
+        # one radius per position
+        tap.cone_search_many([coords[0], '20d 0d'], Quantity([1, 2], u.deg),
+                             ids=['a', 'b'])
+        assert list(handler.upload['target_id']) == ['a', 'b']
+        # lists of positions are uploaded in ICRS too
+        assert np.allclose(handler.upload['target_ra'], [10, 20],
+                           rtol=0, atol=1e-9)
+        assert np.allclose(handler.upload['target_dec'], [-5, 0],
+                           rtol=0, atol=1e-9)
+        assert list(handler.upload['target_radius']) == [1, 2]
+        assert "t.target_radius))" in handler.query
+
+        with pytest.raises(ValueError):
+            tap.cone_search_many(coords, Quantity([1, 2], u.deg))
+        with pytest.raises(ValueError):
+            tap.cone_search_many(coords, Quantity(1, u.deg), ids=[1])
+
     def __check_results_column(self, results, columnName, description, unit,
                                dataType):
         c = results[columnName]
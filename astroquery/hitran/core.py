@@ -1,3 +1,5 @@
+import numpy as np
+import six
 from astropy.table import Table
 from astropy import units as u
 
@@ -199,15 +201,24 @@ class HitranClass(BaseQuery):
         return payload
 
     @prepend_docstr_nosections("\n" + _args_to_payload.__doc__)
-    def query_lines_async(self, get_query_payload=False, cache=True, **kwargs):
+    def query_lines_async(self, get_query_payload=False, cache=True,
+                          local_filepath=None, **kwargs):
         """
         Queries Hitran class for a particular molecule with default arguments
         set. Based on fetch function from hapi.py.
 
+        Other Parameters
+        ----------------
+        local_filepath : str, optional
+            If given, the line list is downloaded to this file, overwriting
+            it, and the table is parsed from the file. The download is
+            streamed rather than held in a response, but parsing still reads
+            the whole file. ``cache`` is ignored.
+
         Returns
         -------
-        response : `requests.Response`
-            The response of the HTTP request.
+        response : `requests.Response` or str
+            The response of the HTTP request, or ``local_filepath``.
         """
 
         params = self._args_to_payload(**kwargs)
@@ -215,6 +226,14 @@ class HitranClass(BaseQuery):
         if get_query_payload:
             return params
 
+        if local_filepath is not None:
+            # the file name does not depend on the query: an existing file
+            # may hold another line list, so it is always written again
+            self._download_file(self.QUERY_URL, local_filepath,
+                                params=params, timeout=self.TIMEOUT,
+                                cache=False, continuation=False)
+            return local_filepath
+
         response = self._request(method='GET',
                                  url=self.QUERY_URL,
                                  params=params,
@@ -225,26 +244,35 @@ class HitranClass(BaseQuery):
 
     def _parse_result(self, response, verbose=False):
         """
-        Parse a response into an `~astropy.table.Table`
+        Parse a response, or the file it was saved to, into an
+        `~astropy.table.Table`
         """
+        if isinstance(response, six.string_types):
+            with open(response, 'rb') as f:
+                content = f.read()
+        else:
+            content = response.content
+
         formats = parse_readme(self.FORMATFILE)
 
-        dtypes = [entry['dtype'] for entry in formats.values()]
-
-        rows = []
-        for line in response.text.split('\n'):
-            if line.strip():
-                row = []
-                start = 0
-                for key, entry in formats.items():
-                    formatter = entry['formatter']
-                    length = entry['length']
-                    value = formatter(line[start:start+length])
-                    row.append(value)
-                    start = start + length
-                rows.append(row)
-
-        result = Table(rows=rows, names=formats.keys(), dtype=dtypes)
+        # every line is a fixed-width record: view all of them as a
+        # structured array with one byte string field per column, then
+        # convert the columns in bulk
+        record = np.dtype([(str(key), 'S{0}'.format(entry['length']))
+                           for key, entry in formats.items()])
+        lines = [line for line in content.splitlines() if line.strip()]
+        records = np.array(lines, dtype='S{0}'.format(record.itemsize))
+        records = records.view(record)
+
+        columns = []
+        for key, entry in formats.items():
+            column = records[str(key)]
+            if entry['formatter'] is float:
+                # convert at full precision before any narrowing
+                column = column.astype(float)
+            columns.append(column.astype(entry['dtype']))
+
+        result = Table(columns, names=list(formats.keys()), copy=False)
 
         return result
 
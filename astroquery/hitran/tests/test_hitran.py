@@ -24,6 +24,11 @@ class MockResponseHitran(object):
         with open(self.filename) as f:
             return f.read()
 
+    @property
+    def content(self):
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
 
 def test_query_async():
     response = Hitran.query_lines_async(molecule_number=1,
@@ -52,3 +57,26 @@ def test_query():
                                    'line_mixing_flag', 'gp', 'gpp'])
     assert tbl['molec_id'][0] == 1
     np.testing.assert_almost_equal(tbl['nu'][0], 0.072059)
+
+
+def test_query_to_file(tmpdir, monkeypatch):
+    def download_file(url, local_filepath, params=None, cache=True,
+                      **kwargs):
+        assert params['iso_ids_list'] == '1'
+        # an existing file is overwritten
+        assert not cache
+        with open(local_filepath, 'wb') as f:
+            f.write(MockResponseHitran().content)
+
+    hitran = Hitran()
+    monkeypatch.setattr(hitran, '_download_file', download_file)
+    filename = str(tmpdir.join('H2O.par'))
+    tbl = hitran.query_lines(molecule_number=1, isotopologue_number=1,
+                             min_frequency=0. / u.cm,
+                             max_frequency=10. / u.cm,
+                             local_filepath=filename)
+    expected = hitran._parse_result(MockResponseHitran())
+    assert len(tbl) == 122
+    for name in expected.colnames:
+        assert tbl[name].dtype == expected[name].dtype
+        assert np.all(tbl[name] == expected[name])
@@ -1,3 +1,4 @@
+import os
 from collections import OrderedDict
 
 
@@ -7,7 +8,25 @@ fmt_dict = {'f': float, 's': str, 'd': int, 'e': float, 'A': str, 'I': int,
             'F': float}
 
 
+# parsed format files, keyed by file name, modification time and groups
+_readme_cache = {}
+
+
 def parse_readme(filename, group_global=None, group_local=None):
+    """
+    Read the field formats of a HITRAN format file.
+
+    The result is cached until the file is modified; it must not be changed
+    by the caller.
+    """
+    key = (filename, os.path.getmtime(filename), group_global, group_local)
+    if key not in _readme_cache:
+        _readme_cache[key] = _parse_readme(filename, group_global=group_global,
+                                           group_local=group_local)
+    return _readme_cache[key]
+
+
+def _parse_readme(filename, group_global=None, group_local=None):
     with open(filename, 'r') as f:
         lines = f.readlines()
 
@@ -26,6 +26,15 @@ class Conf(_config.ConfigNamespace):
         30,
         'Time limit for connecting to JPL servers.')
 
+    max_uri_length = _config.ConfigItem(
+        2000,
+        'Maximum length of a query URI; longer lists of epochs are split '
+        'over several queries.')
+
+    max_workers = _config.ConfigItem(
+        4,
+        'Number of queries sent concurrently to JPL Horizons.')
+
     # JPL Horizons settings
 
     # quantities queried in ephemerides query (see
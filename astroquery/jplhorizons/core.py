@@ -5,11 +5,14 @@ from __future__ import print_function
 from numpy import nan as nan
 from numpy import isnan
 from numpy import ndarray
+from numpy import full
 from collections import OrderedDict
 import warnings
 
 # 2. third party imports
-from astropy.table import Table, Column
+import requests
+from six.moves.urllib_parse import quote_plus
+from astropy.table import Table, Column, vstack
 from astropy.io import ascii
 from astropy.time import Time
 
@@ -19,6 +22,7 @@ from astropy.time import Time
 from ..query import BaseQuery
 # async_to_sync generates the relevant query tools from _async methods
 from ..utils import async_to_sync
+from ..utils.concurrency import get_executor
 # import configurable items declared in __init__.py
 from . import conf
 
@@ -443,7 +447,8 @@ class HorizonsClass(BaseQuery):
             default: all quantities
         get_query_payload : boolean, optional
             When set to `True` the method returns the HTTP request
-            parameters as a dict, default: False
+            parameters as a dict (a list of dicts if a long list of
+            epochs is split over several requests), default: False
         get_raw_response : boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the
             data into a table, default: False
@@ -452,7 +457,9 @@ class HorizonsClass(BaseQuery):
         Returns
         -------
         response : `requests.Response`
-            The response of the HTTP request.
+            The response of the HTTP request, or a list of them if a long
+            list of epochs is split over several requests (see
+            ``conf.max_uri_length``).
 
 
         Examples
@@ -576,27 +583,115 @@ class HorizonsClass(BaseQuery):
 
         self.query_type = 'ephemerides'
 
+        request_payloads = self._split_epochs(URL, request_payload)
+
         # return request_payload if desired
         if get_query_payload:
+            if len(request_payloads) > 1:
+                return request_payloads
             return request_payload
 
         # set return_raw flag, if raw response desired
         if get_raw_response:
             self.return_raw = True
 
-        # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
+        # query; long lists of epochs are split over several requests
+        return self._query_payloads(URL, request_payloads, cache=cache)
 
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The URI used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
+    def ephemerides_many(self, ids, location=None, epochs=None,
+                         id_type=None, max_workers=None, ignore_errors=False,
+                         **kwargs):
+        """
+        Query JPL Horizons for the ephemerides of several targets at once.
 
-        return response
+        The targets are queried concurrently, each one as
+        ``Horizons(id=id, location=location, epochs=epochs,
+        id_type=id_type).ephemerides(**kwargs)``, and their ephemerides are
+        stacked in a single table, in the order of ``ids``.
+
+        Parameters
+        ----------
+        ids : list of str
+            Names, numbers, or designations of the targets.
+        location : str or dict, optional
+            Observer's location, as in `HorizonsClass`; defaults to the
+            location of this instance.
+        epochs : scalar, list-like, or dictionary, optional
+            Epochs, as in `HorizonsClass`; defaults to the epochs of this
+            instance.
+        id_type : str, optional
+            Identifier type of all ``ids``, as in `HorizonsClass`; defaults
+            to the identifier type of this instance.
+        max_workers : int, optional
+            Number of targets queried at the same time; default:
+            ``conf.max_workers``.
+        ignore_errors : boolean, optional
+            If ``True``, targets whose query fails (e.g. unknown or
+            ambiguous targets) are left out of the results with a warning;
+            by default the first error is raised.
+        **kwargs
+            Keyword arguments of `ephemerides_async`.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            The ephemerides of all the targets, with an ``id`` column
+            holding the value of ``ids`` each row was queried with.
+
+        Examples
+        --------
+            >>> from astroquery.jplhorizons import Horizons
+            >>> eph = Horizons.ephemerides_many(
+            ...     ['1', '2', '3'], location='568',
+            ...     epochs={'start': '2010-01-01', 'stop': '2010-03-01',
+            ...             'step': '10d'})  # doctest: +SKIP
+        """
+        if location is None:
+            location = self.location
+        if epochs is None:
+            epochs = self.epochs
+        if id_type is None:
+            id_type = self.id_type
+        if max_workers is None:
+            max_workers = conf.max_workers
+        ids = list(ids)
+
+        def query(target_id):
+            horizons = HorizonsClass(id=target_id, location=location,
+                                     epochs=epochs, id_type=id_type)
+            # share the connection pool and cache settings
+            horizons._session = self._session
+            horizons.cache_location = self.cache_location
+            try:
+                return horizons.ephemerides(**kwargs)
+            except Exception as ex:
+                if not ignore_errors:
+                    raise
+                warnings.warn('Query for target {:s} failed: {:s}'
+                              .format(str(target_id), str(ex)))
+                return None
+
+        if max_workers > 1 and len(ids) > 1:
+            executor = get_executor(min(max_workers, len(ids)))
+            try:
+                results = list(executor.map(query, ids))
+            finally:
+                executor.shutdown(wait=True)
+        else:
+            results = [query(target_id) for target_id in ids]
+
+        if kwargs.get('get_query_payload') or kwargs.get('get_raw_response'):
+            return results
+
+        tables = []
+        for target_id, table in zip(ids, results):
+            if table is not None:
+                table.add_column(Column([str(target_id)] * len(table),
+                                        name='id'), index=0)
+                tables.append(table)
+        if not tables:
+            return None
+        return vstack(tables)
 
     def elements_async(self, get_query_payload=False,
                        refsystem='J2000',
@@ -689,7 +784,8 @@ class HorizonsClass(BaseQuery):
             non-cometary objects.
         get_query_payload : boolean, optional
             When set to ``True`` the method returns the HTTP request
-            parameters as a dict, default: False
+            parameters as a dict (a list of dicts if a long list of
+            epochs is split over several requests), default: False
         get_raw_response: boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the
             data into a table, default: False
@@ -698,7 +794,9 @@ class HorizonsClass(BaseQuery):
         Returns
         -------
         response : `requests.Response`
-            The response of the HTTP request.
+            The response of the HTTP request, or a list of them if a long
+            list of epochs is split over several requests (see
+            ``conf.max_uri_length``).
 
 
         Examples
@@ -785,27 +883,20 @@ class HorizonsClass(BaseQuery):
 
         self.query_type = 'elements'
 
+        request_payloads = self._split_epochs(URL, request_payload)
+
         # return request_payload if desired
         if get_query_payload:
+            if len(request_payloads) > 1:
+                return request_payloads
             return request_payload
 
         # set return_raw flag, if raw response desired
         if get_raw_response:
             self.return_raw = True
 
-        # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
-
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The URI used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
-
-        return response
+        # query; long lists of epochs are split over several requests
+        return self._query_payloads(URL, request_payloads, cache=cache)
 
     def vectors_async(self, get_query_payload=False,
                       closest_apparition=False, no_fragments=False,
@@ -884,7 +975,8 @@ class HorizonsClass(BaseQuery):
             non-cometary objects.
         get_query_payload : boolean, optional
             When set to `True` the method returns the HTTP request
-            parameters as a dict, default: False
+            parameters as a dict (a list of dicts if a long list of
+            epochs is split over several requests), default: False
         get_raw_response: boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the
             data into a table, default: False
@@ -899,7 +991,9 @@ class HorizonsClass(BaseQuery):
         Returns
         -------
         response : `requests.Response`
-            The response of the HTTP request.
+            The response of the HTTP request, or a list of them if a long
+            list of epochs is split over several requests (see
+            ``conf.max_uri_length``).
 
 
         Examples
@@ -1001,30 +1095,90 @@ class HorizonsClass(BaseQuery):
 
         self.query_type = 'vectors'
 
+        request_payloads = self._split_epochs(URL, request_payload)
+
         # return request_payload if desired
         if get_query_payload:
+            if len(request_payloads) > 1:
+                return request_payloads
             return request_payload
 
         # set return_raw flag, if raw response desired
         if get_raw_response:
             self.return_raw = True
 
-        # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
-
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The URI used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
-
-        return response
+        # query; long lists of epochs are split over several requests
+        return self._query_payloads(URL, request_payloads, cache=cache)
 
     # ---------------------------------- parser functions
 
+    def _split_epochs(self, url, request_payload):
+        """
+        Split a request for a list of discrete epochs (``TLIST``) into
+        requests whose URI is shorter than ``conf.max_uri_length``, which
+        would otherwise be truncated.
+        """
+        if ('TLIST' not in request_payload or
+                not isinstance(self.epochs, (list, tuple, ndarray))):
+            return [request_payload]
+
+        base_payload = OrderedDict(request_payload)
+        base_payload['TLIST'] = ''
+        base_length = len(requests.Request('GET', url, params=base_payload)
+                          .prepare().url)
+
+        # each epoch costs its encoded length, plus 3 for the encoded
+        # newline separating it from the previous one
+        chunks = [[]]
+        length = base_length
+        for epoch in (str(epoch) for epoch in self.epochs):
+            cost = len(quote_plus(epoch)) + 3 * bool(chunks[-1])
+            if chunks[-1] and length + cost >= conf.max_uri_length:
+                chunks.append([])
+                length = base_length
+                cost = len(quote_plus(epoch))
+            chunks[-1].append(epoch)
+            length += cost
+
+        if len(chunks) == 1:
+            return [request_payload]
+        request_payloads = []
+        for chunk in chunks:
+            payload = OrderedDict(request_payload)
+            payload['TLIST'] = "\n".join(chunk)
+            request_payloads.append(payload)
+        return request_payloads
+
+    def _query_payloads(self, url, request_payloads, cache=True):
+        """
+        Send the requests, ``conf.max_workers`` at a time if there are
+        several, and return their response (or the list of them).
+        """
+        def query(request_payload):
+            response = self._request('GET', url, params=request_payload,
+                                     timeout=self.TIMEOUT, cache=cache)
+            # check length of uri
+            if len(response.url) >= conf.max_uri_length:
+                warnings.warn(('The URI used in this query is very long '
+                               'and might have been truncated. The results '
+                               'of the query might be compromised. If you '
+                               'queried a list of epochs, consider querying '
+                               'a range.'))
+            return response
+
+        if len(request_payloads) == 1:
+            response = query(request_payloads[0])
+            self.uri = response.url
+            return response
+
+        executor = get_executor(min(conf.max_workers, len(request_payloads)))
+        try:
+            responses = list(executor.map(query, request_payloads))
+        finally:
+            executor.shutdown(wait=True)
+        self.uri = [response.url for response in responses]
+        return responses
+
     def _parse_horizons(self, src):
         """
         Routine for parsing data from JPL Horizons
@@ -1048,38 +1202,42 @@ class HorizonsClass(BaseQuery):
             self.return_raw = False
             return src
 
-        # split response by line break
-        src = src.split('\n')
+        # locate the data block with a single search for each marker;
+        # only the lines around it are scanned for metadata and errors
+        data_start = src.rfind('$$SOE')
+        data_end = src.rfind('$$EOE')
+        data_start = (0 if data_start < 0 else
+                      src.find('\n', data_start) + 1 or len(src))
+        data_end = 0 if data_end < 0 else src.rfind('\n', 0, data_end) + 1
+        if data_end > data_start:
+            raw_data = src[data_start:data_end]
+            src = (src[:data_start] + src[data_end:]).split('\n')
+        else:
+            raw_data = ''
+            src = src.split('\n')
 
-        data_start_idx = 0
-        data_end_idx = 0
         H, G = nan, nan
         M1, M2, k1, k2, phcof = nan, nan, nan, nan, nan
         headerline = []
+        targetname = ''
         for idx, line in enumerate(src):
             # read in ephemerides header line; replace some field names
-            if (self.query_type is 'ephemerides' and
+            if (self.query_type == 'ephemerides' and
                     "Date__(UT)__HR:MN" in line):
                 headerline = str(line).split(',')
                 headerline[2] = 'solar_presence'
                 headerline[3] = 'flags'
                 headerline[-1] = '_dump'
             # read in elements header line
-            elif (self.query_type is 'elements' and
+            elif (self.query_type == 'elements' and
                   "JDTDB," in line):
                 headerline = str(line).split(',')
                 headerline[-1] = '_dump'
             # read in vectors header line
-            elif (self.query_type is 'vectors' and
+            elif (self.query_type == 'vectors' and
                   "JDTDB," in line):
                 headerline = str(line).split(',')
                 headerline[-1] = '_dump'
-            # identify end of data block
-            if "$$EOE" in line:
-                data_end_idx = idx
-            # identify start of data block
-            if "$$SOE" in line:
-                data_start_idx = idx + 1
             # read in targetname
             if "Target body name" in line:
                 targetname = line[18:50].strip()
@@ -1144,7 +1302,7 @@ class HorizonsClass(BaseQuery):
                 break
 
         if headerline == []:
-            err_msg = "".join(src[data_start_idx:data_end_idx])
+            err_msg = "".join(raw_data.split('\n'))
             if len(err_msg) > 0:
                 raise ValueError('Query failed with error message:\n' +
                                  err_msg)
@@ -1155,12 +1313,14 @@ class HorizonsClass(BaseQuery):
         headerline = [h.strip() for h in headerline]
 
         # remove all 'Cut-off' messages
-        raw_data = [line for line in src[data_start_idx:data_end_idx]
-                    if 'Cut-off' not in line]
-
-        # read in data
-        data = ascii.read(raw_data,
-                          names=headerline,
+        if 'Cut-off' in raw_data:
+            raw_data = '\n'.join(line for line in raw_data.split('\n')
+                                  if 'Cut-off' not in line)
+
+        # read in data; the format is known, so the columns are parsed
+        # by the fast C reader without guessing
+        data = ascii.read(raw_data, format='no_header', delimiter=',',
+                          names=headerline, guess=False, fast_reader=True,
                           fill_values=[('.n.a.', '0'),
                                        ('n.a.', '0')])
         # force to a masked table
@@ -1177,40 +1337,40 @@ class HorizonsClass(BaseQuery):
         data.remove_column('_dump')
 
         # add targetname and physical properties as columns
-        data.add_column(Column([targetname] * len(data),
+        data.add_column(Column(full(len(data), targetname),
                                name='targetname'), index=0)
         if not isnan(H):
-            data.add_column(Column([H] * len(data),
+            data.add_column(Column(full(len(data), H),
                                    name='H'), index=3)
         if not isnan(G):
-            data.add_column(Column([G] * len(data),
+            data.add_column(Column(full(len(data), G),
                                    name='G'), index=4)
         if not isnan(M1):
-            data.add_column(Column([M1] * len(data),
+            data.add_column(Column(full(len(data), M1),
                                    name='M1'), index=3)
         if not isnan(M2):
-            data.add_column(Column([M2] * len(data),
+            data.add_column(Column(full(len(data), M2),
                                    name='M2'), index=4)
         if not isnan(k1):
-            data.add_column(Column([k1] * len(data),
+            data.add_column(Column(full(len(data), k1),
                                    name='k1'), index=5)
         if not isnan(k2):
-            data.add_column(Column([k2] * len(data),
+            data.add_column(Column(full(len(data), k2),
                                    name='k2'), index=6)
         if not isnan(phcof):
-            data.add_column(Column([phcof] * len(data),
+            data.add_column(Column(full(len(data), phcof),
                                    name='phasecoeff'), index=7)
 
         # replace missing airmass values with 999 (not observable)
-        if self.query_type is 'ephemerides' and 'a-mass' in data.colnames:
+        if self.query_type == 'ephemerides' and 'a-mass' in data.colnames:
             data['a-mass'] = data['a-mass'].filled(999)
 
         # set column definition dictionary
-        if self.query_type is 'ephemerides':
+        if self.query_type == 'ephemerides':
             column_defs = conf.eph_columns
-        elif self.query_type is 'elements':
+        elif self.query_type == 'elements':
             column_defs = conf.elem_columns
-        elif self.query_type is 'vectors':
+        elif self.query_type == 'vectors':
             column_defs = conf.vec_columns
         else:
             raise TypeError('Query type unknown.')
@@ -1254,6 +1414,15 @@ class HorizonsClass(BaseQuery):
         """
         if self.query_type not in ['ephemerides', 'elements', 'vectors']:
             return None
+        elif isinstance(response, list):
+            # epochs split over several requests
+            return_raw = self.return_raw
+            data = []
+            for single_response in response:
+                self.return_raw = return_raw
+                data.append(self._parse_horizons(single_response.text))
+            if not return_raw:
+                data = vstack(data)
         else:
             data = self._parse_horizons(response.text)
 
@@ -3,6 +3,7 @@ from __future__ import print_function
 
 import pytest
 import os
+import requests
 from collections import OrderedDict
 
 from numpy import testing as npt
@@ -224,3 +225,68 @@ def test_no_H(patch_request):
     """testing missing H value (also applies for G, M1, k1, M2, k2)"""
     res = jplhorizons.Horizons(id='2010 NY104').ephemerides()[0]
     assert 'H' not in res
+
+
+def test_epochs_split(patch_request):
+    epochs = [2451545.5 + 0.125 * i for i in range(500)]
+    obj = jplhorizons.Horizons(id='Ceres', location='500', epochs=epochs)
+    payloads = obj.ephemerides(get_query_payload=True)
+    assert isinstance(payloads, list) and len(payloads) > 1
+    assert "\n".join(payload['TLIST'] for payload in payloads) == \
+        "\n".join(str(epoch) for epoch in epochs)
+    for payload in payloads:
+        uri = requests.Request('GET', jplhorizons.conf.horizons_server,
+                               params=payload).prepare().url
+        assert len(uri) < jplhorizons.conf.max_uri_length
+
+    # each (mocked) response holds one epoch
+    res = obj.ephemerides()
+    assert len(res) == len(payloads)
+    assert len(obj.uri) == len(payloads)
+    assert list(res['targetname']) == ["1 Ceres"] * len(payloads)
+
+
+def test_ephemerides_many(patch_request):
+    res = jplhorizons.Horizons.ephemerides_many(
+        ['Ceres', '2010 NY104', 'Ceres'], location='500', epochs=2451545.5,
+        max_workers=3)
+    assert list(res['id']) == ['Ceres', '2010 NY104', 'Ceres']
+    assert list(res['targetname'])[::2] == ["1 Ceres", "1 Ceres"]
+    # H is only known for Ceres
+    assert is_masked(res['H'][1])
+    npt.assert_allclose(res['H'][0], res['H'][2])
+
+    with pytest.raises(KeyError):
+        jplhorizons.Horizons.ephemerides_many(['Ceres', 'unknown'],
+                                              location='500')
+    with pytest.warns(UserWarning):
+        res = jplhorizons.Horizons.ephemerides_many(
+            ['unknown', 'Ceres'], location='500', ignore_errors=True)
+    assert list(res['id']) == ['Ceres']
+
+
+def test_parse_many_rows():
+    with open(data_path(DATA_FILES['ephemerides'])) as f:
+        src = f.read()
+    start = src.index('$$SOE\n') + len('$$SOE\n')
+    end = src.index('$$EOE')
+    rows = src[start:end]
+    cutoff = ' Cut-off interval due to airmass\n'
+    obj = jplhorizons.HorizonsClass(id='Ceres')
+    obj.query_type = 'ephemerides'
+    res = obj._parse_horizons(src[:start] + rows * 3 + cutoff + rows +
+                              src[end:])
+    assert len(res) == 4
+    assert list(res['targetname']) == ["1 Ceres"] * 4
+    npt.assert_allclose(res['H'], [3.34] * 4)
+    assert all(res['airmass'] == 999)
+    assert res['RA'].unit == 'deg'
+
+    # error messages outside of the data block are still caught
+    with pytest.raises(ValueError) as exc:
+        obj._parse_horizons(src[:start - len('$$SOE\n')] +
+                            'No ephemeris for target "1 Ceres"\n')
+    assert 'No ephemeris for target' in str(exc.value)
+    with pytest.raises(ValueError) as exc:
+        obj._parse_horizons('$$SOE\n INPUT ERROR\n$$EOE\n')
+    assert 'INPUT ERROR' in str(exc.value)
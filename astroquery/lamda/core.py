@@ -1,6 +1,8 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import os
 import json
+import hashlib
+import numpy as np
 from astropy import table
 from astropy import log
 from astropy.utils.console import ProgressBar
@@ -37,11 +39,14 @@ collider_ids.update({v: k for k, v in list(collider_ids.items())})
 class LamdaClass(BaseQuery):
 
     url = "http://home.strw.leidenuniv.nl/~moldata/datafiles/{0}.dat"
+    _object_cache_namespaces = ('tables',)
 
     def __init__(self, **kwargs):
         super(LamdaClass, self).__init__(**kwargs)
         self.moldict_path = os.path.join(self.cache_location,
                                          "molecules.json")
+        # parsed tables, keyed by the SHA-1 hash of the datafile
+        self._tables_cache = {}
 
     def _get_molfile(self, mol, cache=True, timeout=None):
         """
@@ -96,13 +101,29 @@ class LamdaClass(BaseQuery):
                  2     3     1 ...     1.8e-11     1.9e-11
         """
         # Send HTTP request to open URL
-        datafile = [s.strip() for s in
-                    self._get_molfile(mol, timeout=timeout,
-                                      cache=cache).text.splitlines()]
+        response = self._get_molfile(mol, timeout=timeout, cache=cache)
         if return_datafile:
-            return datafile
-        # Parse datafile string list and return a table
-        tables = parse_lamda_lines(datafile)
+            return _datafile_lines(response)
+        if not cache:
+            return parse_lamda_lines(_datafile_lines(response))
+
+        # the parsed tables are kept in memory and in the cache, so that a
+        # datafile is only parsed once
+        key = hashlib.sha1(response.content).hexdigest()
+        if key not in self._tables_cache:
+            self._tables_cache[key] = self._load_tables(key, response)
+        return _copy_tables(self._tables_cache[key])
+
+    def _load_tables(self, key, response):
+        """
+        Read the tables of a datafile from the cache, or parse the datafile
+        and cache its tables.
+        """
+        tables_cache = self._object_cache('tables')
+        tables = tables_cache.get(key)
+        if tables is None:
+            tables = parse_lamda_lines(_datafile_lines(response))
+            tables_cache.set(key, tables)
         return tables
 
     def get_molecules(self, cache=True):
@@ -279,112 +300,91 @@ def parse_lamda_lines(data):
     """
     Extract a LAMDA datafile into a dictionary of tables
 
-    (non-pythonic!  more like, fortranic)
+    The sections of the file are read block by block: each one starts with
+    its number of rows, and the rows of the radiative and collisional
+    sections are parsed in bulk with `numpy.loadtxt`.
     """
+    lines = [_cln(line) for line in data if line[0] != '!']
 
-    meta_rad = {}
     meta_mol = {}
+    meta_mol['molecule'] = lines[0]
+    meta_mol['molwt'] = float(lines[1])
+    meta_mol['nenergylevels'] = int(lines[2])
+    pos = 3
+
+    levels = [line.split() for line in
+              lines[pos:pos + meta_mol['nenergylevels']]]
+    pos += meta_mol['nenergylevels']
+    mol_table = table.Table(meta=meta_mol)
+    mol_table['Level'] = [int(level[0]) for level in levels]
+    mol_table['Energy'] = [float(level[1]) for level in levels]
+    mol_table['Weight'] = [int(float(level[2])) for level in levels]
+    mol_table['J'] = [" ".join(level[3:]) for level in levels]
+
+    meta_rad = {}
+    meta_rad['radtrans'] = int(lines[pos])
+    pos += 1
+    # Can have wavenumber at the end.  Ignore that.
+    radtrans = _read_rows(lines[pos:pos + meta_rad['radtrans']], 6)
+    pos += meta_rad['radtrans']
+    rad_table = table.Table(meta=meta_rad)
+    for ii, name in enumerate(['Transition', 'Upper', 'Lower']):
+        rad_table[name] = radtrans[:, ii].astype(int)
+    for ii, name in enumerate(['EinsteinA', 'Frequency', 'E_u(K)'], 3):
+        rad_table[name] = radtrans[:, ii]
+
     meta_coll = {}
-    levels = []
-    radtrans = []
-    collider = None
-    ncolltrans = None
-    for ii, line in enumerate(data):
-        if line[0] == '!':
-            continue
-        if 'molecule' not in meta_mol:
-            meta_mol['molecule'] = _cln(line)
-            continue
-        if 'molwt' not in meta_mol:
-            meta_mol['molwt'] = float(_cln(line))
-            continue
-        if 'nenergylevels' not in meta_mol:
-            meta_mol['nenergylevels'] = int(_cln(line))
-            continue
-        if len(levels) < meta_mol['nenergylevels']:
-            lev, en, wt = _cln(line).split()[:3]
-            jul = " ".join(_cln(line).split()[3:])
-            levels.append([int(lev), float(en), int(float(wt)), jul])
-            continue
-        if 'radtrans' not in meta_rad:
-            meta_rad['radtrans'] = int(_cln(line))
-            continue
-        if len(radtrans) < meta_rad['radtrans']:
-            # Can have wavenumber at the end.  Ignore that.
-            trans, up, low, aval, freq, eu = _cln(line).split()[:6]
-            radtrans.append([int(trans), int(up), int(low), float(aval),
-                             float(freq), float(eu)])
-            continue
-        if 'ncoll' not in meta_coll:
-            meta_coll['ncoll'] = int(_cln(line))
-            collrates = {}
-            continue
-        if collider is None:
-            collider = int(line[0])
-            collname = collider_ids[collider]
-            collrates[collider] = []
-            meta_coll[collname] = {'collider': collname,
-                                   'collider_id': collider}
-            continue
-        if ncolltrans is None:
-            ncolltrans = int(_cln(line))
-            meta_coll[collname]['ntrans'] = ncolltrans
-            continue
-        if 'ntemp' not in meta_coll[collname]:
-            meta_coll[collname]['ntemp'] = int(_cln(line))
-            continue
-        if 'temperatures' not in meta_coll[collname]:
-            meta_coll[collname]['temperatures'] = [int(float(x)) for x in
-                                                   _cln(line).split()]
-            continue
-        if len(collrates[collider]) < meta_coll[collname]['ntrans']:
-            trans, up, low = [int(x) for x in _cln(line).split()[:3]]
-            temperatures = [float(x) for x in _cln(line).split()[3:]]
-            collrates[collider].append([trans, up, low] + temperatures)
-        if len(collrates[collider]) == meta_coll[collname]['ntrans']:
-            # meta_coll[collider_ids[collider]+'_collrates'] = collrates
-            log.debug("{ii} Finished loading collider {0:d}: "
-                      "{1}".format(collider, collider_ids[collider], ii=ii))
-            collider = None
-            ncolltrans = None
-            if len(collrates) == meta_coll['ncoll']:
-                # All done!
-                break
-
-    if len(levels[0]) == 4:
-        mol_table_names = ['Level', 'Energy', 'Weight', 'J']
-    elif len(levels[0]) == 5:
-        mol_table_names = ['Level', 'Energy', 'Weight', 'J', 'F']
-    else:
-        raise ValueError("Unrecognized levels structure.")
-    mol_table_columns = [table.Column(name=name, data=data)
-                         for name, data in zip(mol_table_names,
-                                               zip(*levels))]
-    mol_table = table.Table(data=mol_table_columns, meta=meta_mol)
-
-    rad_table_names = ['Transition', 'Upper', 'Lower', 'EinsteinA',
-                       'Frequency', 'E_u(K)']
-    rad_table_columns = [table.Column(name=name, data=data)
-                         for name, data in zip(rad_table_names,
-                                               zip(*radtrans))]
-    rad_table = table.Table(data=rad_table_columns, meta=meta_rad)
-
-    coll_tables = {collider_ids[collider]: None for collider in collrates}
-    for collider in collrates:
+    meta_coll['ncoll'] = int(lines[pos])
+    pos += 1
+    coll_tables = {}
+    while len(coll_tables) < meta_coll['ncoll']:
+        collider = int(lines[pos][0])
         collname = collider_ids[collider]
-        coll_table_names = (['Transition', 'Upper', 'Lower'] +
-                            ['C_ij(T={0:d})'.format(tem) for tem in
-                             meta_coll[collname]["temperatures"]])
-        coll_table_columns = [table.Column(name=name, data=data)
-                              for name, data in zip(coll_table_names,
-                                                    zip(*collrates[collider]))]
-        coll_table = table.Table(data=coll_table_columns,
-                                 meta=meta_coll[collname])
+        meta = {'collider': collname,
+                'collider_id': collider}
+        meta['ntrans'] = int(lines[pos + 1])
+        meta['ntemp'] = int(lines[pos + 2])
+        meta['temperatures'] = [int(float(x)) for x in
+                                lines[pos + 3].split()]
+        pos += 4
+        collrates = _read_rows(lines[pos:pos + meta['ntrans']],
+                               3 + meta['ntemp'])
+        pos += meta['ntrans']
+        meta_coll[collname] = meta
+
+        coll_table = table.Table(meta=meta)
+        for ii, name in enumerate(['Transition', 'Upper', 'Lower']):
+            coll_table[name] = collrates[:, ii].astype(int)
+        for ii, tem in enumerate(meta['temperatures'], 3):
+            coll_table['C_ij(T={0:d})'.format(tem)] = collrates[:, ii]
         coll_tables[collname] = coll_table
+        log.debug("Finished loading collider {0:d}: "
+                  "{1}".format(collider, collname))
 
     return coll_tables, rad_table, mol_table
 
 
+def _read_rows(lines, ncols):
+    """
+    Parse lines of whitespace-separated numbers into a ``(len(lines),
+    ncols)`` float array; further columns are ignored.
+    """
+    if not lines:
+        return np.zeros((0, ncols))
+    return np.loadtxt(lines, usecols=range(ncols), ndmin=2)
+
+
+def _datafile_lines(response):
+    return [s.strip() for s in response.text.splitlines()]
+
+
+def _copy_tables(tables):
+    collrates, radtransitions, enlevels = tables
+    return ({collname: coll_table.copy()
+             for collname, coll_table in collrates.items()},
+            radtransitions.copy(), enlevels.copy())
+
+
 def _cln(s):
     """
     Clean a string of comments, newlines
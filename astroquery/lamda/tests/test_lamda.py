@@ -3,6 +3,7 @@ import os
 import tempfile
 import numpy as np
 from ...lamda import core
+from ...utils.testing_tools import MockResponse
 
 DATA_FILES = {'co': 'co.txt'}
 
@@ -38,3 +39,58 @@ def test_writer():
     for k in coll:
         np.testing.assert_almost_equal(coll[k]['C_ij(T=5)'],
                                        coll2[k]['C_ij(T=5)'])
+
+
+def test_query_cache(tmpdir, monkeypatch):
+    with open(data_path('co.txt'), 'rb') as f:
+        content = f.read()
+
+    def get_molfile(self, mol, cache=True, timeout=None):
+        return MockResponse(content=content)
+
+    parsed = []
+
+    def parse_lamda_lines(data):
+        parsed.append(data)
+        return parse(data)
+
+    parse = core.parse_lamda_lines
+    monkeypatch.setattr(core.LamdaClass, '_get_molfile', get_molfile)
+    monkeypatch.setattr(core, 'parse_lamda_lines', parse_lamda_lines)
+
+    lamda = core.LamdaClass()
+    lamda.cache_location = str(tmpdir)
+    coll, radtrans, enlevels = lamda.query('co')
+    assert len(parsed) == 1
+    assert len(enlevels) == 41
+    # the cached tables are not changed through the returned copies
+    enlevels.remove_row(0)
+    coll['PH2'].remove_row(0)
+    coll2, radtrans2, enlevels2 = lamda.query('co')
+    assert len(parsed) == 1
+    assert len(enlevels2) == 41
+    assert len(coll2['PH2']) == len(coll2['OH2'])
+
+    # a fresh instance reads the tables from the cache
+    lamda = core.LamdaClass()
+    lamda.cache_location = str(tmpdir)
+    coll3, radtrans3, enlevels3 = lamda.query('co')
+    assert len(parsed) == 1
+    assert coll3['PH2'].meta['temperatures'] == \
+        coll2['PH2'].meta['temperatures']
+    np.testing.assert_almost_equal(radtrans3['EinsteinA'],
+                                   radtrans2['EinsteinA'])
+
+    lamda.query('co', cache=False)
+    assert len(parsed) == 2
+
+    # the tables are managed with the cached responses
+    assert lamda.cache_stats()['objects']['tables']['entries'] == 1
+    assert lamda.clear_cache() >= 1
+    assert lamda.cache_stats()['objects']['tables']['entries'] == 0
+    lamda = core.LamdaClass()
+    lamda.cache_location = str(tmpdir)
+    lamda.query('co')
+    assert len(parsed) == 3
+    assert not [name for name in os.listdir(str(tmpdir))
+                if name.endswith('.pkl')]
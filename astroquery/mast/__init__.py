@@ -26,6 +26,9 @@ class Conf(_config.ConfigNamespace):
     pagesize = _config.ConfigItem(
         50000,
         'Number of results to request at once from the STScI server.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Number of result pages requested concurrently from the STScI server.')
 
 
 conf = Conf()
@@ -12,6 +12,8 @@ from __future__ import print_function, division
 import warnings
 import json
 import time
+import functools
+import operator
 import string
 import os
 import re
@@ -39,6 +41,7 @@ from astropy.logger import log
 from ..query import QueryWithLogin
 from ..utils import commons, async_to_sync
 from ..utils.class_or_instance import class_or_instance
+from ..utils.concurrency import get_executor
 from ..exceptions import (TimeoutError, InvalidQueryError, RemoteServiceError,
                           LoginError, ResolverError, MaxResultsWarning,
                           NoResultsWarning, InputWarning, AuthenticationWarning)
@@ -74,6 +77,9 @@ def _mashup_json_to_table(json_obj, col_config=None):
     """
     Takes a JSON object as returned from a Mashup request and turns it into an `astropy.table.Table`.
 
+    The row-of-dicts payload is transposed once into per-field sequences, which are
+    converted directly into typed arrays (no object-dtype intermediates).
+
     Parameters
     ----------
     json_obj : dict
@@ -86,17 +92,32 @@ def _mashup_json_to_table(json_obj, col_config=None):
     response : `~astropy.table.Table`
     """
 
-    dataTable = Table(masked=True)
-    absCorr = None
-
     if not all(x in json_obj.keys() for x in ['fields', 'data']):
         raise KeyError("Missing required key(s) 'data' and/or 'fields.'")
 
-    for col, atype in [(x['name'], x['type']) for x in json_obj['fields']]:
+    fields = [(x['name'], x['type']) for x in json_obj['fields'] if x['name'] != "_selected_"]
+    if not fields:
+        return Table(masked=True)
+    names = [col for col, _ in fields]
+    rows = json_obj['data']
+    nrows = len(rows)
+
+    # Transpose the rows in a single pass; rows missing a field get None for it
+    getter = operator.itemgetter(*names)
+    try:
+        if len(names) == 1:
+            columns = [tuple(map(getter, rows))]
+        else:
+            columns = list(zip(*map(getter, rows)))
+    except KeyError:
+        columns = list(zip(*([row.get(col) for col in names] for row in rows)))
+    if not rows:
+        columns = [()] * len(names)
 
-        # Removing "_selected_" column
-        if col == "_selected_":
-            continue
+    isNone = functools.partial(operator.is_, None)
+    dataColumns = []
+
+    for (col, atype), colValues in zip(fields, columns):
 
         # reading the colum config if given
         ignoreValue = None
@@ -117,22 +138,56 @@ def _mashup_json_to_table(json_obj, col_config=None):
             atype = "str"
             ignoreValue = "" if (ignoreValue is None) else ignoreValue
 
-        # Make the column list (don't assign final type yet or there will be errors)
-        colData = np.array([x.get(col, ignoreValue) for x in json_obj['data']], dtype=object)
-        if ignoreValue is not None:
-            colData[np.where(np.equal(colData, None))] = ignoreValue
+        hasNone = None in colValues
+        if hasNone and np.dtype(atype).kind == 'f':
+            # numpy converts None to NaN by itself
+            colData = np.array(colValues, dtype=atype)
+            noneMask = np.isnan(colData)
+        elif hasNone:
+            noneMask = np.fromiter(map(isNone, colValues), dtype=bool, count=nrows)
+        else:
+            noneMask = np.zeros(nrows, dtype=bool)
+
+        if atype == "str":
+            if hasNone:
+                colValues = [ignoreValue if x is None else x for x in colValues]
+            colData = np.array(colValues, dtype=str) if nrows else np.array([], dtype=str)
+        elif not hasNone:
+            colData = np.array(colValues, dtype=atype)
+        elif np.dtype(atype).kind == 'f':
+            if ignoreValue is not None:
+                colData[noneMask] = ignoreValue
+        else:
+            colData = np.empty(nrows, dtype=atype)
+            colData[~noneMask] = np.array([x for x in colValues if x is not None], dtype=atype)
+            if ignoreValue is not None:
+                colData[noneMask] = ignoreValue
+            elif colData.dtype.kind == 'f':
+                colData[noneMask] = np.nan
+            else:
+                colData[noneMask] = np.zeros(1, dtype=atype)
 
-        # no consistant way to make the mask because np.equal fails on ''
-        # and array == value fails with None
-        if atype == 'str':
-            colMask = (colData == ignoreValue)
+        # missing values count as ignored when no ignore value is defined
+        if ignoreValue is None:
+            colMask = noneMask
         else:
-            colMask = np.equal(colData, ignoreValue)
+            colMask = (colData == np.array(ignoreValue).astype(colData.dtype, copy=False)
+                       if _is_castable(ignoreValue, colData.dtype) else np.zeros(nrows, dtype=bool))
+
+        dataColumns.append(MaskedColumn(colData, name=col, mask=colMask, copy=False))
+
+    return Table(dataColumns, masked=True, copy=False)
 
-        # add the column
-        dataTable.add_column(MaskedColumn(colData.astype(atype), name=col, mask=colMask))
 
-    return dataTable
+def _is_castable(value, dtype):
+    """
+    Whether ``value`` can be compared to the elements of an array of the given ``dtype``.
+    """
+    try:
+        np.array(value).astype(dtype)
+    except (TypeError, ValueError):
+        return False
+    return True
 
 
 @async_to_sync
@@ -153,6 +208,7 @@ class MastClass(QueryWithLogin):
 
         self.TIMEOUT = conf.timeout
         self.PAGESIZE = conf.pagesize
+        self.MAX_WORKERS = conf.max_workers
 
         self._column_configs = dict()
         self._current_service = None
@@ -409,6 +465,9 @@ class MastClass(QueryWithLogin):
         interferes with follow requests after an 'Executing' response was returned.)
         Also parameters that allow for file download through this method are removed
 
+        Once the first page of a paginated result has been returned, the remaining
+        pages are requested concurrently (up to ``MAX_WORKERS`` at a time).
+
 
         Parameters
         ----------
@@ -426,20 +485,17 @@ class MastClass(QueryWithLogin):
 
         Returns
         -------
-        response : ``requests.Response``
-            The response from the server.
+        response : list of ``requests.Response``
+            The responses from the server, one per page, in page order.
         """
 
         startTime = time.time()
-        allResponses = []
-        totalPages = 1
-        curPage = 0
 
-        while curPage < totalPages:
+        def request_page(pageData):
             status = "EXECUTING"
 
             while status == "EXECUTING":
-                response = super(MastClass, self)._request(method, url, params=params, data=data,
+                response = super(MastClass, self)._request(method, url, params=params, data=pageData,
                                                            headers=headers, files=files, cache=False,
                                                            stream=stream, auth=auth)
 
@@ -453,18 +509,40 @@ class MastClass(QueryWithLogin):
                 else:
                     status = result.get("status")
 
-            allResponses.append(response)
+            return response, result, status
 
-            if (status != "COMPLETE") or (not retrieve_all):
-                break
+        response, result, status = request_page(data)
+        allResponses = [response]
 
-            paging = result.get("paging")
-            if paging is None:
-                break
-            totalPages = paging['pagesFiltered']
-            curPage = paging['page']
+        if (status != "COMPLETE") or (not retrieve_all):
+            return allResponses
+
+        paging = result.get("paging")
+        if paging is None:
+            return allResponses
+        totalPages = paging['pagesFiltered']
+        curPage = paging['page']
+
+        # Once the number of pages is known the remaining ones are independent of each other
+        pageRequests = [re.sub(r"%22page%22%3A%20\d+", "%22page%22%3A%20"+str(page), data)
+                        for page in range(curPage+1, totalPages+1)]
+        if not pageRequests:
+            return allResponses
 
-            data = data.replace("page%22%3A%20"+str(curPage)+"%2C", "page%22%3A%20"+str(curPage+1)+"%2C")
+        executor = get_executor(min(self.MAX_WORKERS, len(pageRequests)))
+        futures = [executor.submit(request_page, pageData) for pageData in pageRequests]
+        try:
+            pages = [future.result() for future in futures]
+        finally:
+            # after a failed page, the pages not requested yet are dropped
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+        for response, result, status in pages:
+            allResponses.append(response)
+            if status != "COMPLETE":
+                break
 
         return allResponses
 
@@ -1647,7 +1725,7 @@ class ObservationsClass(MastClass):
             bkt.download_file(bucketPath, localPath, ExtraArgs={"RequestPayer": "requester"},
                               Callback=progress_callback)
 
-    def _download_files(self, products, base_dir, cache=True):
+    def _download_files(self, products, base_dir, cache=True, max_workers=4):
         """
         Takes an `astropy.table.Table` of data products and downloads them into the dirctor given by base_dir.
 
@@ -1659,6 +1737,8 @@ class ObservationsClass(MastClass):
             Directory in which files will be downloaded.
         cache : bool
             Default is True. If file is found on disc it will not be downloaded again.
+        max_workers : int
+            Default is 4. Number of files downloaded from MAST at the same time.
 
         Returns
         -------
@@ -1666,6 +1746,7 @@ class ObservationsClass(MastClass):
         """
 
         manifestArray = []
+        mastDownloads = []  # (row index, url, local path) to fetch from MAST
         for dataProduct in products:
 
             localPath = base_dir + "/" + dataProduct['obs_collection'] + "/" + dataProduct['obs_id']
@@ -1676,41 +1757,40 @@ class ObservationsClass(MastClass):
 
             localPath += '/' + dataProduct['productFilename']
 
-            status = "COMPLETE"
-            msg = None
-            url = None
-
-            try:
-                if self._boto3 is not None and fpl.has_path(dataProduct):
-                    try:
-                        self._download_from_cloud(dataProduct, localPath, cache)
-                    except Exception as ex:
-                        log.exception("Error pulling from S3 bucket: %s" % ex)
-                        log.warn("Falling back to mast download...")
-                        self._download_file(dataUrl, localPath, cache=cache, head_safe=True)
-                else:
-                    self._download_file(dataUrl, localPath, cache=cache, head_safe=True)
-
-                # check if file exists also this is where would perform md5,
-                # and also check the filesize if the database reliably reported file sizes
-                if not os.path.isfile(localPath):
-                    status = "ERROR"
-                    msg = "File was not downloaded"
-                    url = dataUrl
+            manifestArray.append([localPath, "COMPLETE", None, dataUrl])
 
-            except HTTPError as err:
-                status = "ERROR"
-                msg = "HTTPError: {0}".format(err)
-                url = dataUrl
-
-            manifestArray.append([localPath, status, msg, url])
+            if self._boto3 is not None and fpl.has_path(dataProduct):
+                try:
+                    self._download_from_cloud(dataProduct, localPath, cache)
+                    continue
+                except Exception as ex:
+                    log.exception("Error pulling from S3 bucket: %s" % ex)
+                    log.warn("Falling back to mast download...")
+            mastDownloads.append((len(manifestArray) - 1, dataUrl, localPath))
+
+        if mastDownloads:
+            rowIndices, dataUrls, localPaths = zip(*mastDownloads)
+            downloads = self._download_files_parallel(dataUrls, localPaths, max_workers=max_workers,
+                                                      cache=cache, head_safe=True)
+            for index, download in zip(rowIndices, downloads):
+                if download['Status'] != "COMPLETE":
+                    manifestArray[index][1:] = ["ERROR", download['Message'], download['URL']]
+
+        for row in manifestArray:
+            # check if file exists also this is where would perform md5,
+            # and also check the filesize if the database reliably reported file sizes
+            if row[1] == "COMPLETE" and not os.path.isfile(row[0]):
+                row[1:3] = ["ERROR", "File was not downloaded"]
+            if row[1] == "COMPLETE":
+                row[3] = None
 
         manifest = Table(rows=manifestArray, names=('Local Path', 'Status', 'Message', "URL"))
 
         return manifest
 
     def download_products(self, products, download_dir=None,
-                          cache=True, curl_flag=False, mrp_only=False, **filters):
+                          cache=True, curl_flag=False, mrp_only=False,
+                          max_workers=4, **filters):
         """
         Download data products.
 
@@ -1729,6 +1809,9 @@ class ObservationsClass(MastClass):
             will be downloaded that can be used to download the data files at a later time.
         mrp_only : bool, optional
             Default False. When set to true only "Minimum Recommended Products" will be returned.
+        max_workers : int, optional
+            Default 4. Number of files downloaded at the same time.
+            Note: has no affect when downloading curl script.
         **filters :
             Filters to be applied.  Valid filters are all products fields listed
             `here <https://masttest.stsci.edu/api/v0/_productsfields.html>`__ and 'extension'
@@ -1777,7 +1860,8 @@ class ObservationsClass(MastClass):
 
         else:
             base_dir = download_dir.rstrip('/') + "/mastDownload"
-            manifest = self._download_files(products, base_dir, cache)
+            manifest = self._download_files(products, base_dir, cache,
+                                            max_workers=max_workers)
 
         return manifest
 
@@ -3,8 +3,11 @@ from __future__ import print_function
 
 import os
 import re
+import json
+import time
 
 from shutil import copyfile
+from requests import HTTPError
 
 from astropy.table import Table
 from astropy.tests.helper import pytest
@@ -170,6 +173,82 @@ def test_mast_service_request(patch_post):
     assert isinstance(result, Table)
 
 
+def test_mashup_json_to_table():
+    json_obj = {'fields': [{'name': 'id', 'type': 'int'},
+                           {'name': 'flux', 'type': 'float'},
+                           {'name': 'name', 'type': 'string'},
+                           {'name': 'flag', 'type': 'boolean'},
+                           {'name': '_selected_', 'type': 'boolean'}],
+                'data': [{'id': 1, 'flux': None, 'name': None, 'flag': True},
+                         {'id': None, 'flux': 2.5, 'name': 'b', 'flag': None},
+                         {'id': 3, 'flux': 1.5, 'name': 'c', 'flag': False}]}
+    col_config = {'flux': {'ignoreValue': 1.5}}
+
+    result = mast.core._mashup_json_to_table(json_obj, col_config)
+
+    assert result.colnames == ['id', 'flux', 'name', 'flag']
+    assert result['id'].dtype.kind == 'i'
+    assert list(result['id'].mask) == [False, True, False]
+    assert list(result['flux'].mask) == [True, False, True]
+    assert result['flux'][1] == 2.5
+    assert list(result['name'].mask) == [True, False, False]
+    assert list(result['name'].filled('')) == ['', 'b', 'c']
+    assert list(result['flag'].mask) == [False, True, False]
+
+
+def test_mast_paging(monkeypatch):
+    requested = []
+
+    def paged_request(self, method, url, data=None, **kwargs):
+        page = int(re.search(r"%22page%22%3A%20(\d+)", data).group(1))
+        requested.append(page)
+        content = json.dumps({'status': "COMPLETE",
+                              'paging': {'page': page, 'pagesFiltered': 5},
+                              'fields': [{'name': 'page', 'type': 'int'}],
+                              'data': [{'page': page}]})
+        return MockResponse(content.encode('utf-8'))
+
+    monkeypatch.setattr(mast.core.QueryWithLogin, '_request', paged_request)
+    monkeypatch.setitem(mast.Mast._column_configs, 'Mast.Caom.Cone', {})
+
+    responses = mast.Mast.service_request_async('Mast.Caom.Cone',
+                                                {'ra': 23.34086})
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+    assert [resp.json()['paging']['page'] for resp in responses] == [1, 2, 3, 4, 5]
+
+    result = mast.Mast._parse_result(responses)
+    assert list(result['page']) == [1, 2, 3, 4, 5]
+
+
+def test_mast_paging_error(monkeypatch):
+    requested = []
+    running = []
+
+    def paged_request(self, method, url, data=None, **kwargs):
+        page = int(re.search(r"%22page%22%3A%20(\d+)", data).group(1))
+        requested.append(page)
+        if page == 2:
+            raise HTTPError("page 2 failed")
+        running.append(page)
+        time.sleep(0.05)
+        running.remove(page)
+        content = json.dumps({'status': "COMPLETE",
+                              'paging': {'page': page, 'pagesFiltered': 5},
+                              'fields': [{'name': 'page', 'type': 'int'}],
+                              'data': [{'page': page}]})
+        return MockResponse(content.encode('utf-8'))
+
+    monkeypatch.setattr(mast.core.QueryWithLogin, '_request', paged_request)
+    monkeypatch.setitem(mast.Mast._column_configs, 'Mast.Caom.Cone', {})
+    monkeypatch.setattr(mast.Mast, 'MAX_WORKERS', 1)
+
+    with pytest.raises(HTTPError):
+        mast.Mast.service_request_async('Mast.Caom.Cone', {'ra': 23.34086})
+    # the remaining pages are cancelled, and no request outlives the call
+    assert 5 not in requested
+    assert running == []
+
+
 ###########################
 # ObservationsClass tests #
 ###########################
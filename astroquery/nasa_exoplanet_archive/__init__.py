@@ -8,15 +8,25 @@ NASA Exoplanet Archive Query Tool
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from astropy import config as _config
-from .nasa_exoplanet_archive import (NasaExoplanetArchive,
-                                     NasaExoplanetArchiveClass)
 
 
 class Conf(_config.ConfigNamespace):
     """
     Configuration parameters for `astroquery.nasa_exoplanet_archive`.
     """
-    pass
+    timeout = _config.ConfigItem(
+        120,
+        'Time limit for downloading the confirmed planets table.')
+    refresh_interval = _config.ConfigItem(
+        86400,
+        'Seconds during which the local copy of the confirmed planets table '
+        'is used without asking the archive whether the table changed.')
+
 
+conf = Conf()
+
+from .nasa_exoplanet_archive import (NasaExoplanetArchive,
+                                     NasaExoplanetArchiveClass)
 
-__all__ = ['NasaExoplanetArchive', 'NasaExoplanetArchiveClass', 'Conf']
+__all__ = ['NasaExoplanetArchive', 'NasaExoplanetArchiveClass', 'Conf',
+           'conf']
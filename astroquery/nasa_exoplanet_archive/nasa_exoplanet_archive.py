@@ -3,12 +3,18 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 import json
 import os
-from astropy.utils.data import download_file
+import time
+import warnings
+
+import requests
 from astropy.io import ascii
 from astropy.table import QTable
 from astropy.coordinates import SkyCoord
 import astropy.units as u
 
+from ..query import BaseQuery
+from . import conf
+
 __all__ = ['NasaExoplanetArchive']
 
 EXOPLANETS_CSV_URL = ('http://exoplanetarchive.ipac.caltech.edu/cgi-bin/'
@@ -18,15 +24,19 @@ BOOL_ATTRS = ('pl_kepflag', 'pl_ttvflag', 'pl_k2flag', 'st_massblend',
               'st_optmagblend', 'st_radblend', 'st_teffblend')
 
 
-class NasaExoplanetArchiveClass(object):
+class NasaExoplanetArchiveClass(BaseQuery):
     """
     Exoplanet Archive querying object. Use the ``get_confirmed_planets_table``
     or ``query_planet`` methods to get information about exoplanets via the NASA
     Exoplanet Archive.
     """
+    _object_cache_namespaces = ('confirmed_planets',)
+
     def __init__(self):
+        super(NasaExoplanetArchiveClass, self).__init__()
         self._param_units = None
-        self._table = None
+        # processed tables, keyed by (table_path, all_columns)
+        self._tables = {}
 
     @property
     def param_units(self):
@@ -66,40 +76,112 @@ class NasaExoplanetArchiveClass(object):
         -------
         table : `~astropy.table.QTable`
             Table of exoplanet properties.
+
+        Notes
+        -----
+        With ``cache=True``, the processed table (with its name index and
+        sky coordinates) is stored in the astroquery cache, and read from
+        there by later sessions. Once it is older than
+        ``conf.refresh_interval`` seconds, the archive is asked whether the
+        table changed since (using its ``ETag`` and ``Last-Modified``
+        headers), and it is only downloaded again if it did.
         """
-        if self._table is None or not cache:
+        key = (table_path, all_columns)
+        if key not in self._tables or not cache:
             if table_path is None:
-                exoplanets_url = EXOPLANETS_CSV_URL
-                if all_columns:
-                    exoplanets_url = EXOPLANETS_CSV_URL + '&select=*'
+                self._tables[key] = self._get_remote_table(
+                    cache=cache, show_progress=show_progress,
+                    all_columns=all_columns)
+            else:
+                self._tables[key] = self._process_table(ascii.read(table_path))
+
+        return self._tables[key]
 
-                table_path = download_file(exoplanets_url, cache=cache,
+    def _process_table(self, exoplanets_table):
+        """
+        Add the name index and the sky coordinates to the table read from the
+        archive CSV, and assign units to its columns.
+        """
+        # Store column of lowercase names for indexing:
+        lowercase_names = [host_name.lower().replace(' ', '') + letter
+                           for host_name, letter in
+                           zip(exoplanets_table['pl_hostname'].data,
+                               exoplanets_table['pl_letter'].data)]
+        exoplanets_table['NAME_LOWERCASE'] = lowercase_names
+        exoplanets_table.add_index('NAME_LOWERCASE')
+
+        # Create sky coordinate mixin column
+        exoplanets_table['sky_coord'] = SkyCoord(ra=exoplanets_table['ra'] * u.deg,
+                                                 dec=exoplanets_table['dec'] * u.deg)
+
+        # Assign units to columns where possible
+        for col in exoplanets_table.colnames:
+            if col in self.param_units:
+                # Check that unit is implemented in this version of astropy
+                if hasattr(u, self.param_units[col]):
+                    exoplanets_table[col].unit = u.Unit(self.param_units[col])
+
+        return QTable(exoplanets_table)
+
+    def _get_remote_table(self, cache=True, show_progress=True,
+                          all_columns=False):
+        """
+        Get the processed table from the local copy, downloading the archive
+        table if there is no local copy or if it has changed.
+        """
+        exoplanets_url = EXOPLANETS_CSV_URL
+        key = 'default'
+        if all_columns:
+            exoplanets_url = EXOPLANETS_CSV_URL + '&select=*'
+            key = 'all_columns'
+
+        tables_cache = self._object_cache('confirmed_planets')
+        stored = tables_cache.get(key) if cache else None
+        headers = {}
+        if stored is not None:
+            # the index is stored with the table, but not which one is primary
+            stored['table'].primary_key = ('NAME_LOWERCASE',)
+            age = time.time() - stored['checked']
+            if age < conf.refresh_interval:
+                return stored['table']
+            if stored['etag']:
+                headers['If-None-Match'] = stored['etag']
+            if stored['last_modified']:
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        csv_path = os.path.join(self.cache_location,
+                                'confirmed_planets_{0}.{1}.csv'
+                                .format(key, os.getpid()))
+        try:
+            response = self._download_file(exoplanets_url, csv_path,
+                                           timeout=conf.timeout,
+                                           continuation=False,
                                            show_progress=show_progress,
-                                           timeout=120)
-            exoplanets_table = ascii.read(table_path)
-
-            # Store column of lowercase names for indexing:
-            lowercase_names = [host_name.lower().replace(' ', '') + letter
-                               for host_name, letter in
-                               zip(exoplanets_table['pl_hostname'].data,
-                                   exoplanets_table['pl_letter'].data)]
-            exoplanets_table['NAME_LOWERCASE'] = lowercase_names
-            exoplanets_table.add_index('NAME_LOWERCASE')
-
-            # Create sky coordinate mixin column
-            exoplanets_table['sky_coord'] = SkyCoord(ra=exoplanets_table['ra'] * u.deg,
-                                                     dec=exoplanets_table['dec'] * u.deg)
-
-            # Assign units to columns where possible
-            for col in exoplanets_table.colnames:
-                if col in self.param_units:
-                    # Check that unit is implemented in this version of astropy
-                    if hasattr(u, self.param_units[col]):
-                        exoplanets_table[col].unit = u.Unit(self.param_units[col])
-
-            self._table = QTable(exoplanets_table)
-
-        return self._table
+                                           headers=headers)
+            if response.status_code == 304:
+                # not modified: the local copy is valid for another interval
+                stored['checked'] = time.time()
+                tables_cache.set(key, stored)
+                return stored['table']
+            exoplanets_table = self._process_table(ascii.read(csv_path))
+        except (requests.RequestException, IOError) as ex:
+            if stored is None:
+                raise
+            warnings.warn("Could not check whether the confirmed planets "
+                          "table changed ({0}); using the local copy."
+                          .format(ex))
+            return stored['table']
+        finally:
+            if os.path.exists(csv_path):
+                os.remove(csv_path)
+
+        if cache:
+            tables_cache.set(key, {
+                'checked': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'table': exoplanets_table})
+        return exoplanets_table
 
     def query_planet(self, planet_name, **kwargs):
         """
@@ -0,0 +1,75 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import os
+import shutil
+
+from astropy.tests.helper import pytest
+
+from ...nasa_exoplanet_archive import conf, NasaExoplanetArchiveClass
+
+LOCAL_TABLE_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                                'data', 'nasa_exoplanet_archive.csv')
+
+
+class MockResponse(object):
+
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+@pytest.fixture
+def archive(tmpdir, monkeypatch):
+    calls = []
+
+    def download_file(url, local_filepath, **kwargs):
+        calls.append(kwargs['headers'])
+        if kwargs['headers'].get('If-None-Match') == '"v1"':
+            return MockResponse(304, {})
+        shutil.copy(LOCAL_TABLE_PATH, local_filepath)
+        return MockResponse(200, {'ETag': '"v1"',
+                                  'Last-Modified': 'Mon, 01 Jan 2018'})
+
+    def new_archive():
+        archive = NasaExoplanetArchiveClass()
+        archive.cache_location = tmpdir.strpath
+        monkeypatch.setattr(archive, '_download_file', download_file)
+        return archive
+
+    new_archive.calls = calls
+    return new_archive
+
+
+def test_local_copy(archive, monkeypatch):
+    table = archive().get_confirmed_planets_table()
+    assert archive.calls == [{}]
+
+    # a new session reads the stored copy, with its index
+    stored = archive().get_confirmed_planets_table()
+    assert archive.calls == [{}]
+    assert stored.colnames == table.colnames
+    assert len(stored) == len(table)
+    name = table['NAME_LOWERCASE'][0]
+    assert stored.loc[name]['pl_hostname'] == table.loc[name]['pl_hostname']
+    assert stored['sky_coord'][0].ra == table['sky_coord'][0].ra
+
+    # once stale, the archive is asked whether the table changed
+    monkeypatch.setattr(conf, 'refresh_interval', 0)
+    stored = archive().query_planet(name)
+    assert archive.calls[1] == {'If-None-Match': '"v1"',
+                                'If-Modified-Since': 'Mon, 01 Jan 2018'}
+    assert stored['pl_hostname'] == table.loc[name]['pl_hostname']
+
+    # the check restarts the refresh interval
+    monkeypatch.setattr(conf, 'refresh_interval', 3600)
+    archive().get_confirmed_planets_table()
+    assert len(archive.calls) == 2
+
+    archive().get_confirmed_planets_table(cache=False)
+    assert archive.calls[2] == {}
+
+    # the stored copy is removed with the cached responses
+    assert archive().clear_cache() == 1
+    archive().get_confirmed_planets_table()
+    assert archive.calls[3] == {}
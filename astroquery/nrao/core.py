@@ -2,7 +2,6 @@
 from __future__ import print_function
 
 import re
-import os
 import warnings
 import functools
 import keyring
@@ -356,9 +355,7 @@ class NraoClass(QueryWithLogin):
         # fail if response is entirely whitespace or if it is empty
         if not response.content.strip():
             if cache:
-                last_pickle = self._last_query.hash()+".pickle"
-                cache_fn = os.path.join(self.cache_location, last_pickle)
-                os.remove(cache_fn)
+                self._response_cache.delete(self._last_query.hash())
             if retry > 0:
                 log.warning("Query resulted in an empty result.  Retrying {0}"
                             " more times.".format(retry))
@@ -9,27 +9,28 @@ import hashlib
 import keyring
 import io
 import os
+import threading
+import time
 import requests
 
 import six
+from six.moves.urllib_parse import urlparse
 from astropy.config import paths
 from astropy.logger import log
 import astropy.units as u
+from astropy.table import Table
 from astropy.utils.console import ProgressBarOrSpinner
 import astropy.utils.data
 
 from . import version
+from .cache import (conf as cache_conf, get_cache_backend, get_object_cache,
+                    _to_seconds)
 from .utils import system_tools
+from .utils.concurrency import as_completed, get_executor
 
 __all__ = ['BaseQuery', 'QueryWithLogin']
 
 
-def to_cache(response, cache_file):
-    log.debug("Caching data to {0}".format(cache_file))
-    with open(cache_file, "wb") as f:
-        pickle.dump(response, f)
-
-
 def _replace_none_iterable(iterable):
     return tuple('' if i is None else i for i in iterable)
 
@@ -92,23 +93,6 @@ class AstroQuery(object):
             self._hash = hashlib.sha224(pickle.dumps(request_key)).hexdigest()
         return self._hash
 
-    def request_file(self, cache_location):
-        fn = os.path.join(cache_location, self.hash() + ".pickle")
-        return fn
-
-    def from_cache(self, cache_location):
-        request_file = self.request_file(cache_location)
-        try:
-            with open(request_file, "rb") as f:
-                response = pickle.load(f)
-            if not isinstance(response, requests.Response):
-                response = None
-        except IOError:  # TODO: change to FileNotFoundError once drop py2 support
-            response = None
-        if response:
-            log.debug("Retrieving data from {0}".format(request_file))
-        return response
-
 
 class LoginABCMeta(abc.ABCMeta):
     """
@@ -145,6 +129,10 @@ class BaseQuery(object):
     is implemented as an abstract class and must not be directly instantiated.
     """
 
+    # namespaces of the `~astroquery.cache.ObjectCache` used by the service,
+    # reported by cache_stats and emptied by clear_cache with its responses
+    _object_cache_namespaces = ()
+
     def __init__(self):
         S = self._session = requests.session()
         S.headers['User-Agent'] = (
@@ -158,11 +146,77 @@ class BaseQuery(object):
         if not os.path.exists(self.cache_location):
             os.makedirs(self.cache_location)
         self._cache_active = True
+        # Seconds after which cached responses of this service expire; `None`
+        # falls back to ``astroquery.cache.conf.ttl``
+        self.cache_ttl = None
 
     def __call__(self, *args, **kwargs):
         """ init a fresh copy of self """
         return self.__class__(*args, **kwargs)
 
+    @property
+    def _response_cache(self):
+        """
+        The `~astroquery.cache.CacheBackend` for the current
+        ``cache_location``.
+        """
+        return get_cache_backend(self.cache_location)
+
+    def _object_cache(self, namespace):
+        """
+        The `~astroquery.cache.ObjectCache` for ``namespace`` in the current
+        ``cache_location``.
+        """
+        return get_object_cache(self.cache_location, namespace)
+
+    def _cache_ttl_seconds(self):
+        if self.cache_ttl is None:
+            return cache_conf.ttl or None
+        return _to_seconds(self.cache_ttl) or None
+
+    def cache_stats(self):
+        """
+        Describe the response cache of this service.
+
+        Returns
+        -------
+        stats : dict
+            Number of ``entries``, their total ``size`` and the ``max_size``
+            in bytes, creation times of the ``oldest`` and ``newest`` entries
+            and the ``hits`` and ``misses`` counted by this process.  The
+            same statistics for the objects derived from the responses (such
+            as parsed tables) that the service keeps are under ``objects``,
+            by namespace.
+        """
+        stats = self._response_cache.stats()
+        stats['objects'] = dict(
+            (namespace, self._object_cache(namespace).stats())
+            for namespace in self._object_cache_namespaces)
+        return stats
+
+    def clear_cache(self, older_than=None):
+        """
+        Remove the cached responses of this service, and the objects
+        derived from them.
+
+        Parameters
+        ----------
+        older_than : `~astropy.units.Quantity`, `datetime.timedelta` or float, optional
+            Only remove responses cached longer ago than this (floats are
+            seconds).  By default the whole cache is cleared.
+
+        Returns
+        -------
+        removed : int
+            The number of removed responses and derived objects.
+        """
+        older_than = _to_seconds(older_than)
+        removed = self._response_cache.clear(older_than=older_than)
+        for namespace in self._object_cache_namespaces:
+            removed += self._object_cache(namespace).clear(
+                older_than=older_than)
+        return removed
+
     def _request(self, method, url, params=None, data=None, headers=None,
                  files=None, save=False, savedir='', timeout=None, cache=True,
                  stream=False, auth=None, continuation=True, verify=True):
@@ -220,12 +274,7 @@ class BaseQuery(object):
             timeout=timeout
         )
         if save:
-            local_filename = url.split('/')[-1]
-            if os.name == 'nt':
-                # Windows doesn't allow special characters in filenames like
-                # ":" so replace them with an underscore
-                local_filename = local_filename.replace(':', '_')
-            local_filepath = os.path.join(self.cache_location or savedir or '.', local_filename)
+            local_filepath = self._local_filepath(url, savedir)
             self._download_file(url, local_filepath, cache=cache,
                                 continuation=continuation, method=method,
                                 auth=auth, **req_kwargs)
@@ -237,20 +286,35 @@ class BaseQuery(object):
                     response = query.request(self._session, stream=stream,
                                              auth=auth, verify=verify)
             else:
-                response = query.from_cache(self.cache_location)
+                response_cache = self._response_cache
+                response = response_cache.get(query.hash(),
+                                              ttl=self._cache_ttl_seconds())
                 if not response:
                     response = query.request(self._session,
                                              self.cache_location,
                                              stream=stream,
                                              auth=auth,
                                              verify=verify)
-                    to_cache(response, query.request_file(self.cache_location))
+                    response_cache.set(query.hash(), response)
             self._last_query = query
             return response
 
+    def _local_filepath(self, url, savedir=''):
+        """
+        The path under which `_request` saves the file at ``url`` when called
+        with ``save=True``.
+        """
+        local_filename = url.split('/')[-1]
+        if os.name == 'nt':
+            # Windows doesn't allow special characters in filenames like
+            # ":" so replace them with an underscore
+            local_filename = local_filename.replace(':', '_')
+        return os.path.join(self.cache_location or savedir or '.',
+                            local_filename)
+
     def _download_file(self, url, local_filepath, timeout=None, auth=None,
                        continuation=True, cache=False, method="GET",
-                       head_safe=False, **kwargs):
+                       head_safe=False, show_progress=True, **kwargs):
         """
         Download a file.  Resembles `astropy.utils.data.download_file` but uses
         the local ``_session``
@@ -268,6 +332,9 @@ class BaseQuery(object):
         cache : bool
         method : "GET" or "POST"
         head_safe : bool
+        show_progress : bool
+            Display a progress bar for this file (only shown if the logging
+            level is INFO or lower).
         """
 
         if head_safe:
@@ -303,8 +370,11 @@ class BaseQuery(object):
                 # bytes are indexed from 0:
                 # https://en.wikipedia.org/wiki/List_of_HTTP_header_fields#range-request-header
                 end = "{0}".format(length-1) if length is not None else ""
-                self._session.headers['Range'] = "bytes={0}-{1}".format(existing_file_length,
-                                                                        end)
+                # the Range header is set on this request only: the session is
+                # shared with concurrent downloads
+                kwargs['headers'] = dict(kwargs.get('headers') or {})
+                kwargs['headers']['Range'] = "bytes={0}-{1}".format(existing_file_length,
+                                                                    end)
 
                 response = self._session.request(method, url, timeout=timeout, stream=True,
                                                  auth=auth, **kwargs)
@@ -341,7 +411,7 @@ class BaseQuery(object):
         bytes_read = 0
 
         # Only show progress bar if logging level is INFO or lower.
-        if log.getEffectiveLevel() <= 20:
+        if show_progress and log.getEffectiveLevel() <= 20:
             progress_stream = None  # Astropy default
         else:
             progress_stream = io.StringIO()
@@ -363,6 +433,100 @@ class BaseQuery(object):
         response.close()
         return response
 
+    def _download_files_parallel(self, urls, local_filepaths, max_workers=4,
+                                 per_host_limit=None, **kwargs):
+        """
+        Download several files concurrently over the shared ``_session``.
+
+        Each file is retrieved with `_download_file`, so partially downloaded
+        files are continued and complete files are not downloaded again.  A
+        single progress bar counts the completed files.
+
+        Parameters
+        ----------
+        urls : list of str
+        local_filepaths : list of str
+            Where to save each of ``urls``.
+        max_workers : int
+            Number of files downloaded at the same time.
+        per_host_limit : int or None
+            Maximum number of simultaneous downloads from a single host.
+            Defaults to ``max_workers``.
+        **kwargs
+            Passed to `_download_file` (e.g. ``cache``, ``continuation``,
+            ``timeout``, ``auth``, ``head_safe``).
+
+        Returns
+        -------
+        manifest : `~astropy.table.Table`
+            One row per URL, in input order, with the ``Local Path``, a
+            ``Status`` of ``COMPLETE`` or ``ERROR``, the error ``Message`` and
+            ``HTTP Status`` if any, the ``Size`` of the local file in bytes,
+            the ``Time`` spent on it in seconds and the ``Exception`` raised
+            by the download (`None` if complete).
+        """
+        if len(urls) != len(local_filepaths):
+            raise ValueError("urls and local_filepaths must have the same "
+                             "length.")
+
+        per_host_limit = per_host_limit or max_workers
+        host_semaphores = {}
+        for url in urls:
+            host = urlparse(url).netloc
+            if host not in host_semaphores:
+                host_semaphores[host] = threading.Semaphore(per_host_limit)
+
+        def download(url, local_filepath):
+            start = time.time()
+            status, message, http_status = 'COMPLETE', '', 0
+            error = None
+            with host_semaphores[urlparse(url).netloc]:
+                try:
+                    self._download_file(url, local_filepath,
+                                        show_progress=False, **kwargs)
+                    if not os.path.isfile(local_filepath):
+                        message = 'File was not downloaded'
+                        error = IOError(message)
+                except requests.HTTPError as ex:
+                    error = ex
+                    if ex.response is not None:
+                        http_status = ex.response.status_code
+                except (requests.RequestException, IOError) as ex:
+                    error = ex
+            if error is not None:
+                status = 'ERROR'
+                message = message or '{0}: {1}'.format(type(error).__name__,
+                                                       error)
+            size = (os.path.getsize(local_filepath)
+                    if os.path.isfile(local_filepath) else 0)
+            return (url, local_filepath, status, message, http_status, size,
+                    time.time() - start, error)
+
+        if log.getEffectiveLevel() <= 20:
+            progress_stream = None  # Astropy default
+        else:
+            progress_stream = io.StringIO()
+
+        rows = [None] * len(urls)
+        executor = get_executor(max_workers)
+        try:
+            futures = {executor.submit(download, url, local_filepath): ii
+                       for ii, (url, local_filepath)
+                       in enumerate(zip(urls, local_filepaths))}
+            with ProgressBarOrSpinner(
+                    len(urls), 'Downloading {0} files ...'.format(len(urls)),
+                    file=progress_stream) as pb:
+                for done, future in enumerate(as_completed(futures)):
+                    rows[futures[future]] = future.result()
+                    pb.update(done + 1)
+        finally:
+            executor.shutdown(wait=True)
+
+        return Table(rows=rows or None,
+                     names=('URL', 'Local Path', 'Status', 'Message',
+                            'HTTP Status', 'Size', 'Time', 'Exception'),
+                     dtype=(str, str, str, str, int, int, float, object))
+
 
 class suspend_cache:
     """
@@ -20,6 +20,14 @@ class Conf(_config.ConfigNamespace):
         60,
         'Time limit for connecting to SDSS server.')
     default_release = _config.ConfigItem(14, 'Default SDSS data release.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Number of spectra, images or cross-identification batches '
+        'requested concurrently.')
+    crossid_batch_size = _config.ConfigItem(
+        1000,
+        'Maximum number of coordinates uploaded in a single '
+        'cross-identification request.')
 
 
 conf = Conf()
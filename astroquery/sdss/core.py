@@ -10,11 +10,12 @@ import numpy as np
 
 from astropy import units as u
 import astropy.coordinates as coord
-from astropy.table import Table, Column
+from astropy.table import Table, Column, vstack
 
 from ..query import BaseQuery
 from . import conf
 from ..utils import commons, async_to_sync, prepend_docstr_nosections
+from ..utils.concurrency import get_executor
 from ..exceptions import RemoteServiceError, NoResultsWarning
 from .field_names import (photoobj_defs, specobj_defs,
                           crossid_defs, get_field_info)
@@ -102,6 +103,107 @@ class SDSSClass(BaseQuery):
             The data release of the SDSS to use.
         """
 
+        request_payload = self._args_to_crossid_payloads(
+            coordinates, obj_names=obj_names, photoobj_fields=photoobj_fields,
+            specobj_fields=specobj_fields, radius=radius,
+            data_release=data_release, batch_size=0)[0]
+
+        if get_query_payload:
+            return request_payload
+        url = self._get_crossid_url(data_release)
+        response = self._request("POST", url, params=request_payload,
+                                 timeout=timeout, cache=cache)
+        return response
+
+    def query_crossid(self, coordinates, obj_names=None,
+                      photoobj_fields=None, specobj_fields=None,
+                      get_query_payload=False, timeout=TIMEOUT,
+                      radius=5. * u.arcsec,
+                      data_release=conf.default_release, cache=True,
+                      verbose=False, batch_size=None):
+        """
+        Query using the cross-identification web interface.
+
+        Lists of more than ``batch_size`` coordinates are split into
+        batches, uploaded concurrently, and the results are concatenated in
+        the order of ``coordinates``.
+
+        Parameters
+        ----------
+        coordinates : str or `astropy.coordinates` object or list of
+            coordinates or `~astropy.table.Column` of coordinates
+            The target(s) around which to search.
+        radius : str or `~astropy.units.Quantity` object, optional
+            The string must be parsable by `~astropy.coordinates.Angle`.
+            Defaults to 5 arcsec.
+        timeout : float, optional
+            Time limit (in seconds) for establishing successful connection with
+            remote server.  Defaults to `SDSSClass.TIMEOUT`.
+        photoobj_fields : list, optional
+            PhotoObj quantities to return.
+        specobj_fields : list, optional
+            SpecObj quantities to return.
+        obj_names : str, or list or `~astropy.table.Column`, optional
+            Target names, one for each coordinate.
+        get_query_payload : bool
+            If True, this will return the data the query would have sent out
+            (a list of them if the coordinates are split into batches), but
+            does not actually do the query.
+        data_release : int
+            The data release of the SDSS to use.
+        batch_size : int, optional
+            Maximum number of coordinates uploaded in a single request.
+            Defaults to ``conf.crossid_batch_size``; 0 disables batching.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            The matches, or `None` if there are none.
+        """
+        payloads = self._args_to_crossid_payloads(
+            coordinates, obj_names=obj_names, photoobj_fields=photoobj_fields,
+            specobj_fields=specobj_fields, radius=radius,
+            data_release=data_release, batch_size=batch_size)
+        if get_query_payload:
+            return payloads[0] if len(payloads) == 1 else payloads
+
+        url = self._get_crossid_url(data_release)
+
+        def query(payload):
+            return self._request("POST", url, params=payload,
+                                 timeout=timeout, cache=cache)
+
+        if len(payloads) == 1:
+            responses = [query(payloads[0])]
+        else:
+            executor = get_executor(min(conf.max_workers, len(payloads)))
+            try:
+                responses = list(executor.map(query, payloads))
+            finally:
+                executor.shutdown(wait=True)
+
+        tables = [self._parse_result(response, verbose=verbose)
+                  for response in responses]
+        tables = [table for table in tables if table is not None]
+        if not tables:
+            result = None
+        elif len(tables) == 1:
+            result = tables[0]
+        else:
+            result = vstack(tables)
+        self.table = result
+        return result
+
+    def _args_to_crossid_payloads(self, coordinates, obj_names=None,
+                                  photoobj_fields=None, specobj_fields=None,
+                                  radius=5. * u.arcsec,
+                                  data_release=conf.default_release,
+                                  batch_size=None):
+        """
+        Build the CrossID request payloads, one for every batch of at most
+        ``batch_size`` coordinates (``conf.crossid_batch_size`` by default,
+        0 for a single batch).
+        """
         if (not isinstance(coordinates, list) and
                 not isinstance(coordinates, Column) and
                 not (isinstance(coordinates, commons.CoordClasses) and
@@ -146,28 +248,36 @@ class SDSSClass(BaseQuery):
                       FROM #upload u JOIN #x x ON x.up_id = u.up_id \
                       JOIN PhotoObjAll p ON p.objID = x.objID ORDER BY x.up_id'
 
-        data = "obj_id ra dec \n"
-        data += " \n ".join(['{0} {1} {2}'.format(obj_names[i],
-                                                  coordinates[i].ra.deg,
-                                                  coordinates[i].dec.deg)
-                             for i in range(len(coordinates))])
-
-        # firstcol is hardwired, as obj_names is always passed
-        request_payload = dict(uquery=sql_query, paste=data,
-                               firstcol=1,
-                               format='csv', photoScope='nearPrim',
-                               radius=radius,
-                               photoUpType='ra-dec', searchType='photo')
-
-        if data_release > 11:
-            request_payload['searchtool'] = 'CrossID'
-
-        if get_query_payload:
-            return request_payload
-        url = self._get_crossid_url(data_release)
-        response = self._request("POST", url, params=request_payload,
-                                 timeout=timeout, cache=cache)
-        return response
+        # the coordinates of an array SkyCoord are converted all at once
+        if isinstance(coordinates, commons.CoordClasses):
+            ra = coordinates.ra.deg.tolist()
+            dec = coordinates.dec.deg.tolist()
+        else:
+            ra = [coordinate.ra.deg for coordinate in coordinates]
+            dec = [coordinate.dec.deg for coordinate in coordinates]
+        lines = list(map('{0} {1} {2}'.format, obj_names, ra, dec))
+
+        if batch_size is None:
+            batch_size = conf.crossid_batch_size
+        if not batch_size:
+            batch_size = max(len(lines), 1)
+
+        payloads = []
+        for start in range(0, max(len(lines), 1), batch_size):
+            data = "obj_id ra dec \n"
+            data += " \n ".join(lines[start:start + batch_size])
+
+            # firstcol is hardwired, as obj_names is always passed
+            request_payload = dict(uquery=sql_query, paste=data,
+                                   firstcol=1,
+                                   format='csv', photoScope='nearPrim',
+                                   radius=radius,
+                                   photoUpType='ra-dec', searchType='photo')
+
+            if data_release > 11:
+                request_payload['searchtool'] = 'CrossID'
+            payloads.append(request_payload)
+        return payloads
 
     def query_region_async(self, coordinates, radius=2. * u.arcsec,
                            fields=None, spectro=False, timeout=TIMEOUT,
@@ -481,7 +591,7 @@ class SDSSClass(BaseQuery):
                           matches=None, plate=None, fiberID=None, mjd=None,
                           timeout=TIMEOUT, get_query_payload=False,
                           data_release=conf.default_release, cache=True,
-                          show_progress=True):
+                          show_progress=True, memmap=False):
         """
         Download spectrum from SDSS.
 
@@ -524,6 +634,12 @@ class SDSSClass(BaseQuery):
         data_release : int
             The data release of the SDSS to use. With the default server, this
             only supports DR8 or later.
+        memmap : bool, optional
+            If True, files kept uncompressed in the cache are opened with
+            memory mapping instead of being read in memory. Each returned
+            `~astropy.io.fits.HDUList` then keeps its file open until it is
+            closed, so this is not suited to many files at once. Defaults
+            to False.
 
         Returns
         -------
@@ -594,7 +710,8 @@ class SDSSClass(BaseQuery):
             results.append(commons.FileContainer(link,
                                                  encoding='binary',
                                                  remote_timeout=timeout,
-                                                 show_progress=show_progress))
+                                                 show_progress=show_progress,
+                                                 memmap=memmap))
 
         return results
 
@@ -603,7 +720,7 @@ class SDSSClass(BaseQuery):
                     matches=None, plate=None, fiberID=None, mjd=None,
                     timeout=TIMEOUT, cache=True,
                     data_release=conf.default_release,
-                    show_progress=True):
+                    show_progress=True, memmap=False):
         """
         Returns
         -------
@@ -616,20 +733,21 @@ class SDSSClass(BaseQuery):
                                                plate=plate, fiberID=fiberID,
                                                mjd=mjd, timeout=timeout,
                                                data_release=data_release,
-                                               show_progress=show_progress)
+                                               show_progress=show_progress,
+                                               memmap=memmap)
 
         if readable_objs is not None:
             if isinstance(readable_objs, dict):
                 return readable_objs
             else:
-                return [obj.get_fits() for obj in readable_objs]
+                return self._get_fits(readable_objs)
 
     def get_images_async(self, coordinates=None, radius=2. * u.arcsec,
                          matches=None, run=None, rerun=301, camcol=None,
                          field=None, band='g', timeout=TIMEOUT,
                          get_query_payload=False, cache=True,
                          data_release=conf.default_release,
-                         show_progress=True):
+                         show_progress=True, memmap=False):
         """
         Download an image from SDSS.
 
@@ -682,6 +800,12 @@ class SDSSClass(BaseQuery):
             but does not actually do the query.
         data_release : int
             The data release of the SDSS to use.
+        memmap : bool, optional
+            If True, files kept uncompressed in the cache are opened with
+            memory mapping instead of being read in memory. Each returned
+            `~astropy.io.fits.HDUList` then keeps its file open until it is
+            closed, so this is not suited to many files at once. Defaults
+            to False.
 
         Returns
         -------
@@ -744,7 +868,7 @@ class SDSSClass(BaseQuery):
 
                 results.append(commons.FileContainer(
                     link, encoding='binary', remote_timeout=timeout,
-                    cache=cache, show_progress=show_progress))
+                    cache=cache, show_progress=show_progress, memmap=memmap))
 
         return results
 
@@ -753,7 +877,7 @@ class SDSSClass(BaseQuery):
                    matches=None, run=None, rerun=301, camcol=None, field=None,
                    band='g', timeout=TIMEOUT, cache=True,
                    get_query_payload=False, data_release=conf.default_release,
-                   show_progress=True):
+                   show_progress=True, memmap=False):
         """
         Returns
         -------
@@ -765,16 +889,16 @@ class SDSSClass(BaseQuery):
             coordinates=coordinates, radius=radius, matches=matches, run=run,
             rerun=rerun, data_release=data_release, camcol=camcol, field=field,
             band=band, timeout=timeout, get_query_payload=get_query_payload,
-            show_progress=show_progress)
+            show_progress=show_progress, memmap=memmap)
 
         if readable_objs is not None:
             if isinstance(readable_objs, dict):
                 return readable_objs
             else:
-                return [obj.get_fits() for obj in readable_objs]
+                return self._get_fits(readable_objs)
 
     def get_spectral_template_async(self, kind='qso', timeout=TIMEOUT,
-                                    show_progress=True):
+                                    show_progress=True, memmap=False):
         """
         Download spectral templates from SDSS DR-2.
 
@@ -794,6 +918,12 @@ class SDSSClass(BaseQuery):
         timeout : float, optional
             Time limit (in seconds) for establishing successful connection with
             remote server.  Defaults to `SDSSClass.TIMEOUT`.
+        memmap : bool, optional
+            If True, files kept uncompressed in the cache are opened with
+            memory mapping instead of being read in memory. Each returned
+            `~astropy.io.fits.HDUList` then keeps its file open until it is
+            closed, so this is not suited to many files at once. Defaults
+            to False.
 
         Examples
         --------
@@ -821,13 +951,14 @@ class SDSSClass(BaseQuery):
             results.append(commons.FileContainer(link,
                                                  remote_timeout=timeout,
                                                  encoding='binary',
-                                                 show_progress=show_progress))
+                                                 show_progress=show_progress,
+                                                 memmap=memmap))
 
         return results
 
     @prepend_docstr_nosections(get_spectral_template_async.__doc__)
     def get_spectral_template(self, kind='qso', timeout=TIMEOUT,
-                              show_progress=True):
+                              show_progress=True, memmap=False):
         """
         Returns
         -------
@@ -836,10 +967,26 @@ class SDSSClass(BaseQuery):
         """
 
         readable_objs = self.get_spectral_template_async(
-            kind=kind, timeout=timeout, show_progress=show_progress)
+            kind=kind, timeout=timeout, show_progress=show_progress,
+            memmap=memmap)
 
         if readable_objs is not None:
-            return [obj.get_fits() for obj in readable_objs]
+            return self._get_fits(readable_objs)
+
+    def _get_fits(self, readable_objs):
+        """
+        Download the files of a list of `~astroquery.utils.commons.FileContainer`
+        objects, ``conf.max_workers`` at a time, and open them as
+        `~astropy.io.fits.HDUList` objects.
+        """
+        if conf.max_workers > 1 and len(readable_objs) > 1:
+            executor = get_executor(min(conf.max_workers, len(readable_objs)))
+            try:
+                # list() re-raises the first download error, if any
+                list(executor.map(lambda obj: obj.prefetch(), readable_objs))
+            finally:
+                executor.shutdown(wait=True)
+        return [obj.get_fits() for obj in readable_objs]
 
     def _parse_result(self, response, verbose=False):
         """
@@ -193,6 +193,24 @@ def test_sdss_spectrum_coords(patch_get, patch_get_readable_fileobj, dr,
     image_tester(sp, 'spectra')
 
 
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_sdss_spectra_memmap(patch_get, patch_get_readable_fileobj,
+                             max_workers):
+    matches = Table(rows=[('sdss', '26', 2345, 53757, fiber)
+                          for fiber in range(1, 7)],
+                    names=('instrument', 'run2d', 'plate', 'mjd', 'fiberID'))
+    with sdss.conf.set_temp('max_workers', max_workers):
+        sp = sdss.SDSS.get_spectra(matches=matches)
+        assert len(sp) == 6
+        image_tester(sp, 'spectra')
+        assert not any(hdulist._file for hdulist in sp)
+
+        sp = sdss.SDSS.get_spectra(matches=matches, memmap=True)
+    image_tester(sp, 'spectra')
+    # the cached files are opened in place, not read in memory
+    assert all(hdulist._file.memmap for hdulist in sp)
+
+
 @pytest.mark.parametrize("dr", dr_list)
 def test_sdss_sql(patch_get, patch_get_readable_fileobj, dr):
     query = """
@@ -325,6 +343,40 @@ def test_query_crossid(patch_post, dr):
     url_tester_crossid(dr)
 
 
+def test_query_crossid_batches(monkeypatch):
+    requests = []
+
+    def post(method, url, params=None, **kwargs):
+        requests.append(params)
+        return post_mockreturn(method, url, params=params, **kwargs)
+
+    monkeypatch.setattr(sdss.SDSS, '_request', post)
+    ra = np.linspace(10, 11, 5)
+    coordinates = commons.ICRSCoordGenerator(ra, np.zeros(5), unit='deg')
+    single = sdss.SDSS.query_crossid(coordinates, batch_size=0)
+    assert len(requests) == 1
+    payload = requests[0]
+
+    requests[:] = []
+    with sdss.conf.set_temp('max_workers', 2):
+        xid = sdss.SDSS.query_crossid(coordinates, batch_size=2)
+    assert len(requests) == 3
+    assert len(xid) == 3 * len(single)
+    assert xid.colnames == single.colnames
+    names = [line.split()[0] for request in requests
+             for line in request['paste'].split('\n')[1:]]
+    assert names == ['obj_{0}'.format(i) for i in range(5)]
+    assert payload['paste'].startswith(requests[0]['paste'] + " \n ")
+    assert requests[0]['paste'] == ("obj_id ra dec \nobj_0 10.0 0.0 \n "
+                                    "obj_1 10.25 0.0")
+
+    payloads = sdss.SDSS.query_crossid(coordinates, batch_size=3,
+                                       get_query_payload=True)
+    assert len(payloads) == 2
+    assert payloads[1]['paste'] == "obj_id ra dec \nobj_3 {0} 0.0 \n " \
+        "obj_4 11.0 0.0".format(ra[3])
+
+
 # ===========
 # Payload tests
 
@@ -28,6 +28,21 @@ class Conf(_config.ConfigNamespace):
         0,
         'Maximum number of rows that will be fetched from the result.')
 
+    batch_size = _config.ConfigItem(
+        10000,
+        'Maximum number of objects or coordinates sent in a single script by '
+        'query_objects and query_region; longer lists are split into '
+        'batches queried concurrently.  Set to 0 to disable batching.')
+
+    max_workers = _config.ConfigItem(
+        4,
+        'Maximum number of batches queried at the same time.')
+
+    queries_per_second = _config.ConfigItem(
+        6,
+        'Maximum number of batch queries started per second, following the '
+        'SIMBAD usage guidelines.')
+
 
 conf = Conf()
 
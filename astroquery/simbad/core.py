@@ -12,11 +12,13 @@ import warnings
 import astropy.units as u
 from astropy.utils.data import get_pkg_data_filename
 import astropy.coordinates as coord
-from astropy.table import Table
+from astropy.table import Table, vstack
 import astropy.io.votable as votable
+import six
 from six import BytesIO
 from ..query import BaseQuery
 from ..utils import commons
+from ..utils.concurrency import get_executor, RateLimiter
 from ..exceptions import TableParseError, LargeQueryWarning
 from . import conf
 from ..utils.process_asyncs import async_to_sync
@@ -92,6 +94,9 @@ error_regex = re.compile(r'(?ms)\[(?P<line>\d+)\]\s?(?P<msg>.+?)(\[|\Z)')
 SimbadError = namedtuple('SimbadError', ('line', 'msg'))
 VersionInfo = namedtuple('VersionInfo', ('major', 'minor', 'micro', 'patch'))
 
+# shared by all the SimbadClass instances, SIMBAD limits queries per IP
+_rate_limiter = RateLimiter(conf.queries_per_second)
+
 
 class SimbadResult(object):
     __sections = ('script', 'console', 'error', 'data')
@@ -542,7 +547,7 @@ class SimbadClass(BaseQuery):
         return response
 
     def query_objects(self, object_names, wildcard=False, verbose=False,
-                      get_query_payload=False):
+                      get_query_payload=False, batch_size=None):
         """
         Queries Simbad for the specified list of objects and returns the
         results as a `~astropy.table.Table`. Object names may be specified
@@ -556,16 +561,34 @@ class SimbadClass(BaseQuery):
             When `True`, the names may have wildcards in them. Defaults to
             `False`.
         get_query_payload : bool, optional
-            When set to `True` the method returns the HTTP request parameters.
+            When set to `True` the method returns the HTTP request parameters
+            (a list of them if the objects are split into batches).
             Defaults to `False`.
+        batch_size : int, optional
+            Lists of more than ``batch_size`` objects are split into batches
+            queried concurrently; the results are concatenated in the order
+            of ``object_names``.  Defaults to ``conf.batch_size``; 0 disables
+            batching.
 
         Returns
         -------
         table : `~astropy.table.Table`
             Query results table
         """
-        return self.query_object('\n'.join(object_names), wildcard=wildcard,
-                                 get_query_payload=get_query_payload)
+        object_names = list(object_names)
+        batches = _split(object_names, batch_size)
+        if len(batches) == 1:
+            return self.query_object('\n'.join(object_names),
+                                     wildcard=wildcard, verbose=verbose,
+                                     get_query_payload=get_query_payload)
+
+        payloads = [self._args_to_payload('\n'.join(batch),
+                                          wildcard=wildcard,
+                                          caller='query_object_async')
+                    for batch in batches]
+        if get_query_payload:
+            return payloads
+        return self._query_batches(payloads, verbose=verbose)
 
     def query_objects_async(self, object_names, wildcard=False, cache=True,
                             get_query_payload=False):
@@ -593,6 +616,67 @@ class SimbadClass(BaseQuery):
                                        wildcard=wildcard, cache=cache,
                                        get_query_payload=get_query_payload)
 
+    def query_region(self, coordinates, radius=2*u.arcmin, equinox=2000.0,
+                     epoch='J2000', cache=True, get_query_payload=False,
+                     verbose=False, batch_size=None):
+        """
+        Queries around a coordinate or a list of coordinates and returns the
+        results as a `~astropy.table.Table`.
+
+        Parameters
+        ----------
+        coordinates : str or `astropy.coordinates` object
+            the identifier or coordinates around which to query.
+        radius : str or `~astropy.units.Quantity`, optional
+            the radius of the region. If missing, set to default
+            value of 2 arcmin.
+        equinox : float, optional
+            the equinox of the coordinates. If missing set to
+            default 2000.0.
+        epoch : str, optional
+            the epoch of the input coordinates. Must be specified as
+            [J|B] <epoch>. If missing, set to default J2000.
+        get_query_payload : bool, optional
+            When set to `True` the method returns the HTTP request parameters
+            (a list of them if the coordinates are split into batches).
+            Defaults to `False`.
+        batch_size : int, optional
+            Lists of more than ``batch_size`` coordinates are split into
+            batches queried concurrently; the results are concatenated in the
+            order of ``coordinates``.  Defaults to ``conf.batch_size``; 0
+            disables batching.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            Query results table
+        """
+        if (isinstance(coordinates, six.string_types) or
+                not _has_length(coordinates)):
+            batches = [coordinates]
+        else:
+            batches = _split(coordinates, batch_size)
+        if len(batches) == 1:
+            response = self.query_region_async(
+                coordinates, radius=radius, equinox=equinox, epoch=epoch,
+                cache=cache, get_query_payload=get_query_payload)
+            if get_query_payload:
+                return response
+            return self._parse_result(response, SimbadVOTableResult,
+                                      verbose=verbose)
+
+        # radii given per coordinate are split along with the coordinates
+        radii = None
+        if _has_length(radius) and len(radius) == len(coordinates):
+            radii = _split(radius, len(batches[0]))
+        payloads = [self.query_region_async(
+            batch, radius=radius if radii is None else radii[i],
+            equinox=equinox, epoch=epoch, get_query_payload=True)
+            for i, batch in enumerate(batches)]
+        if get_query_payload:
+            return payloads
+        return self._query_batches(payloads, cache=cache, verbose=verbose)
+
     def query_region_async(self, coordinates, radius=2*u.arcmin,
                            equinox=2000.0, epoch='J2000', cache=True,
                            get_query_payload=False):
@@ -990,6 +1074,39 @@ class SimbadClass(BaseQuery):
         script += votable_footer
         return dict(script=script)
 
+    def _query_batches(self, payloads, cache=True, verbose=False):
+        """
+        Send several scripts concurrently, starting at most
+        ``conf.queries_per_second`` of them per second, and return the
+        concatenation of their VOTable results, in the order of ``payloads``.
+        """
+        _rate_limiter.rate = conf.queries_per_second
+
+        def query(payload):
+            _rate_limiter.wait()
+            return self._request("POST", self.SIMBAD_URL, data=payload,
+                                 timeout=self.TIMEOUT, cache=cache)
+
+        executor = get_executor(min(conf.max_workers, len(payloads)))
+        try:
+            responses = list(executor.map(query, payloads))
+        finally:
+            executor.shutdown(wait=True)
+
+        tables = []
+        errors = []
+        for response in responses:
+            table = self._parse_result(response, SimbadVOTableResult,
+                                       verbose=verbose)
+            errors.extend(self.last_parsed_result.errors)
+            if table is not None:
+                tables.append(table)
+        if not tables:
+            return None
+        result = vstack(tables, metadata_conflicts='silent')
+        result.errors = errors
+        return result
+
     def _parse_result(self, result, resultclass=SimbadVOTableResult,
                       verbose=False):
         """
@@ -1031,6 +1148,19 @@ def _parse_coordinates(coordinates):
         raise ValueError("Coordinates not specified correctly")
 
 
+def _split(items, batch_size=None):
+    """
+    Split ``items`` in consecutive batches of at most ``batch_size`` (by
+    default ``conf.batch_size``) items; a batch size of 0 disables splitting.
+    """
+    if batch_size is None:
+        batch_size = conf.batch_size
+    if not batch_size or len(items) <= batch_size:
+        return [items]
+    return [items[start:start + batch_size]
+            for start in range(0, len(items), batch_size)]
+
+
 def _has_length(x):
     # some objects have '__len__' attributes but have no len()
     try:
@@ -5,6 +5,7 @@ import re
 import six
 import pytest
 import astropy.units as u
+import astropy.coordinates as coord
 from astropy.table import Table
 import numpy as np
 
@@ -295,6 +296,37 @@ def test_query_region_small_radius(patch_post, coordinates, radius,
     assert isinstance(result2, Table)
 
 
+def test_query_objects_batches(patch_post):
+    names = ['m1', 'm2', 'm3', 'm4', 'm5']
+    payloads = simbad.core.Simbad.query_objects(names, batch_size=2,
+                                                get_query_payload=True)
+    assert len(payloads) == 3
+    assert 'm1\nm2 ' in payloads[0]['script']
+    assert 'm3\nm4 ' in payloads[1]['script']
+    assert 'm5 ' in payloads[2]['script']
+
+    single = simbad.core.Simbad.query_objects(names)
+    batched = simbad.core.Simbad.query_objects(names, batch_size=2)
+    assert len(batched) == 3 * len(single)
+    assert batched.colnames == single.colnames
+
+
+def test_query_region_batches(patch_post):
+    coordinates = coord.SkyCoord([10, 20, 30] * u.deg, [1, 2, 3] * u.deg)
+    radius = [1, 2, 3] * u.arcmin
+    payloads = simbad.core.Simbad.query_region(coordinates, radius=radius,
+                                               batch_size=2,
+                                               get_query_payload=True)
+    assert len(payloads) == 2
+    assert payloads[0]['script'].count('query coo') == 2
+    assert 'coo 2:00:00 +3:00:00 radius=3.0' in payloads[1]['script']
+
+    single = simbad.core.Simbad.query_region(coordinates, radius=radius)
+    batched = simbad.core.Simbad.query_region(coordinates, radius=radius,
+                                              batch_size=2)
+    assert len(batched) == 2 * len(single)
+
+
 @pytest.mark.parametrize(('object_name', 'wildcard'),
                          [("m1", None),
                           ("m [0-9]", True)
@@ -0,0 +1,173 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import time
+
+import pytest
+import requests
+import astropy.units as u
+
+from .. import cache, query
+
+
+def make_response(content, url='http://example.org/data', status_code=200,
+                  body='a=1&b=2'):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = 'OK'
+    response.url = url
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = 'text/plain'
+    response._content = content
+    request = requests.PreparedRequest()
+    request.prepare(method='POST', url=url, data=body)
+    response.request = request
+    return response
+
+
+@pytest.fixture(params=['sqlite', 'pickle'])
+def backend(request, tmpdir):
+    return cache.get_cache_backend(str(tmpdir), backend=request.param)
+
+
+def test_roundtrip(backend):
+    assert backend.get('abc') is None
+    backend.set('abc', make_response(b'hello'))
+
+    response = backend.get('abc')
+    assert response.status_code == 200
+    assert response.content == b'hello'
+    assert response.text == 'hello'
+    assert response.headers['content-type'] == 'text/plain'
+    assert response.url == 'http://example.org/data'
+    assert 'b=2' in response.request.body
+
+    stats = backend.stats()
+    assert stats['entries'] == 1
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+    backend.delete('abc')
+    assert backend.get('abc') is None
+
+
+def test_ttl(backend, monkeypatch):
+    backend.set('abc', make_response(b'hello'))
+    assert backend.get('abc', ttl=3600) is not None
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 7200)
+    assert backend.get('abc', ttl=3600) is None
+    assert backend.stats()['entries'] == 0
+
+
+def test_clear_older_than(tmpdir, monkeypatch):
+    backend = cache.SQLiteCache(str(tmpdir))
+    backend.set('old', make_response(b'old'))
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 7200)
+    backend.set('new', make_response(b'new'))
+
+    assert backend.clear(older_than=3600) == 1
+    assert backend.get('old') is None
+    assert backend.get('new') is not None
+    assert backend.clear() == 1
+    assert backend.stats()['entries'] == 0
+
+
+def test_lru_eviction(tmpdir):
+    store = cache.SQLiteCache(str(tmpdir), max_size=25)
+    store.set('a', make_response(b'a' * 10))
+    time.sleep(0.01)
+    store.set('b', make_response(b'b' * 10))
+    time.sleep(0.01)
+    # touching 'a' makes 'b' the least recently used entry
+    assert store.get('a') is not None
+    store.set('c', make_response(b'c' * 10))
+
+    assert store.get('b') is None
+    assert store.get('a') is not None
+    assert store.get('c') is not None
+    assert store.stats()['size'] == 20
+
+
+def test_size_total(tmpdir, monkeypatch):
+    store = cache.SQLiteCache(str(tmpdir), max_size=100)
+    store.set('a', make_response(b'a' * 10))
+    store.set('a', make_response(b'a' * 5))
+    store.set('b', make_response(b'b' * 20))
+    store.delete('b')
+    store.delete('missing')
+    assert store._size == store.stats()['size'] == 5
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 7200)
+    store.set('c', make_response(b'c' * 30))
+    store.clear(older_than=3600)
+    assert store._size == store.stats()['size'] == 30
+    # the total is read back when the database is opened again
+    assert cache.SQLiteCache(str(tmpdir))._size == 30
+    store.clear()
+    assert store._size == 0
+
+
+def test_object_cache(tmpdir):
+    responses = cache.get_cache_backend(str(tmpdir), backend='sqlite')
+    objects = cache.get_object_cache(str(tmpdir), 'tables', max_size=2000)
+    assert cache.get_object_cache(str(tmpdir), 'tables') is objects
+    # stored next to the responses, in the same database
+    assert objects.path == responses.path
+
+    assert objects.get('a') is None
+    objects.set('a', {'rows': list(range(100))})
+    responses.set('a', make_response(b'hello'))
+    assert objects.get('a') == {'rows': list(range(100))}
+    assert responses.get('a').content == b'hello'
+    assert objects.stats()['entries'] == 1
+    assert objects.stats()['namespace'] == 'tables'
+
+    # entries that cannot be read back are dropped
+    objects._execute("UPDATE {0} SET value = ?", (b'not a pickle',))
+    assert objects.get('a') is None
+    assert objects.stats()['entries'] == 0
+
+    # the size bound is kept like for responses
+    for key in 'bcd':
+        objects.set(key, b'x' * 800)
+    assert objects.get('b') is None
+    assert objects.get('d') == b'x' * 800
+
+    assert objects.clear() == 2
+    assert responses.stats()['entries'] == 1
+    with pytest.raises(ValueError):
+        cache.ObjectCache(str(tmpdir), 'tables; DROP TABLE responses')
+
+
+def test_request_uses_cache(tmpdir, monkeypatch):
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        return make_response(b'payload', url=url)
+
+    bq = query.BaseQuery()
+    bq.cache_location = str(tmpdir)
+    monkeypatch.setattr(bq._session, 'request', request)
+
+    first = bq._request('GET', 'http://example.org/data', params={'a': 1})
+    second = bq._request('GET', 'http://example.org/data', params={'a': 1})
+    assert first.content == second.content == b'payload'
+    assert len(calls) == 1
+
+    bq._request('GET', 'http://example.org/data', params={'a': 1},
+                cache=False)
+    assert len(calls) == 2
+
+    assert bq.cache_stats()['entries'] == 1
+    assert bq.clear_cache(older_than=1 * u.day) == 0
+    assert bq.clear_cache() == 1
+
+    bq.cache_ttl = 1 * u.s
+    bq._request('GET', 'http://example.org/data', params={'a': 1})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 10)
+    bq._request('GET', 'http://example.org/data', params={'a': 1})
+    assert len(calls) == 4
@@ -0,0 +1,55 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import io
+import os
+
+import requests
+
+from .. import query
+
+
+def make_stream(url, content, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response.headers['content-length'] = str(len(content))
+    response.raw = io.BytesIO(content)
+    return response
+
+
+def test_download_files_parallel(tmpdir, monkeypatch):
+    files = {'http://example.org/{0}.fits'.format(ii): os.urandom(100 + ii)
+             for ii in range(10)}
+    missing = 'http://example.org/missing.fits'
+    requested = []
+
+    def request(method, url, **kwargs):
+        requested.append(url)
+        if url == missing:
+            return make_stream(url, b'', status_code=404)
+        return make_stream(url, files[url])
+
+    bq = query.BaseQuery()
+    monkeypatch.setattr(bq._session, 'request', request)
+
+    urls = sorted(files) + [missing]
+    paths = [str(tmpdir.join(url.split('/')[-1])) for url in urls]
+    manifest = bq._download_files_parallel(urls, paths, max_workers=4,
+                                           per_host_limit=2)
+
+    assert list(manifest['URL']) == urls
+    assert list(manifest['Local Path']) == paths
+    assert list(manifest['Status']) == ['COMPLETE'] * 10 + ['ERROR']
+    assert manifest['HTTP Status'][-1] == 404
+    # the original error is kept with its response
+    assert manifest['Exception'][-1].response.status_code == 404
+    assert all(error is None for error in manifest['Exception'][:-1])
+    for url, path, size in zip(urls[:-1], paths, manifest['Size']):
+        with open(path, 'rb') as fh:
+            assert fh.read() == files[url]
+        assert size == len(files[url])
+
+    # complete files are found in the cache and not downloaded again
+    del requested[:]
+    manifest = bq._download_files_parallel(urls[:-1], paths[:-1], cache=True)
+    assert list(manifest['Status']) == ['COMPLETE'] * 10
+    assert len(requested) == 10
@@ -3,11 +3,13 @@
 Common functions and classes that are required by all query classes.
 """
 
+import io
 import re
 import warnings
 import os
 import shutil
 import socket
+import threading
 
 import requests
 
@@ -23,6 +25,7 @@ from astropy.coordinates import BaseCoordinateFrame
 
 from ..exceptions import TimeoutError
 from .. import version
+from .concurrency import get_executor
 
 
 def ICRSCoordGenerator(*args, **kwargs):
@@ -48,6 +51,7 @@ CoordClasses = (coord.SkyCoord, BaseCoordinateFrame)
 __all__ = ['send_request',
            'parse_coordinates',
            'TableList',
+           'LazyTableList',
            'suppress_vo_warnings',
            'validate_email']
 
@@ -292,6 +296,103 @@ class TableList(list):
         self.print_table_list()
 
 
+class LazyTableList(TableList):
+
+    """
+    A `TableList` whose tables are only created the first time they are
+    accessed, by key, index, slice or iteration.
+
+    Parameters
+    ----------
+    inp : OrderedDict or list of (key, loader) pairs
+        ``loader`` is a callable without arguments returning the
+        `~astropy.table.Table` stored under ``key``. It is called at most
+        once.
+    """
+
+    def __init__(self, inp):
+        super(LazyTableList, self).__init__(inp)
+        self._pending = dict(enumerate(self._dict.values()))
+        self._locks = [threading.Lock() for _ in self._pending]
+
+    def _load(self, index):
+        index = range(len(self))[index]
+        if index in self._pending:
+            with self._locks[index]:
+                if index in self._pending:
+                    table = self._pending[index]()
+                    self._dict[self.keys()[index]] = table
+                    list.__setitem__(self, index, table)
+                    del self._pending[index]
+        return list.__getitem__(self, index)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._load(key)
+        elif isinstance(key, slice):
+            return [self._load(index)
+                    for index in range(*key.indices(len(self)))]
+        elif key in self._dict:
+            return self._load(self.keys().index(key))
+        else:
+            raise TypeError("TableLists can only be indexed with the "
+                            "named keys and integers.")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._load(index)
+
+    def values(self):
+        return list(self)
+
+    def is_loaded(self, key):
+        """
+        Returns `True` if the table stored under ``key`` (a name or an
+        index) has already been created.
+        """
+        if not isinstance(key, int):
+            key = self.keys().index(key)
+        return range(len(self))[key] not in self._pending
+
+    def load(self, max_workers=1):
+        """
+        Creates all the tables not accessed yet, using up to
+        ``max_workers`` threads, and returns the list.
+        """
+        pending = sorted(self._pending)
+        if max_workers > 1 and len(pending) > 1:
+            with get_executor(min(max_workers, len(pending))) as executor:
+                list(executor.map(self._load, pending))
+        else:
+            for index in pending:
+                self._load(index)
+        return self
+
+    def format_table_list(self):
+        """
+        Prints the names of all `astropy.table.Table` objects contained in
+        the `LazyTableList` instance, with the number of rows and columns
+        of those already created.
+        """
+        ntables = len(self)
+        if ntables == 0:
+            return "Empty TableList"
+
+        lines = ["TableList with {keylen} tables:".format(keylen=ntables)]
+        for t_number, t_name in enumerate(self.keys()):
+            if t_number in self._pending:
+                lines.append("\t'{t_number}:{t_name}' (not loaded yet)"
+                             .format(t_number=t_number, t_name=t_name))
+            else:
+                table = list.__getitem__(self, t_number)
+                lines.append("\t'{t_number}:{t_name}' with {ncol} column(s) "
+                             "and {nrow} row(s) "
+                             .format(t_number=t_number, t_name=t_name,
+                                     nrow=len(table),
+                                     ncol=len(table.colnames)))
+        return "\n".join(lines)
+
+
 def _is_coordinate(coordinates):
     """
     Returns `True` if coordinates can be parsed via `astropy.coordinates`
@@ -345,9 +446,14 @@ class FileContainer(object):
     """
     A File Object container, meant to offer lazy access to downloaded FITS
     files.
+
+    With ``memmap=True``, binary files kept in the download cache are not
+    read in memory: `get_fits` opens the cached file with
+    ``fits.open(..., memmap=True)``.  The returned `~astropy.io.fits.HDUList`
+    then keeps the file open until it is closed.
     """
 
-    def __init__(self, target, **kwargs):
+    def __init__(self, target, memmap=False, **kwargs):
         kwargs.setdefault('cache', True)
         self._target = target
         self._timeout = kwargs.get('remote_timeout', aud.conf.remote_timeout)
@@ -355,16 +461,48 @@ class FileContainer(object):
                 ('encoding' in kwargs and kwargs['encoding'] == 'binary')):
             warnings.warn("FITS files must be read as binaries; error is "
                           "likely.")
+        self._memmap = (memmap and kwargs['cache'] and
+                        kwargs.get('encoding') == 'binary')
         self._readable_object = get_readable_fileobj(target, **kwargs)
 
+    def prefetch(self):
+        """
+        Download the file, or find it in the cache, without parsing it.
+
+        With ``memmap=True``, only the path of the cached file is kept if
+        it can be opened again directly, otherwise the content of the file
+        is read.
+        """
+        if hasattr(self, '_string') or hasattr(self, '_local_path'):
+            return
+        try:
+            with self._readable_object as f:
+                path = getattr(f, 'name', None)
+                # compressed files are read through a decompressing object
+                if (self._memmap and
+                        isinstance(f, (io.FileIO, io.BufferedReader)) and
+                        isinstance(path, six.string_types) and
+                        os.path.isfile(path)):
+                    self._local_path = path
+                else:
+                    self._string = f.read()
+        except URLError as e:
+            if isinstance(e.reason, socket.timeout):
+                raise TimeoutError("Query timed out, time elapsed {t}s".
+                                   format(t=self._timeout))
+            else:
+                raise e
+
     def get_fits(self):
         """
         Assuming the contained file is a FITS file, read it
         and return the file parsed as FITS HDUList
         """
-        filedata = self.get_string()
-
-        self._fits = fits.HDUList.fromstring(filedata)
+        self.prefetch()
+        if hasattr(self, '_local_path'):
+            self._fits = fits.open(self._local_path, memmap=True)
+        else:
+            self._fits = fits.HDUList.fromstring(self._string)
 
         return self._fits
 
@@ -416,17 +554,10 @@ class FileContainer(object):
         """
         Download the file as a string
         """
+        self.prefetch()
         if not hasattr(self, '_string'):
-            try:
-                with self._readable_object as f:
-                    data = f.read()
-                    self._string = data
-            except URLError as e:
-                if isinstance(e.reason, socket.timeout):
-                    raise TimeoutError("Query timed out, time elapsed {t}s".
-                                       format(t=self._timeout))
-                else:
-                    raise e
+            with open(self._local_path, 'rb') as f:
+                self._string = f.read()
 
         return self._string
 
@@ -0,0 +1,64 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Thread pool helpers shared by the query classes that issue several
+independent requests at once.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+import threading
+import time
+
+HAS_FUTURES = True
+try:  # pragma: PY3
+    from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+except ImportError:
+    try:  # pragma: PY2
+        from astropy.utils.compat.futures import (Future, ThreadPoolExecutor,
+                                                  as_completed)
+    except ImportError:
+        HAS_FUTURES = False
+        Future = None
+
+__all__ = ['HAS_FUTURES', 'Future', 'ThreadPoolExecutor', 'as_completed',
+           'get_executor', 'RateLimiter']
+
+
+def get_executor(max_workers):
+    """
+    Return a `~concurrent.futures.ThreadPoolExecutor` with ``max_workers``
+    threads.
+
+    Raises
+    ------
+    ImportError
+        If no implementation of :py:mod:`concurrent.futures` is available.
+    """
+    if not HAS_FUTURES:
+        raise ImportError('concurrent.futures library not found')
+    return ThreadPoolExecutor(max(1, int(max_workers)))
+
+
+class RateLimiter(object):
+    """
+    Space out calls made from any number of threads so that at most
+    ``rate`` of them start every second.
+
+    Parameters
+    ----------
+    rate : float
+        Maximum number of calls per second.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = 0.
+
+    def wait(self):
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + 1. / self.rate
+        if delay > 0:
+            time.sleep(delay)
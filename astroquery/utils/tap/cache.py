@@ -0,0 +1,110 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+=============
+TAP plus
+=============
+
+Local cache of TAP query results.
+
+Results are stored as pickled `astropy.table.Table` objects in an
+`~astroquery.cache.ObjectCache`, which keeps their units, masks and metadata
+and is much faster to load than the VOTable they were parsed from.  Entries
+are keyed on the service URL, the ADQL query with its white space
+normalized, the output format, the content of the uploaded table, if any,
+and the user logged in to the service.  The cache is bounded in size (least
+recently used entries are evicted first) and entries can expire after a
+time-to-live.
+
+"""
+import hashlib
+import json
+import os
+import re
+
+from astropy import config as _config
+from astropy.config.paths import get_cache_dir
+
+from astroquery.cache import get_object_cache
+
+__all__ = ['Conf', 'conf', 'normalize_query', 'result_key',
+           'get_result_cache']
+
+
+class Conf(_config.ConfigNamespace):
+    """
+    Configuration parameters for the TAP result cache.
+    """
+    max_size = _config.ConfigItem(
+        1024,
+        'Maximum size of the TAP result cache, in megabytes. Least recently '
+        'used results are evicted first.  Set to 0 for an unbounded cache.')
+    ttl = _config.ConfigItem(
+        0,
+        'Time, in seconds, after which a cached TAP result expires. Set to 0 '
+        'for results that never expire.')
+
+
+conf = Conf()
+
+# string literals and quoted identifiers are kept as they are
+_QUERY_TOKENS = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+)")
+
+
+def normalize_query(query):
+    """
+    Returns ``query`` with its white space (outside of string literals and
+    quoted identifiers) collapsed and its trailing semicolon removed, so that
+    queries differing only in their layout share a cache entry.
+    """
+    tokens = _QUERY_TOKENS.split(query.strip())
+    normalized = ''.join(' ' if token.isspace() else token
+                         for token in tokens)
+    return normalized.rstrip('; ')
+
+
+def result_key(url, query, output_format, upload_resource=None,
+               upload_table_name=None, user=None):
+    """
+    Returns the cache key of a query.
+
+    Parameters
+    ----------
+    url : str
+        URL of the TAP service
+    query : str
+        ADQL query
+    output_format : str
+        results format
+    upload_resource : str, optional
+        file uploaded with the query, hashed by content
+    upload_table_name : str, optional
+        name of the uploaded table
+    user : str, optional
+        user logged in to the service, whose private tables the query may
+        read
+    """
+    upload = None
+    if upload_resource is not None:
+        with open(upload_resource, 'rb') as f:
+            upload = [upload_table_name,
+                      hashlib.sha256(f.read()).hexdigest()]
+    description = json.dumps([url, normalize_query(query),
+                              output_format, upload, user])
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+def get_result_cache(location=None):
+    """
+    Returns the TAP result cache stored in ``location``, shared by every Tap
+    instance using that directory.
+
+    Parameters
+    ----------
+    location : str, optional
+        The cache directory.  Defaults to the ``tap`` directory of the
+        astroquery cache.
+    """
+    if location is None:
+        location = os.path.join(get_cache_dir(), 'astroquery', 'tap')
+    return get_object_cache(location, 'tap_results',
+                            max_size=conf.max_size * 2**20)
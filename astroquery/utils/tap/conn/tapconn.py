@@ -28,13 +28,19 @@ from six.moves.urllib.parse import urlencode
 
 
 import mimetypes
+import socket
+import threading
 import time
+import zlib
 
 
-__all__ = ['TapConn']
+__all__ = ['TapConn', 'ConnectionHandler', 'PooledResponse']
 
 CONTENT_TYPE_POST_DEFAULT = "application/x-www-form-urlencoded"
 
+# maximum number of idle keep-alive connections kept per host and protocol
+POOL_SIZE = 4
+
 
 class TapConn(object):
     """TAP plus connection class
@@ -99,9 +105,12 @@ class TapConn(object):
         self.__tapContext = None
         self.__postHeaders = {
             "Content-type": CONTENT_TYPE_POST_DEFAULT,
-            "Accept": "text/plain"
+            "Accept": "text/plain",
+            "Accept-Encoding": "gzip"
+            }
+        self.__getHeaders = {
+            "Accept-Encoding": "gzip"
             }
-        self.__getHeaders = {}
         self.__cookie = None
         self.__currentStatus = 0
         self.__currentReason = ""
@@ -129,13 +138,9 @@ class TapConn(object):
         -------
         An HTTP(s) response object
         """
-        conn = self.__get_connection(verbose)
         context = self.__get_tap_context(subcontext)
-        conn.request("GET", context, None, self.__getHeaders)
-        response = conn.getresponse()
-        self.__currentReason = response.reason
-        self.__currentStatus = response.status
-        return response
+        return self.__execute("GET", context, None, dict(self.__getHeaders),
+                              False, verbose)
 
     def execute_post(self, subcontext, data,
                      content_type=CONTENT_TYPE_POST_DEFAULT, verbose=False):
@@ -159,14 +164,10 @@ class TapConn(object):
         -------
         An HTTP(s) response object
         """
-        conn = self.__get_connection(verbose)
         context = self.__get_tap_context(subcontext)
-        self.__postHeaders["Content-type"] = content_type
-        conn.request("POST", context, data, self.__postHeaders)
-        response = conn.getresponse()
-        self.__currentReason = response.reason
-        self.__currentStatus = response.status
-        return response
+        headers = dict(self.__postHeaders)
+        headers["Content-type"] = content_type
+        return self.__execute("POST", context, data, headers, False, verbose)
 
     def execute_secure(self, subcontext, data):
         """Executes a secure POST request
@@ -183,14 +184,46 @@ class TapConn(object):
         -------
         An HTTPS response object
         """
-        conn = self.__get_connection_secure()
         context = self.__get_server_context(subcontext)
-        self.__postHeaders["Content-type"] = CONTENT_TYPE_POST_DEFAULT
-        conn.request("POST", context, data, self.__postHeaders)
-        response = conn.getresponse()
+        headers = dict(self.__postHeaders)
+        headers["Content-type"] = CONTENT_TYPE_POST_DEFAULT
+        return self.__execute("POST", context, data, headers, True)
+
+    def __execute(self, method, context, body, headers, secure, verbose=False):
+        if secure:
+            conn = self.__get_connection_secure(verbose)
+        else:
+            conn = self.__get_connection(verbose)
+        release = getattr(self.__connectionHandler, 'release_connection', None)
+        if release is None:
+            # responses are only decoded by PooledResponse
+            headers.pop("Accept-Encoding", None)
+        # an idle keep-alive connection may have been closed by the server:
+        # in that case a GET request is sent again through a new connection.
+        # Other requests (e.g. job creation) are never sent twice, so they
+        # do not reuse idle connections
+        reused = getattr(conn, 'sock', None) is not None
+        if reused and method != "GET":
+            conn.close()
+            reused = False
+        try:
+            conn.request(method, context, body, headers)
+            response = conn.getresponse()
+        except (httplib.HTTPException, socket.error):
+            conn.close()
+            if not reused:
+                raise
+            if verbose:
+                print("Connection closed by the server, reconnecting")
+            conn.connect()
+            conn.request(method, context, body, headers)
+            response = conn.getresponse()
         self.__currentReason = response.reason
         self.__currentStatus = response.status
-        return response
+        if release is None:
+            return response
+        return PooledResponse(response,
+                              lambda reusable: release(conn, reusable))
 
     def get_response_status(self):
         """Returns the latest connection status
@@ -271,6 +304,8 @@ class TapConn(object):
         outputFormat = output_format.lower()
         if "vot" in outputFormat:
             ext += ".vot"
+        elif "fits" in outputFormat:
+            ext += ".fits"
         elif "xml" in outputFormat:
             ext += ".xml"
         elif "json" in outputFormat:
@@ -304,6 +339,8 @@ class TapConn(object):
             contentType = contentType.lower()
             if "xml" in contentType:
                 ext += ".xml"
+            elif "fits" in contentType:
+                ext += ".fits"
             elif "json" in contentType:
                 ext += ".json"
             elif "plain" in contentType:
@@ -312,10 +349,8 @@ class TapConn(object):
                 ext += ".csv"
             elif "ascii" in contentType:
                 ext += ".ascii"
-        contentEncoding = self.find_header(headers, 'Content-Encoding')
-        if contentEncoding is not None:
-            if "gzip" == contentEncoding.lower():
-                ext += ".gz"
+        # compressed bodies are decoded when read (see PooledResponse), so
+        # the Content-Encoding does not change the extension
         return ext
 
     def set_cookie(self, cookie):
@@ -442,11 +477,106 @@ class TapConn(object):
             + str(self.__connPortSsl)
 
 
+class PooledResponse(object):
+    """HTTP(s) response wrapper
+    Returns the connection to its pool once the response body has been
+    completely read, and transparently decodes gzip encoded bodies.
+    Any other attribute is taken from the wrapped response.
+    """
+
+    def __init__(self, response, release):
+        """Constructor
+
+        Parameters
+        ----------
+        response : HTTP(s) response object, mandatory
+            response to be wrapped
+        release : callable, mandatory
+            function called with a 'reusable' flag when the connection
+            that produced the response is no longer used
+        """
+        self.response = response
+        self.__release = release
+        self.__decoder = None
+        encoding = response.getheader('Content-Encoding')
+        if encoding is not None and encoding.lower() == 'gzip':
+            self.__decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if response.isclosed():
+            self.__done(True)
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def __done(self, reusable):
+        if self.__release is not None:
+            release, self.__release = self.__release, None
+            release(reusable)
+
+    def read_raw(self, amt=None):
+        """Reads the response body as received (not decoded)
+
+        Parameters
+        ----------
+        amt : int, optional, default None
+            maximum number of bytes to read, the whole body if None
+        """
+        try:
+            if amt is None:
+                data = self.response.read()
+            else:
+                data = self.response.read(amt)
+        except Exception:
+            self.__done(False)
+            raise
+        if self.response.isclosed():
+            self.__done(True)
+        return data
+
+    def read(self, amt=None):
+        """Reads the (decoded) response body
+
+        Parameters
+        ----------
+        amt : int, optional, default None
+            number of bytes to read from the connection, the whole body if
+            None. Decoded bodies may return more data than requested.
+        """
+        if self.__decoder is None:
+            return self.read_raw(amt)
+        if amt is None:
+            return self.__decoder.decompress(self.read_raw()) + \
+                self.__decoder.flush()
+        while True:
+            raw = self.read_raw(amt)
+            if not raw:
+                return self.__decoder.flush()
+            data = self.__decoder.decompress(raw)
+            if data:
+                return data
+
+    def close(self):
+        """Closes the response
+        The connection is only reused if the body was completely read
+        """
+        closed = self.response.isclosed()
+        self.response.close()
+        self.__done(closed)
+
+
 class ConnectionHandler(object):
-    def __init__(self, host, port, sslport):
+    """HTTP(s) connection handler
+    Keeps a small pool of idle keep-alive connections per protocol, so that
+    consecutive requests (e.g. job phase polling) do not open a new
+    connection each time. Safe to use from several threads.
+    """
+
+    def __init__(self, host, port, sslport, pool_size=POOL_SIZE):
         self.__connHost = host
         self.__connPort = port
         self.__connPortSsl = sslport
+        self.__poolSize = pool_size
+        self.__pools = {False: [], True: []}
+        self.__lock = threading.Lock()
 
     def get_connection(self, ishttps=False, cookie=None, verbose=False):
         if (ishttps) or (cookie is not None):
@@ -456,7 +586,44 @@ class ConnectionHandler(object):
         else:
             if verbose:
                 print("------>http")
-            return httplib.HTTPConnection(self.__connHost, self.__connPort)
+            return self.__get_pooled_connection(False)
 
     def get_connection_secure(self, verbose):
-        return httplib.HTTPSConnection(self.__connHost, self.__connPortSsl)
+        return self.__get_pooled_connection(True)
+
+    def __get_pooled_connection(self, secure):
+        with self.__lock:
+            pool = self.__pools[secure]
+            if pool:
+                return pool.pop()
+        if secure:
+            return httplib.HTTPSConnection(self.__connHost, self.__connPortSsl)
+        else:
+            return httplib.HTTPConnection(self.__connHost, self.__connPort)
+
+    def release_connection(self, conn, reusable=True):
+        """Returns a connection to the pool
+
+        Parameters
+        ----------
+        conn : HTTP(s) connection object, mandatory
+            connection obtained from this handler
+        reusable : bool, optional, default 'True'
+            'False' if the connection must be closed
+        """
+        if reusable:
+            secure = isinstance(conn, httplib.HTTPSConnection)
+            with self.__lock:
+                pool = self.__pools[secure]
+                if len(pool) < self.__poolSize and conn not in pool:
+                    pool.append(conn)
+                    return
+        conn.close()
+
+    def close(self):
+        """Closes all the idle connections"""
+        with self.__lock:
+            idle = self.__pools[False] + self.__pools[True]
+            self.__pools = {False: [], True: []}
+        for conn in idle:
+            conn.close()
@@ -58,17 +58,12 @@ class DummyResponse(object):
                 # read all
                 return v.encode(encoding='utf_8', errors='strict')
             else:
-                bodyLength = len(v)
                 if self.index < 0:
-                    return ""
-                if size >= bodyLength:
-                    size = bodyLength - 1
-                if size <= 0:
-                    return ""
+                    return b""
                 endPos = self.index + size
                 tmp = v[self.index:endPos]
                 self.index = endPos
-                if endPos >= (bodyLength - 1):
+                if endPos >= len(v):
                     self.index = -1
                 return tmp.encode(encoding='utf_8', errors='strict')
 
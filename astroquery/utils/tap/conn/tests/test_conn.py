@@ -14,11 +14,19 @@ Created on 30 jun. 2016
 
 
 """
+import gzip
+import io
 import unittest
 import os
+import socket
+import tempfile
+import threading
 
-from astroquery.utils.tap.conn.tapconn import TapConn
+from six.moves import BaseHTTPServer, socketserver
+
+from astroquery.utils.tap.conn.tapconn import TapConn, ConnectionHandler
 from astroquery.utils.tap.conn.tests.DummyConn import DummyConn
+from astroquery.utils.tap.model.job import Job
 
 
 def data_path(filename):
@@ -26,6 +34,43 @@ def data_path(filename):
     return os.path.join(data_dir, filename)
 
 
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'model',
+                            'tests', 'data', 'result_1.vot')
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        KeepAliveHandler.connections += 1
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def do_GET(self):
+        if self.path.endswith("/results/result"):
+            with open(RESULTS_FILE, 'rb') as f:
+                body = f.read()
+        else:
+            body = b"COMPLETED"
+        self.send_response(200)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            out = io.BytesIO()
+            with gzip.GzipFile(fileobj=out, mode="wb") as f:
+                f.write(body)
+            body = out.getvalue()
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class KeepAliveServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
 class ConnTest(unittest.TestCase):
 
     def test_get(self):
@@ -105,6 +150,116 @@ class ConnTest(unittest.TestCase):
         assert r.get_body() == data, \
             "Request body. Expected %s, found %s" % (data, str(r.get_body()))
 
+    def test_keep_alive(self):
+        server = KeepAliveServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        KeepAliveHandler.connections = 0
+        port = server.server_address[1]
+        handler = ConnectionHandler("127.0.0.1", port, port)
+        try:
+            tap = TapConn(ishttps=False,
+                          host="127.0.0.1",
+                          server_context="tap",
+                          port=port,
+                          connhandler=handler)
+            for i in range(5):
+                r = tap.execute_get(subcontext="async/1/phase")
+                assert r.status == 200
+                assert r.read() == b"COMPLETED"
+            assert KeepAliveHandler.connections == 1, \
+                "Expected 1 connection, found %d" % KeepAliveHandler.connections
+
+            # compressed responses are saved decoded
+            r = tap.execute_get(subcontext="async/1/phase")
+            assert r.getheader("Content-Encoding") == "gzip"
+            assert tap.get_suitable_extension(r.getheaders()) == ""
+            fd, output = tempfile.mkstemp(suffix=".txt")
+            os.close(fd)
+            try:
+                tap.dump_to_file(output, r)
+                with open(output, 'rb') as f:
+                    assert f.read() == b"COMPLETED"
+            finally:
+                os.remove(output)
+
+            # a broken idle connection is reopened
+            conn = handler.get_connection()
+            conn.sock.close()
+            handler.release_connection(conn)
+            r = tap.execute_get(subcontext="async/1/phase")
+            assert r.read() == b"COMPLETED"
+            assert KeepAliveHandler.connections == 2
+        finally:
+            handler.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_save_results(self):
+        server = KeepAliveServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        port = server.server_address[1]
+        handler = ConnectionHandler("127.0.0.1", port, port)
+        fd, output = tempfile.mkstemp(suffix=".vot")
+        os.close(fd)
+        try:
+            tap = TapConn(ishttps=False,
+                          host="127.0.0.1",
+                          server_context="tap",
+                          port=port,
+                          connhandler=handler)
+            job = Job(async_job=True, connhandler=tap)
+            job.jobid = "1"
+            job.outputFile = output
+            # the results are sent compressed and saved decoded
+            job.save_results()
+            with open(output, 'rb') as f, open(RESULTS_FILE, 'rb') as e:
+                assert f.read() == e.read()
+            chunks = list(job.iter_results(chunk_rows=2))
+            assert [len(chunk) for chunk in chunks] == [2, 1]
+        finally:
+            os.remove(output)
+            handler.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_post_not_resent(self):
+        conn = DummyConn("http")
+        sent = []
+
+        class ClosedConnection(object):
+            # idle connection closed by the server: the request is sent but
+            # no response is received
+            sock = object()
+
+            def request(self, method, url, body=None, headers=None):
+                sent.append(method)
+                conn.httpConn.request(method, url, body, headers)
+
+            def getresponse(self):
+                if self.sock is not None:
+                    raise socket.error("connection closed by the server")
+                return conn.httpConn.getresponse()
+
+            def close(self):
+                self.sock = None
+
+            def connect(self):
+                pass
+
+        conn.get_connection = lambda *args, **kwargs: ClosedConnection()
+        tap = TapConn(ishttps=False, host="testHost",
+                      server_context="testServerContext", connhandler=conn)
+        # an idle connection is not reused for a POST: it is only sent once
+        tap.execute_post(subcontext="async", data="postData")
+        assert sent == ["POST"]
+        # a GET request is sent again on a new connection
+        tap.execute_get(subcontext="async/1/phase")
+        assert sent == ["POST", "GET", "GET"]
+
     def test_login(self):
         connSecure = DummyConn("https")
         connSecure.response.status = 333
@@ -24,13 +24,42 @@ from astroquery.utils.tap.xmlparser.jobSaxParser import JobSaxParser
 from astroquery.utils.tap.xmlparser.jobListSaxParser import JobListSaxParser
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap.model.filter import Filter
+from astroquery.utils.tap import cache as tapcache
+from astroquery.utils.concurrency import get_executor
+from astropy.table import Table as APTable
+import errno
+import io
+import re
 import requests
+import socket
+import time
+import zlib
+
+from six.moves import http_client
 
 __all__ = ['Tap', 'TapPlus']
 
 VERSION = "1.0.1"
 TAP_CLIENT_ID = "aqtappy-" + VERSION
 
+# errors after which a step of a batch job (see TapPlus.launch_jobs) is
+# retried, besides server side (5xx) HTTP errors: the connection was refused,
+# reset or closed without an answer, or timed out. Other socket errors (OSError
+# on Python 3) are local failures, such as a missing upload file
+TRANSIENT_ERRORS = (socket.timeout, http_client.BadStatusLine)
+TRANSIENT_ERRNOS = (errno.ECONNREFUSED, errno.ECONNRESET, errno.ECONNABORTED,
+                    errno.EPIPE)
+# delay (seconds) before the first retry of a batch job step, doubled for
+# every following retry
+BATCH_RETRY_DELAY = 2
+
+# output formats chosen by output_format='auto', in order of preference:
+# FITS and binary VOTables are much faster to parse than TABLEDATA (see
+# Tap.compare_output_formats)
+AUTO_OUTPUT_FORMATS = (re.compile(r'fits'),
+                       re.compile(r'serialization=binary2\b'),
+                       re.compile(r'serialization=binary\b'))
+
 
 class Tap(object):
     """TAP class
@@ -67,6 +96,7 @@ class Tap(object):
         """
         self.__internalInit()
         if url is not None:
+            self.__serviceUrl = url.rstrip('/')
             protocol, host, port, server_context, tap_context = self.__parseUrl(url)
             if protocol == "http":
                 self.__connHandler = TapConn(False,
@@ -84,6 +114,11 @@ class Tap(object):
                                              port,
                                              port)
         else:
+            self.__serviceUrl = "%s://%s:%s%s%s" % (
+                "https" if default_protocol_is_https else "http", host,
+                sslport if default_protocol_is_https else port,
+                "/" + str(server_context).strip("/") if server_context else "",
+                "/" + str(tap_context).strip("/") if tap_context else "")
             self.__connHandler = TapConn(default_protocol_is_https,
                                          host,
                                          server_context,
@@ -98,6 +133,12 @@ class Tap(object):
 
     def __internalInit(self):
         self.__connHandler = None
+        self.__serviceUrl = None
+        self.__outputFormats = None
+        # cache of query results (see launch_job); the shared cache in the
+        # astroquery cache directory is used if None
+        self.result_cache = None
+        self.cache_ttl = None
 
     def load_tables(self, verbose=False):
         """Loads all public tables
@@ -164,7 +205,7 @@ class Tap(object):
     def launch_job(self, query, name=None, output_file=None,
                    output_format="votable", verbose=False,
                    dump_to_file=False, upload_resource=None,
-                   upload_table_name=None):
+                   upload_table_name=None, cache=False):
         """Launches a synchronous job
 
         Parameters
@@ -175,7 +216,9 @@ class Tap(object):
             file name where the results are saved if dumpToFile is True.
             If this parameter is not provided, the jobid is used instead
         output_format : str, optional, default 'votable'
-            results format
+            results format: a format name or MIME type supported by the
+            service, or 'auto' to use the fastest format to read among those
+            declared by the service (see get_output_formats)
         verbose : bool, optional, default 'False'
             flag to display information about the process
         dump_to_file : bool, optional, default 'False'
@@ -184,44 +227,28 @@ class Tap(object):
             resource to be uploaded to UPLOAD_SCHEMA
         upload_table_name: str, required if uploadResource is provided, default None
             resource temporary table name associated to the uploaded resource
+        cache : bool, optional, default 'False'
+            if True, the results are read from the local result cache when
+            the same query was run before, and are stored in it otherwise.
+            Ignored if dump_to_file is True
 
         Returns
         -------
         A Job object
         """
         query = taputils.set_top_in_query(query, 2000)
+        output_format = self.__resolve_output_format(output_format, verbose)
+        cacheKey = None
+        if cache and not dump_to_file:
+            cacheKey, job = self.__get_cached_job(False, query, output_format,
+                                                  upload_resource,
+                                                  upload_table_name, verbose)
+            if job is not None:
+                return job
         if verbose:
             print("Launched query: '"+str(query)+"'")
-        if upload_resource is not None:
-            if upload_table_name is None:
-                raise ValueError("Table name is required when a resource is uploaded")
-            response = self.__launchJobMultipart(query,
-                                                 upload_resource,
-                                                 upload_table_name,
-                                                 output_format,
-                                                 "sync",
-                                                 verbose,
-                                                 name)
-        else:
-            response = self.__launchJob(query,
-                                        output_format,
-                                        "sync",
-                                        verbose,
-                                        name)
-        # handle redirection
-        if response.status == 303:
-            # redirection
-            if verbose:
-                print("Redirection found")
-            location = self.__connHandler.find_header(
-                response.getheaders(),
-                "location")
-            if location is None:
-                raise requests.exceptions.HTTPError("No location found after redirection was received (303)")
-            if verbose:
-                print("Redirect to %s", location)
-            subcontext = self.__extract_sync_subcontext(location)
-            response = self.__connHandler.execute_get(subcontext)
+        response = self.__launchSyncJob(query, output_format, verbose, name,
+                                        upload_resource, upload_table_name)
         job = Job(async_job=False, query=query, connhandler=self.__connHandler)
         isError = self.__connHandler.check_launch_response_status(response,
                                                                   verbose,
@@ -247,15 +274,18 @@ class Tap(object):
             else:
                 results = utils.read_http_response(response, output_format)
                 job.set_results(results)
+                if cacheKey is not None:
+                    self.__get_result_cache().set(cacheKey, results)
             if verbose:
                 print("Query finished.")
-            job._phase = 'COMPLETED'
+            job.set_phase('COMPLETED')
         return job
 
     def launch_job_async(self, query, name=None, output_file=None,
                          output_format="votable", verbose=False,
                          dump_to_file=False, background=False,
-                         upload_resource=None, upload_table_name=None):
+                         upload_resource=None, upload_table_name=None,
+                         stream=False, cache=False):
         """Launches an asynchronous job
 
         Parameters
@@ -266,7 +296,9 @@ class Tap(object):
             file name where the results are saved if dumpToFile is True.
             If this parameter is not provided, the jobid is used instead
         output_format : str, optional, default 'votable'
-            results format
+            results format: a format name or MIME type supported by the
+            service, or 'auto' to use the fastest format to read among those
+            declared by the service (see get_output_formats)
         verbose : bool, optional, default 'False'
             flag to display information about the process
         dump_to_file : bool, optional, default 'False'
@@ -278,11 +310,27 @@ class Tap(object):
             resource to be uploaded to UPLOAD_SCHEMA
         upload_table_name: str, required if uploadResource is provided, default None
             resource temporary table name associated to the uploaded resource
+        stream : bool, optional, default 'False'
+            if True, the results are not loaded in memory: the call waits
+            until the job is finished and the results can be read
+            incrementally with Job.iter_results
+        cache : bool, optional, default 'False'
+            if True, the results are read from the local result cache when
+            the same query was run before, and are stored in it otherwise.
+            Ignored if dump_to_file, background or stream is True
 
         Returns
         -------
         A Job object
         """
+        output_format = self.__resolve_output_format(output_format, verbose)
+        cacheKey = None
+        if cache and not (dump_to_file or background or stream):
+            cacheKey, job = self.__get_cached_job(True, query, output_format,
+                                                  upload_resource,
+                                                  upload_table_name, verbose)
+            if job is not None:
+                return job
         if verbose:
             print("Launched query: '"+str(query)+"'")
         if upload_resource is not None:
@@ -318,7 +366,8 @@ class Tap(object):
             job.set_failed(True)
             if dump_to_file:
                 self.__connHandler.dump_to_file(suitableOutputFile, response)
-            raise requests.exceptions.HTTPError(response.reason)
+            raise requests.exceptions.HTTPError(response.reason,
+                                                response=response)
         else:
             location = self.__connHandler.find_header(
                 response.getheaders(),
@@ -334,11 +383,195 @@ class Tap(object):
                 # saveResults or getResults will block (not background)
                 if dump_to_file:
                     job.save_results(verbose)
+                elif stream:
+                    job.wait_for_job_end(verbose)
                 else:
-                    job.get_results()
+                    results = job.get_results()
+                    if cacheKey is not None:
+                        self.__get_result_cache().set(cacheKey, results)
                     print("Query finished.")
         return job
 
+    def __launchSyncJob(self, query, output_format, verbose, name=None,
+                        upload_resource=None, upload_table_name=None):
+        """Launches a synchronous job and returns the response holding its
+        results"""
+        if upload_resource is not None:
+            if upload_table_name is None:
+                raise ValueError("Table name is required when a resource is uploaded")
+            response = self.__launchJobMultipart(query,
+                                                 upload_resource,
+                                                 upload_table_name,
+                                                 output_format,
+                                                 "sync",
+                                                 verbose,
+                                                 name)
+        else:
+            response = self.__launchJob(query,
+                                        output_format,
+                                        "sync",
+                                        verbose,
+                                        name)
+        # handle redirection
+        if response.status == 303:
+            # redirection
+            if verbose:
+                print("Redirection found")
+            location = self.__connHandler.find_header(
+                response.getheaders(),
+                "location")
+            if location is None:
+                raise requests.exceptions.HTTPError("No location found after redirection was received (303)")
+            if verbose:
+                print("Redirect to %s", location)
+            subcontext = self.__extract_sync_subcontext(location)
+            response = self.__connHandler.execute_get(subcontext)
+        return response
+
+    def get_output_formats(self, verbose=False):
+        """Returns the output formats declared by the service in its
+        capabilities
+
+        Parameters
+        ----------
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A list of (MIME type, list of aliases) tuples
+        """
+        if self.__outputFormats is None:
+            response = self.__connHandler.execute_get("capabilities")
+            if verbose:
+                print(response.status, response.reason)
+            isError = self.__connHandler.check_launch_response_status(response,
+                                                                      verbose,
+                                                                      200)
+            if isError:
+                raise requests.exceptions.HTTPError(response.reason)
+            self.__outputFormats = taputils.read_output_formats(
+                response.read())
+        return self.__outputFormats
+
+    def __resolve_output_format(self, output_format, verbose=False):
+        """Returns the format to request for output_format ('auto' is
+        replaced by the preferred format supported by the service)"""
+        if output_format != "auto":
+            return output_format
+        try:
+            formats = self.get_output_formats(verbose)
+        except Exception as ex:
+            # no usable capabilities: the default format is always supported
+            if verbose:
+                print("Output formats not available: " + str(ex))
+            formats = []
+        for pattern in AUTO_OUTPUT_FORMATS:
+            for mime, aliases in formats:
+                for value in [mime] + aliases:
+                    if pattern.search(value.lower()):
+                        return aliases[0] if aliases else mime
+        return "votable"
+
+    def compare_output_formats(self, query, output_formats=None,
+                               verbose=False):
+        """Runs a query synchronously in several output formats, and measures
+        the size of the results, as transferred and once decoded, and the
+        time needed to download and to read them
+
+        Parameters
+        ----------
+        query : str, mandatory
+            query to be executed
+        output_formats : list of str, optional, default None
+            formats to compare. If this parameter is not provided, all the
+            formats declared by the service are compared
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A table (astropy.table) with the format, the number of bytes
+        received (compressed, if the service compresses its responses), the
+        number of bytes once decoded, the download and read times (in
+        seconds), the number of rows read and the error raised (empty if
+        none) for every format
+        """
+        if output_formats is None:
+            output_formats = [aliases[0] if aliases else mime
+                              for mime, aliases in
+                              self.get_output_formats(verbose)]
+        query = taputils.set_top_in_query(query, 2000)
+        rows = []
+        for output_format in output_formats:
+            size = decodedSize = nrows = 0
+            downloadTime = readTime = float('nan')
+            error = ""
+            try:
+                start = time.time()
+                response = self.__launchSyncJob(query, output_format, verbose)
+                isError = self.__connHandler.check_launch_response_status(
+                    response, verbose, 200)
+                if isError:
+                    raise requests.exceptions.HTTPError(response.reason)
+                # the body as transferred, decoded below
+                data = getattr(response, 'read_raw', response.read)()
+                size = len(data)
+                encoding = self.__connHandler.find_header(
+                    response.getheaders() or [], 'Content-Encoding')
+                if encoding is not None and encoding.lower() == 'gzip':
+                    data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+                downloadTime = time.time() - start
+                decodedSize = len(data)
+                start = time.time()
+                nrows = len(utils.read_http_response(io.BytesIO(data),
+                                                     output_format))
+                readTime = time.time() - start
+            except Exception as ex:
+                error = str(ex) or ex.__class__.__name__
+            if verbose:
+                print(output_format, size, decodedSize, downloadTime,
+                      readTime, error)
+            rows.append((output_format, size, decodedSize, downloadTime,
+                         readTime, nrows, error))
+        return APTable(rows=rows or None,
+                       names=('format', 'bytes', 'decoded_bytes',
+                              'download_time', 'read_time', 'rows', 'error'),
+                       dtype=(str, int, int, float, float, int, str))
+
+    def __get_result_cache(self):
+        if self.result_cache is None:
+            self.result_cache = tapcache.get_result_cache()
+        return self.result_cache
+
+    def __get_cached_job(self, async_job, query, output_format,
+                         upload_resource, upload_table_name, verbose):
+        """Returns the cache key of the query and, if its results are in the
+        cache, a finished job holding them (None otherwise)"""
+        cacheKey = tapcache.result_key(self.__serviceUrl, query,
+                                       output_format, upload_resource,
+                                       upload_table_name,
+                                       user=self._get_logged_user())
+        ttl = self.cache_ttl
+        if ttl is None:
+            ttl = tapcache.conf.ttl
+        results = self.__get_result_cache().get(cacheKey, ttl=ttl)
+        if results is None:
+            return cacheKey, None
+        if verbose:
+            print("Results of query '"+str(query)+"' read from the cache")
+        job = Job(async_job=async_job, query=query,
+                  connhandler=self.__connHandler)
+        job.parameters['format'] = output_format
+        job.set_results(results)
+        job.set_phase('COMPLETED')
+        return cacheKey, job
+
+    def _get_logged_user(self):
+        """Returns the name of the user logged in to the service, whose
+        cached results are kept apart from the others' (None if anonymous)"""
+        return None
+
     def load_async_job(self, jobid=None, name=None, verbose=False):
         """Loads an asynchronous job
 
@@ -637,6 +870,11 @@ class TapPlus(Tap):
         self.__pwd = None
         self.__isLoggedIn = False
 
+    def _get_logged_user(self):
+        if self.__isLoggedIn:
+            return self.__user
+        return None
+
     def load_tables(self, only_names=False, include_shared_tables=False,
                     verbose=False):
         """Loads all public tables
@@ -762,6 +1000,130 @@ class TapPlus(Tap):
             print(response.reason)
             raise requests.exceptions.HTTPError(response.reason)
 
+    def launch_jobs(self, queries, max_concurrent=4, output_format="votable",
+                    retries=2, timeout=None, verbose=False):
+        """Launches several asynchronous jobs concurrently
+        At most 'max_concurrent' jobs are running at any time. The results of
+        each job are loaded as soon as it is finished. The phase polling
+        and the results download of a job are retried on the same job, up to
+        'retries' times, after a connection error (refused, reset or timed
+        out) or a server side (5xx) HTTP error. A job is only submitted again
+        when the connection was refused: after any other error, the request
+        may have created a job on the server already.
+
+        Parameters
+        ----------
+        queries : list of str, mandatory
+            queries to be executed
+        max_concurrent : int, optional, default 4
+            maximum number of jobs running at the same time
+        output_format : str, optional, default 'votable'
+            results format
+        retries : int, optional, default 2
+            number of times a step of a job is retried after a transient
+            error (see above)
+        timeout : float, optional, default None
+            maximum time to wait for each job, in seconds. No limit if None
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A list of Job objects, in the order of the queries, with their
+        results loaded. Jobs that did not complete (errors, aborted, timed
+        out or failing after all the retries) are flagged as failed, have no
+        results and hold the error message in their response status.
+        """
+        queries = list(queries)
+        if len(queries) == 0:
+            return []
+
+        def run(query):
+            return self.__run_batch_job(query, output_format, retries,
+                                        timeout, verbose)
+
+        executor = get_executor(min(max_concurrent, len(queries)))
+        try:
+            return list(executor.map(run, queries))
+        finally:
+            executor.shutdown(wait=True)
+
+    def __run_batch_job(self, query, output_format, retries, timeout, verbose):
+        deadline = None if timeout is None else time.time() + timeout
+        job = None
+        try:
+            # never submitted twice, unless the server could not be reached
+            job = self.__retry_batch_step(
+                lambda: self.launch_job_async(query,
+                                              output_format=output_format,
+                                              verbose=verbose,
+                                              background=True),
+                retries, verbose, self.__is_refused_connection)
+
+            def wait():
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.time(), 0)
+                return job.wait_for_job_end(verbose, timeout=remaining)
+
+            status, phase = self.__retry_batch_step(wait, retries, verbose)
+            if phase.strip().upper() != 'COMPLETED':
+                job.set_failed(True)
+                return job
+            self.__retry_batch_step(job.get_results, retries, verbose)
+            return job
+        except Exception as ex:
+            if verbose:
+                print("Query failed: " + str(ex))
+            if job is None:
+                job = Job(async_job=True, query=query,
+                          connhandler=self.__getconnhandler())
+                job.parameters['format'] = output_format
+            job.set_failed(True)
+            job.set_response_status(self.__error_status(ex), str(ex))
+            return job
+
+    def __retry_batch_step(self, step, retries, verbose, is_retried=None):
+        """Calls step, again after transient errors (or the errors accepted
+        by is_retried), and returns its result
+        """
+        if is_retried is None:
+            is_retried = self.__is_transient_error
+        for attempt in range(retries + 1):
+            try:
+                return step()
+            except Exception as ex:
+                if attempt == retries or not is_retried(ex):
+                    raise
+                if verbose:
+                    print("Request failed (attempt " + str(attempt + 1) +
+                          "): " + str(ex))
+                time.sleep(min(BATCH_RETRY_DELAY * 2 ** attempt, 30))
+
+    def __error_status(self, error):
+        """Returns the HTTP status of the response that caused error, if any
+        """
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status',
+                       getattr(response, 'status_code', None))
+
+    def __is_transient_error(self, error):
+        status = self.__error_status(error)
+        if status is not None:
+            return status >= 500
+        if isinstance(error, requests.exceptions.HTTPError):
+            # HTTP errors without a response are protocol errors (e.g. a
+            # redirection without location)
+            return False
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        return (isinstance(error, socket.error) and
+                error.errno in TRANSIENT_ERRNOS)
+
+    def __is_refused_connection(self, error):
+        return (isinstance(error, socket.error) and
+                error.errno == errno.ECONNREFUSED)
+
     def login(self, user=None, password=None, credentials_file=None,
               verbose=False):
         """Performs a login.
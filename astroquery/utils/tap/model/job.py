@@ -15,13 +15,39 @@ Created on 30 jun. 2016
 
 """
 
+import gzip
+import heapq
+import itertools
+import os
+import re
+import threading
 import time
 
+import requests
+
+from astroquery.exceptions import TimeoutError
+from astroquery.utils.concurrency import HAS_FUTURES, Future
 from astroquery.utils.tap.model import modelutils
 from astroquery.utils.tap.xmlparser import utils
 
 __all__ = ['Job']
 
+# phase polling (see Job.wait_for_job_end): the interval between two polls
+# grows from POLL_INTERVAL by a factor POLL_BACKOFF up to MAX_POLL_INTERVAL
+POLL_INTERVAL = 0.5
+POLL_BACKOFF = 1.5
+MAX_POLL_INTERVAL = 10.0
+# maximum time (seconds) the server is asked to block waiting for a phase
+# change (UWS 1.1 'WAIT' parameter). 0 disables blocking requests
+UWS_WAIT = 30
+
+# PENDING, QUEUED, EXECUTING, COMPLETED, ERROR, ABORTED, UNKNOWN,
+# HELD, SUSPENDED, ARCHIVED:
+ACTIVE_PHASES = ("pending", "queued", "executing")
+
+UWS_PHASE_ELEMENT = re.compile(r'<(?:[\w.-]+:)?phase>\s*([A-Za-z]+)\s*<',
+                               re.IGNORECASE)
+
 
 class Job(object):
     """Job class
@@ -63,6 +89,11 @@ class Job(object):
         self.locationId = None
         self.name = None
         self.quote = None
+        self.poll_interval = POLL_INTERVAL
+        self.poll_backoff = POLL_BACKOFF
+        self.max_poll_interval = MAX_POLL_INTERVAL
+        self.uws_wait = UWS_WAIT
+        self.__uwsWaitSupported = True
 
         self.connHandler = connhandler
         self.parameters = {}
@@ -89,12 +120,23 @@ class Job(object):
 
             self.__last_phase_response_status = response.status
             if response.status != 200:
-                raise Exception(response.reason)
+                raise requests.exceptions.HTTPError(response.reason,
+                                                    response=response)
 
             self._phase = str(response.read().decode('utf-8'))
 
         return self._phase
 
+    def set_phase(self, phase):
+        """Sets the job phase locally, without contacting the server
+
+        Parameters
+        ----------
+        phase : str, mandatory
+            job phase
+        """
+        self._phase = phase
+
     def set_response_status(self, status, msg):
         """Sets the HTTP(s) connection status
 
@@ -108,6 +150,16 @@ class Job(object):
         self.__responseStatus = status
         self.__responseMsg = msg
 
+    def set_failed(self, failed):
+        """Sets the job failure flag
+
+        Parameters
+        ----------
+        failed : bool, mandatory
+            'True' if the job failed
+        """
+        self.failed = failed
+
     def get_data(self):
         """Returns the job results (Astroquery API specification)
         This method will block if the job is asynchronous and the job has not
@@ -147,6 +199,65 @@ class Job(object):
             self.__load_async_job_results()
             return self.results
 
+    def iter_results(self, chunk_rows=10000, verbose=False):
+        """Returns the job results incrementally
+        The results are read from memory, from the output file or, for
+        asynchronous jobs, from the server, and are parsed in chunks, so
+        the whole result is never held in memory when it comes from the
+        server or from a file.
+        This method will block if the job is asynchronous and the job has not
+        finished yet.
+
+        Parameters
+        ----------
+        chunk_rows : int, optional, default 10000
+            maximum number of rows of each table
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A generator of job results (astropy.table) of at most 'chunk_rows'
+        rows each.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be a positive integer")
+        outputFormat = self.parameters['format']
+        if self.results is not None:
+            for start in range(0, max(len(self.results), 1), chunk_rows):
+                yield self.results[start:start + chunk_rows]
+            return
+        if self.outputFile is not None and os.path.exists(self.outputFile):
+            if self.outputFile.endswith('.gz'):
+                f = gzip.open(self.outputFile, 'rb')
+            else:
+                f = open(self.outputFile, 'rb')
+            with f:
+                for chunk in utils.iter_http_response(f, outputFormat,
+                                                      chunk_rows):
+                    yield chunk
+            return
+        if not self.async_:
+            # sync: result is in a file
+            return
+        wjResponse, wjData = self.wait_for_job_end(verbose)
+        response = self.connHandler.execute_get(
+            "async/"+str(self.jobid)+"/results/result")
+        if verbose:
+            print(response.status, response.reason)
+            print(response.getheaders())
+        isError = self.connHandler.check_launch_response_status(response,
+                                                                  verbose,
+                                                                  200)
+        if isError:
+            print(response.reason)
+            raise requests.exceptions.HTTPError(response.reason,
+                                                response=response)
+        self._phase = wjData
+        for chunk in utils.iter_http_response(response, outputFormat,
+                                              chunk_rows):
+            yield chunk
+
     def set_results(self, results):
         """Sets the job results
 
@@ -188,33 +299,107 @@ class Job(object):
                                                                           200)
                 if isError:
                     print(response.reason)
-                    raise Exception(response.reason)
+                    raise requests.exceptions.HTTPError(response.reason,
+                                                        response=response)
                 self.connHandler.dump_to_file(output, response)
 
-    def wait_for_job_end(self, verbose=False):
+    def wait_for_job_end(self, verbose=False, timeout=None):
         """Waits until a job is finished
+        The phase is polled with an increasing interval (see poll_interval,
+        poll_backoff and max_poll_interval). While the job is running, the
+        server is asked to block until the phase changes (UWS 'WAIT'
+        parameter, up to uws_wait seconds); servers not supporting it answer
+        immediately and are polled normally.
 
         Parameters
         ----------
         verbose : bool, optional, default 'False'
             flag to display information about the process
+        timeout : float, optional, default None
+            maximum time to wait, in seconds. No limit if None
+
+        Returns
+        -------
+        The status of the last HTTP(s) response and the job phase
         """
-        currentResponse = None
-        responseData = None
+        deadline = None if timeout is None else time.time() + timeout
+        interval = self.poll_interval
+        responseData = self.get_phase(update=True)
+        currentResponse = self.__last_phase_response_status
         while True:
-            responseData = self.get_phase(update=True)
-            currentResponse = self.__last_phase_response_status
-
             lphase = responseData.lower().strip()
             if verbose:
                 print("Job " + self.jobid + " status: " + lphase)
-            if "pending" != lphase and "queued" != lphase and "executing" != lphase:
+            if lphase not in ACTIVE_PHASES:
                 break
-            # PENDING, QUEUED, EXECUTING, COMPLETED, ERROR, ABORTED, UNKNOWN,
-            # HELD, SUSPENDED, ARCHIVED:
-            time.sleep(0.5)
+            start = time.time()
+            if deadline is not None and start >= deadline:
+                raise TimeoutError("Job " + str(self.jobid) +
+                                   " not finished after " + str(timeout) +
+                                   " s (phase: " + responseData + ")")
+            # the last poll happens at the deadline
+            sleep = interval
+            if deadline is not None:
+                sleep = min(interval, deadline - start)
+            wait = self.uws_wait
+            if deadline is not None and wait:
+                wait = min(wait, int(deadline - start))
+            if wait >= 1 and self.__uwsWaitSupported:
+                phase = self.__wait_phase_change(responseData, wait)
+            else:
+                phase = None
+            if phase is None:
+                time.sleep(sleep)
+                phase = self.get_phase(update=True)
+            elif time.time() - start < sleep:
+                # the server did not block: it behaves as a normal poll
+                time.sleep(sleep - (time.time() - start))
+            responseData = phase
+            currentResponse = self.__last_phase_response_status
+            interval = min(interval * self.poll_backoff,
+                           self.max_poll_interval)
         return currentResponse, responseData
 
+    def __wait_phase_change(self, phase, wait):
+        """Blocks (server side) until the phase is no longer 'phase'
+        Returns the new phase, or None if the server does not support UWS
+        blocking requests
+        """
+        response = self.connHandler.execute_get(
+            "async/" + str(self.jobid) + "?WAIT=" + str(int(wait)) +
+            "&PHASE=" + phase.strip().upper())
+        if response.status != 200:
+            self.__uwsWaitSupported = False
+            return None
+        body = response.read()
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        match = UWS_PHASE_ELEMENT.search(body)
+        if match is None:
+            self.__uwsWaitSupported = False
+            return None
+        self._phase = match.group(1)
+        self.__last_phase_response_status = response.status
+        return self._phase
+
+    def wait_async(self, timeout=None):
+        """Waits until a job is finished, without blocking
+        The phase of all the jobs waited this way is polled from a single
+        background thread, with the backoff of wait_for_job_end.
+
+        Parameters
+        ----------
+        timeout : float, optional, default None
+            maximum time to wait, in seconds. No limit if None
+
+        Returns
+        -------
+        A future (concurrent.futures.Future) holding this job once it is
+        finished. The future raises the polling error, or a TimeoutError,
+        if the job could not be followed until its end.
+        """
+        return _poller.add(self, timeout)
+
     def __load_async_job_results(self, debug=False):
         wjResponse, wjData = self.wait_for_job_end()
         subContext = "async/" + str(self.jobid) + "/results/result"
@@ -228,13 +413,19 @@ class Job(object):
                                                                   200)
         if isError:
             print(resultsResponse.reason)
-            raise Exception(resultsResponse.reason)
+            raise requests.exceptions.HTTPError(resultsResponse.reason,
+                                                response=resultsResponse)
         else:
             outputFormat = self.parameters['format']
             results = utils.read_http_response(resultsResponse, outputFormat)
             self.set_results(results)
             self._phase = wjData
 
+    def is_finished(self):
+        """Returns 'True' if the last known phase is a final phase"""
+        return self._phase is not None and \
+            self._phase.lower().strip() not in ACTIVE_PHASES
+
     def __str__(self):
         if self.results is None:
             result = "None"
@@ -245,3 +436,89 @@ class Job(object):
             "\nOwner: " + str(self.ownerid) + \
             "\nOutput file: " + str(self.outputFile) + \
             "\nResults: " + str(result)
+
+
+class JobPoller(object):
+    """Follows the phase of many jobs from a single background thread
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__queue = []
+        self.__counter = itertools.count()
+        self.__thread = None
+
+    def add(self, job, timeout=None):
+        """Starts following a job
+
+        Parameters
+        ----------
+        job : Job, mandatory
+            job to follow
+        timeout : float, optional, default None
+            maximum time to wait, in seconds. No limit if None
+
+        Returns
+        -------
+        A future holding the job once it is finished
+        """
+        if not HAS_FUTURES:
+            raise ImportError('concurrent.futures library not found')
+        future = Future()
+        deadline = None if timeout is None else time.time() + timeout
+        self.__schedule(time.time(), job, future, job.poll_interval, deadline)
+        with self.__condition:
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__run,
+                                                 name="tap-job-poller")
+                self.__thread.daemon = True
+                self.__thread.start()
+        return future
+
+    def __schedule(self, due, job, future, interval, deadline):
+        with self.__condition:
+            heapq.heappush(self.__queue, (due, next(self.__counter), job,
+                                          future, interval, deadline))
+            self.__condition.notify()
+
+    def __next(self):
+        with self.__condition:
+            while True:
+                if not self.__queue:
+                    self.__condition.wait()
+                    continue
+                delay = self.__queue[0][0] - time.time()
+                if delay > 0:
+                    self.__condition.wait(delay)
+                    continue
+                return heapq.heappop(self.__queue)
+
+    def __run(self):
+        while True:
+            due, count, job, future, interval, deadline = self.__next()
+            if future.cancelled():
+                continue
+            try:
+                job.get_phase(update=True)
+            except Exception as ex:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(ex)
+                continue
+            if job.is_finished():
+                if future.set_running_or_notify_cancel():
+                    future.set_result(job)
+                continue
+            now = time.time()
+            if deadline is not None and now + interval > deadline:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(TimeoutError(
+                        "Job " + str(job.jobid) + " not finished (phase: " +
+                        str(job.get_phase()) + ")"))
+                continue
+            self.__schedule(now + interval, job, future,
+                            min(interval * job.poll_backoff,
+                                job.max_poll_interval),
+                            deadline)
+
+
+_poller = JobPoller()
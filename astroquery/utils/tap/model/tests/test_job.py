@@ -18,6 +18,7 @@ import unittest
 import os
 import pytest
 
+from astroquery.exceptions import TimeoutError
 from astroquery.utils.tap.model.job import Job
 from astroquery.utils.tap.conn.tests.DummyConnHandler import DummyConnHandler
 from astroquery.utils.tap.conn.tests.DummyResponse import DummyResponse
@@ -86,6 +87,127 @@ class TestJob(unittest.TestCase):
             if cn not in res.colnames:
                 self.fail(cn + " column name not found" + str(res.colnames))
 
+    def test_job_iter_results(self):
+        job = Job(async_job=True)
+        jobid = "12345"
+        job.jobid = jobid
+        job.parameters['format'] = "votable"
+        responseCheckPhase = DummyResponse()
+        responseCheckPhase.set_status_code(200)
+        responseCheckPhase.set_message("OK")
+        responseCheckPhase.set_data(method='GET',
+                                    context=None,
+                                    body='COMPLETED',
+                                    headers=None)
+        responseGetData = DummyResponse()
+        responseGetData.set_status_code(200)
+        responseGetData.set_message("OK")
+        jobContent = utils.read_file_content(data_path('result_1.vot'))
+        responseGetData.set_data(method='GET',
+                                 context=None,
+                                 body=jobContent,
+                                 headers=None)
+        connHandler = DummyConnHandler()
+        connHandler.set_response("async/"+str(jobid)+"/phase",
+                                 responseCheckPhase)
+        connHandler.set_response("async/"+str(jobid)+"/results/result",
+                                 responseGetData)
+        job.connHandler = connHandler
+
+        chunks = list(job.iter_results(chunk_rows=2))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert list(chunks[1]['source_id']) == ['c']
+        # streamed results are not kept in memory
+        assert job.results is None
+        assert job.get_phase() == 'COMPLETED'
+
+        job.set_results(job.get_results())
+        chunks = list(job.iter_results(chunk_rows=2))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+
+    def __create_polled_job(self, phase):
+        job = Job(async_job=True)
+        job.jobid = "12345"
+        job.poll_interval = 0.01
+        job.max_poll_interval = 0.05
+        responsePhase = DummyResponse()
+        responsePhase.set_status_code(200)
+        responsePhase.set_message("OK")
+        responsePhase.set_data(method='GET',
+                               context=None,
+                               body=phase,
+                               headers=None)
+        job.connHandler = DummyConnHandler()
+        job.connHandler.set_response("async/12345/phase", responsePhase)
+        return job
+
+    def test_job_wait_uws_blocking(self):
+        job = self.__create_polled_job('EXECUTING')
+        responseWait = DummyResponse()
+        responseWait.set_status_code(200)
+        responseWait.set_message("OK")
+        responseWait.set_data(method='GET',
+                              context=None,
+                              body='<uws:job><uws:jobId>12345</uws:jobId>'
+                                   '<uws:phase>COMPLETED</uws:phase>'
+                                   '</uws:job>',
+                              headers=None)
+        job.connHandler.set_response("async/12345?WAIT=30&PHASE=EXECUTING",
+                                     responseWait)
+        status, phase = job.wait_for_job_end()
+        assert status == 200
+        assert phase == 'COMPLETED'
+        assert job.is_finished()
+
+    def test_job_wait_timeout(self):
+        job = self.__create_polled_job('EXECUTING')
+        # blocking requests not supported: plain polling
+        responseWait = DummyResponse()
+        responseWait.set_status_code(400)
+        responseWait.set_message("ERROR")
+        job.connHandler.set_response("async/12345?WAIT=1&PHASE=EXECUTING",
+                                     responseWait)
+        with pytest.raises(TimeoutError):
+            job.wait_for_job_end(timeout=1.2)
+        assert not job.is_finished()
+
+    def test_job_wait_timeout_last_poll(self):
+        job = self.__create_polled_job('EXECUTING')
+        job.poll_interval = 60
+        responseCompleted = DummyResponse()
+        responseCompleted.set_status_code(200)
+        responseCompleted.set_message("OK")
+        responseCompleted.set_data(method='GET',
+                                   context=None,
+                                   body='COMPLETED',
+                                   headers=None)
+        connHandler = job.connHandler
+        executeGet = connHandler.execute_get
+
+        def execute_get(request):
+            response = executeGet(request)
+            # the job completes right after the first poll
+            connHandler.set_response("async/12345/phase", responseCompleted)
+            return response
+        connHandler.execute_get = execute_get
+        # the poll interval is longer than the timeout: the phase is checked
+        # once more when the timeout expires
+        status, phase = job.wait_for_job_end(timeout=0.2)
+        assert phase == 'COMPLETED'
+        assert job.is_finished()
+
+    def test_job_wait_async(self):
+        jobs = [self.__create_polled_job('COMPLETED') for i in range(3)]
+        futures = [job.wait_async() for job in jobs]
+        for job, future in zip(jobs, futures):
+            assert future.result(timeout=10) is job
+            assert job.get_phase() == 'COMPLETED'
+
+        job = self.__create_polled_job('QUEUED')
+        future = job.wait_async(timeout=0.1)
+        with pytest.raises(TimeoutError):
+            future.result(timeout=10)
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
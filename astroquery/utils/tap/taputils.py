@@ -16,6 +16,7 @@ Created on 30 jun. 2016
 """
 
 import re
+from xml.etree import ElementTree
 
 TAP_UTILS_QUERY_TOP_PATTERN = re.compile(
     r"\s*SELECT\s+(ALL\s+|DISTINCT\s+)?TOP\s+\d+\s+", re.IGNORECASE)
@@ -85,3 +86,34 @@ def set_top_in_query(query, top):
             p = q.find("SELECT ")
             nq = query[0:p+7] + " TOP " + str(top) + " " + query[p+7:]
         return nq
+
+
+def read_output_formats(capabilities):
+    """Reads the output formats declared in the capabilities of a service
+
+    Parameters
+    ----------
+    capabilities : str or bytes, mandatory
+        content of the VOSI capabilities document
+
+    Returns
+    -------
+    A list of (MIME type, list of aliases) tuples, in the order of the
+    document
+    """
+    formats = []
+    for element in ElementTree.fromstring(capabilities).iter():
+        if element.tag.rsplit('}', 1)[-1] != 'outputFormat':
+            continue
+        mime = None
+        aliases = []
+        for child in element:
+            tag = child.tag.rsplit('}', 1)[-1]
+            text = (child.text or '').strip()
+            if tag == 'mime' and text:
+                mime = text
+            elif tag == 'alias' and text:
+                aliases.append(text)
+        if mime is not None:
+            formats.append((mime, aliases))
+    return formats
@@ -14,16 +14,25 @@ Created on 30 jun. 2016
 
 
 """
+import errno
+import gzip
+import io
 import unittest
 import os
+import shutil
+import socket
+import tempfile
 import numpy as np
 import pytest
 
 from astroquery.utils.tap.conn.tests.DummyConnHandler import DummyConnHandler
 from astroquery.utils.tap.conn.tests.DummyResponse import DummyResponse
+from astroquery.utils.tap import core
 from astroquery.utils.tap.core import TapPlus, TAP_CLIENT_ID
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap import taputils
+from astroquery.utils.tap.cache import (get_result_cache, normalize_query,
+                                        result_key)
 
 
 def data_path(filename):
@@ -33,6 +42,12 @@ def data_path(filename):
 
 class TestTap(unittest.TestCase):
 
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
     def test_load_tables(self):
         connHandler = DummyConnHandler()
         tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
@@ -239,6 +254,130 @@ class TestTap(unittest.TestCase):
                                     None,
                                     np.int32)
 
+    def test_launch_sync_job_cache(self):
+        connHandler = DummyConnHandler()
+        tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
+        tap.result_cache = get_result_cache(self.tmpdir)
+        responseLaunchJob = DummyResponse()
+        responseLaunchJob.set_status_code(200)
+        responseLaunchJob.set_message("OK")
+        jobData = utils.read_file_content(data_path('job_1.vot'))
+        responseLaunchJob.set_data(method='POST',
+                                   context=None,
+                                   body=jobData,
+                                   headers=None)
+        connHandler.set_default_response(responseLaunchJob)
+        query = 'select top 5 * from table'
+
+        job = tap.launch_job(query, cache=True)
+        assert len(job.get_results()) == 3
+        assert tap.result_cache.stats()['entries'] == 1
+
+        # served from the cache, whatever the query layout
+        responseLaunchJob.set_status_code(500)
+        responseLaunchJob.set_message("ERROR")
+        job = tap.launch_job('select  top 5\n *  from table;', cache=True)
+        assert job.get_phase() == 'COMPLETED'
+        results = job.get_results()
+        assert len(results) == 3
+        assert results['alpha'].description == 'alpha'
+        assert tap.result_cache.hits == 1
+        with pytest.raises(Exception):
+            tap.launch_job(query)
+        with pytest.raises(Exception):
+            tap.launch_job("select top 5 * from table where a = 'x  y'",
+                           cache=True)
+
+        # results are kept apart for each logged in user
+        assert result_key("http://test:1111/tap", query, "votable",
+                          user='user') != \
+            result_key("http://test:1111/tap", query, "votable")
+        tap._TapPlus__user = 'user'
+        tap._TapPlus__isLoggedIn = True
+        with pytest.raises(Exception):
+            tap.launch_job(query, cache=True)
+        tap._TapPlus__isLoggedIn = False
+
+        # expired entries are not used
+        tap.cache_ttl = 1
+        tap.result_cache._execute("UPDATE {0} SET created = 0")
+        with pytest.raises(Exception):
+            tap.launch_job(query, cache=True)
+        assert tap.result_cache.stats()['entries'] == 0
+
+    def test_output_formats(self):
+        connHandler = DummyConnHandler()
+        tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
+        responseCapabilities = DummyResponse()
+        responseCapabilities.set_status_code(200)
+        responseCapabilities.set_message("OK")
+        responseCapabilities.set_data(
+            method='GET', context=None, headers=None,
+            body=utils.read_file_content(data_path('capabilities.xml')))
+        connHandler.set_response("capabilities", responseCapabilities)
+        assert tap.get_output_formats() == [
+            ('application/x-votable+xml', ['votable']),
+            ('application/x-votable+xml;serialization=BINARY2', []),
+            ('text/csv', ['csv']),
+            ('application/fits', ['fits'])]
+
+        responseLaunchJob = DummyResponse()
+        responseLaunchJob.set_status_code(200)
+        responseLaunchJob.set_message("OK")
+        responseLaunchJob.set_data(
+            method='POST', context=None, headers=None,
+            body=utils.read_file_content(data_path('job_1.vot')))
+        connHandler.set_default_response(responseLaunchJob)
+        with pytest.raises(Exception):
+            # the auto format is fits, and the response a VOTable
+            tap.launch_job("select top 5 * from table", output_format='auto')
+        assert "FORMAT=fits" in connHandler.get_last_request()
+
+        comparison = tap.compare_output_formats("select top 5 * from table",
+                                                ['votable', 'fits'])
+        assert list(comparison['format']) == ['votable', 'fits']
+        assert list(comparison['rows']) == [3, 0]
+        assert comparison['bytes'][0] == len(responseLaunchJob.read())
+        assert comparison['decoded_bytes'][0] == comparison['bytes'][0]
+        assert comparison['error'][0] == ''
+        assert comparison['error'][1] != ''
+
+        # compressed responses: the size transferred is reported
+        body = responseLaunchJob.read()
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb') as f:
+            f.write(body)
+        responseGzip = DummyResponse()
+        responseGzip.set_status_code(200)
+        responseGzip.set_message("OK")
+        responseGzip.set_data(method='POST', context=None, body=None,
+                              headers=[['Content-Encoding', 'gzip']])
+        responseGzip.read_raw = lambda: compressed.getvalue()
+        connHandler.set_default_response(responseGzip)
+        comparison = tap.compare_output_formats("select top 5 * from table",
+                                                ['votable'])
+        assert comparison['bytes'][0] == len(compressed.getvalue())
+        assert comparison['decoded_bytes'][0] == len(body)
+        assert comparison['rows'][0] == 3
+
+    def test_suitable_astropy_format(self):
+        format = utils.get_suitable_astropy_format
+        assert format('votable') == 'votable'
+        assert format('votable_plain') == 'votable'
+        assert format('application/x-votable+xml;serialization=BINARY2') == \
+            'votable'
+        assert format('application/fits') == 'fits'
+        assert format('csv') == 'ascii.csv'
+        assert format('text/tab-separated-values') == 'ascii.tab'
+        assert format('json') == 'json'
+
+    def test_normalize_query(self):
+        assert normalize_query(" select  *\n\tfrom t ; ") == "select * from t"
+        assert normalize_query("select 'a  b' from t") == \
+            "select 'a  b' from t"
+        assert normalize_query('select "A  B" from t') == \
+            'select "A  B" from t'
+
     def test_launch_sync_job_redirect(self):
         connHandler = DummyConnHandler()
         tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
@@ -442,6 +581,178 @@ class TestTap(unittest.TestCase):
                                     None,
                                     np.int32)
 
+    def __set_batch_job_responses(self, connHandler, query, jobid,
+                                  launchStatus=303, phase='COMPLETED'):
+        dictTmp = {
+            "REQUEST": "doQuery",
+            "LANG": "ADQL",
+            "FORMAT": "votable",
+            "tapclient": str(TAP_CLIENT_ID),
+            "PHASE": "RUN",
+            "QUERY": str(query)}
+        sortedKey = taputils.taputil_create_sorted_dict_key(dictTmp)
+        responseLaunchJob = DummyResponse()
+        responseLaunchJob.set_status_code(launchStatus)
+        responseLaunchJob.set_message("OK" if launchStatus == 303 else "ERROR")
+        responseLaunchJob.set_data(
+            method='POST',
+            context=None,
+            body=None,
+            headers=[['location', 'http://test:1111/tap/async/' + jobid]])
+        connHandler.set_response("async?" + sortedKey, responseLaunchJob)
+        if launchStatus != 303:
+            return
+        responsePhase = DummyResponse()
+        responsePhase.set_status_code(200)
+        responsePhase.set_message("OK")
+        responsePhase.set_data(method='GET',
+                               context=None,
+                               body=phase,
+                               headers=None)
+        connHandler.set_response("async/" + jobid + "/phase", responsePhase)
+        responseResultsJob = DummyResponse()
+        responseResultsJob.set_status_code(200)
+        responseResultsJob.set_message("OK")
+        responseResultsJob.set_data(
+            method='GET',
+            context=None,
+            body=utils.read_file_content(data_path('job_1.vot')),
+            headers=None)
+        connHandler.set_response("async/" + jobid + "/results/result",
+                                 responseResultsJob)
+
+    def test_launch_jobs(self):
+        connHandler = DummyConnHandler()
+        tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
+        phases = ['COMPLETED', 'ERROR', 'COMPLETED', None]
+        launchStatus = [303, 303, 303, 500]
+        queries = []
+        for i, status in enumerate(launchStatus):
+            query = 'query' + str(i)
+            queries.append(query)
+            self.__set_batch_job_responses(connHandler, query, 'job' + str(i),
+                                           status, phases[i])
+
+        jobs = tap.launch_jobs(queries, max_concurrent=2, retries=0)
+        assert [job.parameters['query'] for job in jobs] == queries
+        assert [job.jobid for job in jobs[:3]] == ['job0', 'job1', 'job2']
+        assert [job.failed for job in jobs] == [False, True, False, True]
+        assert len(jobs[0].results) == 3
+        assert len(jobs[2].results) == 3
+        assert jobs[1].results is None
+        assert jobs[3].results is None
+
+        assert tap.launch_jobs([]) == []
+
+    def test_launch_jobs_errors(self):
+        connHandler = DummyConnHandler()
+        tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
+        queries = ['query' + str(i) for i in range(4)]
+        for i, query in enumerate(queries):
+            self.__set_batch_job_responses(connHandler, query, 'job' + str(i))
+
+        # job0: a phase poll fails once (5xx, retried on the same job)
+        # job1: its phase cannot be read (4xx, not retried)
+        # job2: the results download fails once (5xx, retried)
+        # job3: its phase poll keeps failing
+        failures = {'async/job0/phase': [503],
+                    'async/job1/phase': [404, 404],
+                    'async/job2/results/result': [502],
+                    'async/job3/phase': [503] * 5}
+        gets = []
+        posts = []
+        executeGet = connHandler.execute_get
+        executePost = connHandler.execute_post
+
+        def execute_get(request):
+            gets.append(request)
+            if failures.get(request):
+                response = DummyResponse()
+                response.set_status_code(failures[request].pop())
+                response.set_message("ERROR")
+                return response
+            return executeGet(request)
+
+        def execute_post(subcontext, data):
+            posts.append(data)
+            return executePost(subcontext, data)
+
+        connHandler.execute_get = execute_get
+        connHandler.execute_post = execute_post
+        retryDelay = core.BATCH_RETRY_DELAY
+        core.BATCH_RETRY_DELAY = 0
+        try:
+            jobs = tap.launch_jobs(queries, max_concurrent=4, retries=1)
+        finally:
+            core.BATCH_RETRY_DELAY = retryDelay
+
+        # every query is submitted once: retries follow the existing job
+        assert len(posts) == 4
+        assert [job.jobid for job in jobs] == ['job0', 'job1', 'job2', 'job3']
+        assert [job.failed for job in jobs] == [False, True, False, True]
+        assert len(jobs[0].results) == 3
+        assert len(jobs[2].results) == 3
+        assert jobs[1].results is None
+        assert jobs[3].results is None
+        assert gets.count('async/job1/phase') == 1
+        assert gets.count('async/job3/phase') == 2
+        assert failures['async/job1/phase'] == [404]
+
+    def test_launch_jobs_connection_errors(self):
+        connHandler = DummyConnHandler()
+        tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
+        queries = ['query' + str(i) for i in range(4)]
+        for i, query in enumerate(queries):
+            self.__set_batch_job_responses(connHandler, query, 'job' + str(i),
+                                           launchStatus=503 if i == 1 else 303)
+
+        # query0: the connection is refused once (nothing sent, submitted
+        #         again)
+        # query1: the submission fails with a 5xx error (not submitted again)
+        # query2: the submission times out (not submitted again)
+        # job3: a local error while polling (not retried), after a
+        #       connection reset (retried)
+        postFailures = {'query0': [socket.error(errno.ECONNREFUSED,
+                                                'refused')],
+                        'query2': [socket.timeout('timed out')]}
+        getFailures = {'async/job3/phase': [IOError(errno.ENOENT, 'missing'),
+                                            socket.error(errno.ECONNRESET,
+                                                         'reset')]}
+        gets = []
+        posts = []
+        executeGet = connHandler.execute_get
+        executePost = connHandler.execute_post
+
+        def execute_get(request):
+            gets.append(request)
+            if getFailures.get(request):
+                raise getFailures[request].pop()
+            return executeGet(request)
+
+        def execute_post(subcontext, data):
+            query = data.split('QUERY=')[1].split('&')[0]
+            posts.append(query)
+            if postFailures.get(query):
+                raise postFailures[query].pop()
+            return executePost(subcontext, data)
+
+        connHandler.execute_get = execute_get
+        connHandler.execute_post = execute_post
+        retryDelay = core.BATCH_RETRY_DELAY
+        core.BATCH_RETRY_DELAY = 0
+        try:
+            jobs = tap.launch_jobs(queries, max_concurrent=4, retries=2)
+        finally:
+            core.BATCH_RETRY_DELAY = retryDelay
+
+        assert sorted(posts) == ['query0', 'query0', 'query1', 'query2',
+                                 'query3']
+        assert [job.failed for job in jobs] == [False, True, True, True]
+        assert len(jobs[0].results) == 3
+        assert jobs[1].jobid is None
+        assert jobs[2].jobid is None
+        assert gets.count('async/job3/phase') == 2
+
     def test_list_async_jobs(self):
         connHandler = DummyConnHandler()
         tap = TapPlus("http://test:1111/tap", connhandler=connHandler)
@@ -0,0 +1,315 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+=============
+TAP plus
+=============
+
+Incremental readers for TAP job results.
+
+The readers consume an HTTP(s) response (or any object with a ``read(size)``
+method) block by block and yield `astropy.table.Table` chunks of a bounded
+number of rows, so that the memory used is proportional to the chunk size
+rather than to the size of the whole result.
+
+VOTable results encoded as TABLEDATA, BINARY or BINARY2 (base64 streams) are
+split on row boundaries: every chunk is parsed as a small VOTable made of the
+original header, the rows of the chunk and the closing elements.  CSV results
+are split on lines.  Any other format is read in one go and sliced.
+
+"""
+import base64
+import io
+import math
+import re
+import struct
+
+from astropy.io import votable
+from astropy.table import Table as APTable
+
+__all__ = ['iter_votable_chunks', 'iter_csv_chunks', 'iter_table_chunks']
+
+BLOCK_SIZE = 1 << 16
+
+_DATA_START = re.compile(br'<((?:[\w.-]+:)?)(TABLEDATA|BINARY2|BINARY|FITS)\b[^>]*>')
+_STREAM_START = re.compile(br'<(?:[\w.-]+:)?STREAM\b[^>]*>')
+_TAG = re.compile(br'<(/?)([\w.:-]+)[^>]*?(/?)>')
+_COMMENT = re.compile(br'<!--.*?-->|<\?.*?\?>|<!\[CDATA\[.*?\]\]>|<!DOCTYPE[^>]*>',
+                      re.DOTALL)
+_WHITESPACE = re.compile(br'\s+')
+
+# size in bytes of the VOTable primitive types
+_DATATYPE_SIZES = {'boolean': 1, 'bit': 1, 'unsignedByte': 1, 'short': 2,
+                   'int': 4, 'long': 8, 'char': 1, 'unicodeChar': 2,
+                   'float': 4, 'double': 8, 'floatComplex': 8,
+                   'doubleComplex': 16}
+
+
+def _read_block(response):
+    block = response.read(BLOCK_SIZE)
+    if not block:
+        return b''
+    if not isinstance(block, bytes):
+        block = block.encode('utf-8')
+    return block
+
+
+def _read_all(response, buffer=b''):
+    blocks = [buffer]
+    while True:
+        block = _read_block(response)
+        if not block:
+            return b''.join(blocks)
+        blocks.append(block)
+
+
+def _closing_tags(header):
+    """Returns the closing tags of the elements left open by the header"""
+    stack = []
+    for closing, name, empty in _TAG.findall(_COMMENT.sub(b'', header)):
+        if closing:
+            if stack and stack[-1] == name:
+                stack.pop()
+        elif not empty:
+            stack.append(name)
+    return b''.join(b'</' + name + b'>' for name in reversed(stack))
+
+
+def _parse_votable(content):
+    return APTable.read(io.BytesIO(content), format='votable')
+
+
+def _slices(table, chunk_rows):
+    if len(table) == 0:
+        yield table
+    for start in range(0, len(table), chunk_rows):
+        yield table[start:start + chunk_rows]
+
+
+def iter_table_chunks(response, astropy_format, chunk_rows):
+    """Reads the whole response and yields slices of ``chunk_rows`` rows"""
+    table = APTable.read(io.BytesIO(_read_all(response)), format=astropy_format)
+    for chunk in _slices(table, chunk_rows):
+        yield chunk
+
+
+def iter_csv_chunks(response, chunk_rows):
+    """Yields tables of at most ``chunk_rows`` rows from a CSV response
+
+    Records are split on line ends, so quoted values must not contain new
+    lines.
+    """
+    buffer = b''
+    header = None
+    rows = []
+    yielded = False
+    while True:
+        block = _read_block(response)
+        buffer += block
+        lines = buffer.split(b'\n')
+        buffer = lines.pop() if block else b''
+        for line in lines:
+            if header is None:
+                header = line
+            elif line.strip():
+                rows.append(line)
+        while len(rows) >= chunk_rows:
+            chunk, rows = rows[:chunk_rows], rows[chunk_rows:]
+            yield APTable.read(b'\n'.join([header] + chunk).decode('utf-8'),
+                               format='ascii.csv', guess=False)
+            yielded = True
+        if not block:
+            break
+    if header is not None and (rows or not yielded):
+        yield APTable.read(b'\n'.join([header] + rows).decode('utf-8') + '\n',
+                           format='ascii.csv', guess=False)
+
+
+def iter_votable_chunks(response, chunk_rows):
+    """Yields tables of at most ``chunk_rows`` rows from a VOTable response
+
+    Only the first table of the document is read.
+    """
+    buffer = b''
+    match = None
+    while match is None:
+        block = _read_block(response)
+        buffer += block
+        match = _DATA_START.search(buffer)
+        if not block:
+            break
+    if match is None or match.group(2) == b'FITS':
+        for chunk in _slices(_parse_votable(_read_all(response, buffer)),
+                             chunk_rows):
+            yield chunk
+        return
+
+    prefix, encoding = match.group(1), match.group(2)
+    if encoding == b'TABLEDATA':
+        header, data = buffer[:match.end()], buffer[match.end():]
+        rows = _iter_tabledata_rows(response, data, prefix, chunk_rows)
+    else:
+        stream = None
+        while stream is None:
+            stream = _STREAM_START.search(buffer, match.end())
+            if stream is None:
+                block = _read_block(response)
+                if not block:
+                    break
+                buffer += block
+        if stream is None or b'href' in stream.group(0) or \
+                b'base64' not in stream.group(0):
+            # external or non base64 streams are not split
+            for chunk in _slices(_parse_votable(_read_all(response, buffer)),
+                                 chunk_rows):
+                yield chunk
+            return
+        header, data = buffer[:stream.end()], buffer[stream.end():]
+        rows = _iter_binary_rows(response, header, data, prefix,
+                                 encoding == b'BINARY2', chunk_rows)
+
+    closing = _closing_tags(header)
+    # a full chunk is held back until the next one is known, so that an
+    # empty last chunk is not yielded when the row count is a multiple of
+    # chunk_rows
+    pending = footer = None
+    for content, footer in rows:
+        if pending is not None:
+            if footer is not None and not content.strip():
+                content = pending
+            else:
+                yield _parse_votable(header + pending + closing)
+        pending = content
+        if footer is not None:
+            break
+    yield _parse_votable(header + (pending or b'') + (footer or closing))
+
+
+def _iter_tabledata_rows(response, data, prefix, chunk_rows):
+    """Yields (rows, footer) pairs of at most ``chunk_rows`` TR elements
+
+    ``footer`` is None except for the last pair, where it holds the end of
+    the document.
+    """
+    row_end = b'</' + prefix + b'TR>'
+    data_end = b'</' + prefix + b'TABLEDATA>'
+    nrows = 0
+    pos = 0
+    while True:
+        end = data.find(data_end)
+        limit = len(data) if end < 0 else end
+        while True:
+            found = data.find(row_end, pos, limit)
+            if found < 0:
+                break
+            pos = found + len(row_end)
+            nrows += 1
+            if nrows == chunk_rows:
+                yield data[:pos], None
+                data, pos, nrows = data[pos:], 0, 0
+                end = data.find(data_end)
+                limit = len(data) if end < 0 else end
+        if end >= 0:
+            yield data[:end], _read_all(response, data[end:])
+            return
+        # keep a possibly truncated closing tag in the buffer
+        pos = max(pos, len(data) - len(data_end))
+        block = _read_block(response)
+        if not block:
+            yield data, None
+            return
+        data += block
+
+
+def _field_sizes(header, closing):
+    """Returns (fixed size, variable element size) of every FIELD"""
+    empty = votable.parse(io.BytesIO(header + closing), verify='ignore')
+    sizes = []
+    for field in empty.get_first_table().fields:
+        itemsize = _DATATYPE_SIZES[field.datatype]
+        arraysize = field.arraysize
+        if arraysize is not None and arraysize.endswith('*'):
+            sizes.append((None, itemsize, field.datatype == 'bit'))
+            continue
+        count = 1
+        if arraysize is not None:
+            for dim in arraysize.split('x'):
+                count *= int(dim)
+        if field.datatype == 'bit':
+            sizes.append((int(math.ceil(count / 8.)), None, False))
+        else:
+            sizes.append((count * itemsize, None, False))
+    return sizes
+
+
+def _iter_binary_rows(response, header, data, prefix, binary2, chunk_rows):
+    """Yields (base64 rows, footer) pairs of at most ``chunk_rows`` rows of a
+    BINARY or BINARY2 stream
+    """
+    stream_end = b'</' + prefix + b'STREAM>'
+    sizes = _field_sizes(header, _closing_tags(header))
+    mask_size = int(math.ceil(len(sizes) / 8.)) if binary2 else 0
+    fixed_row = all(variable is None for _, variable, _ in sizes)
+    if fixed_row:
+        row_size = mask_size + sum(fixed for fixed, _, _ in sizes)
+
+    def rows_in(raw, start, max_rows):
+        """Number of complete rows (at most max_rows) and their end offset"""
+        if fixed_row:
+            if row_size == 0:
+                return 0, start
+            count = min(max_rows, (len(raw) - start) // row_size)
+            return count, start + count * row_size
+        count = 0
+        pos = start
+        while count < max_rows:
+            end = pos + mask_size
+            for fixed, itemsize, bits in sizes:
+                if fixed is not None:
+                    end += fixed
+                    continue
+                if end + 4 > len(raw):
+                    return count, pos
+                length, = struct.unpack('>I', raw[end:end + 4])
+                end += 4 + (int(math.ceil(length / 8.)) if bits
+                            else length * itemsize)
+            if end > len(raw):
+                return count, pos
+            count += 1
+            pos = end
+        return count, pos
+
+    text = b''
+    raw = b''
+    nrows = 0
+    cut = 0
+    footer = None
+    while footer is None:
+        end = data.find(stream_end)
+        if end >= 0:
+            text += _WHITESPACE.sub(b'', data[:end])
+            footer = _read_all(response, data[end:])
+            usable = len(text)
+        else:
+            # keep a possibly truncated closing tag in the buffer
+            keep = len(stream_end)
+            text += _WHITESPACE.sub(b'', data[:-keep])
+            data = data[-keep:]
+            usable = len(text) - len(text) % 4
+        raw += base64.b64decode(text[:usable])
+        text = text[usable:]
+
+        while True:
+            count, pos = rows_in(raw, cut, chunk_rows - nrows)
+            nrows += count
+            cut = pos
+            if nrows < chunk_rows:
+                break
+            yield base64.b64encode(raw[:cut]), None
+            raw, cut, nrows = raw[cut:], 0, 0
+
+        if footer is None:
+            block = _read_block(response)
+            if not block:
+                footer = b''
+            data += block
+    yield base64.b64encode(raw[:cut]), footer or None
@@ -0,0 +1,95 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import io
+import os
+
+import numpy as np
+import pytest
+from astropy.io.votable import from_table
+from astropy.table import Table, vstack
+
+from astroquery.utils.tap.xmlparser import streamparser, utils
+
+
+def data_path(filename):
+    data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'model',
+                            'tests', 'data')
+    return os.path.join(data_dir, filename)
+
+
+def make_votable(encoding, nrows=25):
+    table = Table(masked=True)
+    table['id'] = np.arange(nrows, dtype=np.int64)
+    table['ra'] = np.linspace(0, 360, nrows)
+    table['name'] = ['source_%d' % i for i in range(nrows)]
+    table['flag'] = np.arange(nrows) % 2 == 0
+    table['ra'].mask = np.arange(nrows) % 7 == 3
+    table['ra'].unit = 'deg'
+    votable = from_table(table)
+    output = io.BytesIO()
+    votable.to_xml(output, tabledata_format=encoding)
+    return output.getvalue()
+
+
+def assert_same_table(chunks, expected):
+    result = vstack(chunks) if len(chunks) > 1 else chunks[0]
+    assert result.colnames == expected.colnames
+    assert len(result) == len(expected)
+    for name in expected.colnames:
+        assert np.all(result[name] == expected[name])
+
+
+@pytest.mark.parametrize('encoding', ['tabledata', 'binary', 'binary2'])
+@pytest.mark.parametrize('block_size', [7, 1 << 16])
+@pytest.mark.parametrize('chunk_rows', [1, 4, 25, 100])
+def test_votable_chunks(monkeypatch, encoding, block_size, chunk_rows):
+    monkeypatch.setattr(streamparser, 'BLOCK_SIZE', block_size)
+    content = make_votable(encoding)
+    expected = utils.read_http_response(io.BytesIO(content), 'votable')
+
+    chunks = list(utils.iter_http_response(io.BytesIO(content), 'votable',
+                                           chunk_rows=chunk_rows))
+
+    assert len(chunks) == -(-25 // chunk_rows)
+    assert all(len(chunk) <= chunk_rows for chunk in chunks)
+    assert_same_table(chunks, expected)
+    assert chunks[0]['ra'].unit == 'deg'
+    assert chunks[-1]['ra'].mask.sum() == expected['ra'][-len(chunks[-1]):].mask.sum()
+
+
+@pytest.mark.parametrize('block_size', [5, 1 << 16])
+def test_gaia_binary2_result(monkeypatch, block_size):
+    monkeypatch.setattr(streamparser, 'BLOCK_SIZE', block_size)
+    with open(data_path('result_1.vot'), 'rb') as f:
+        expected = utils.read_http_response(f, 'votable')
+    with open(data_path('result_1.vot'), 'rb') as f:
+        chunks = list(utils.iter_http_response(f, 'votable', chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert_same_table(chunks, expected)
+
+
+def test_empty_votable():
+    chunks = list(utils.iter_http_response(
+        io.BytesIO(make_votable('binary2', nrows=0)), 'votable'))
+    assert len(chunks) == 1
+    assert len(chunks[0]) == 0
+    assert chunks[0].colnames == ['id', 'ra', 'name', 'flag']
+
+
+@pytest.mark.parametrize('block_size', [3, 1 << 16])
+def test_csv_chunks(monkeypatch, block_size):
+    monkeypatch.setattr(streamparser, 'BLOCK_SIZE', block_size)
+    content = b'a,b\n1,x\n2,y\n3,z\n'
+    chunks = list(utils.iter_http_response(io.BytesIO(content), 'csv',
+                                           chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert list(vstack(chunks)['a']) == [1, 2, 3]
+
+    chunks = list(utils.iter_http_response(io.BytesIO(b'a,b\n'), 'csv'))
+    assert len(chunks) == 1
+    assert len(chunks[0]) == 0
+
+
+def test_invalid_chunk_rows():
+    with pytest.raises(ValueError):
+        list(utils.iter_http_response(io.BytesIO(b''), 'votable',
+                                      chunk_rows=0))
@@ -20,6 +20,8 @@ from astropy import units as u
 from astropy.table import Table as APTable
 import six
 
+from astroquery.utils.tap.xmlparser import streamparser
+
 
 def util_create_string_from_buffer(buffer):
     if six.PY2:
@@ -32,32 +34,96 @@ def util_create_string_from_buffer(buffer):
 
 def read_http_response(response, outputFormat, correct_units=True):
     astropyFormat = get_suitable_astropy_format(outputFormat)
+    # the format is known: no guessing, and the C reader for text tables
+    kwargs = {}
+    if astropyFormat.startswith("ascii."):
+        kwargs = {'guess': False, 'fast_reader': True}
     if six.PY2:
         # 2.7
-        result = APTable.read(response, format=astropyFormat)
+        result = APTable.read(response, format=astropyFormat, **kwargs)
     else:
         # 3.0
         # If we want to use astropy.table, we have to read the data
         data = io.BytesIO(response.read())
-        result = APTable.read(data, format=astropyFormat)
+        result = APTable.read(data, format=astropyFormat, **kwargs)
 
     if correct_units:
-        for cn in result.colnames:
-            col = result[cn]
-            if isinstance(col.unit, u.UnrecognizedUnit):
-                try:
-                    col.unit = u.Unit(col.unit.name.replace(".", " ").replace("'", ""))
-                except Exception as ex:
-                    pass
-            elif isinstance(col.unit, str):
-                col.unit = col.unit.replace(".", " ").replace("'", "")
+        correct_table_units(result)
 
     return result
 
 
+def iter_http_response(response, outputFormat, chunk_rows=10000,
+                       correct_units=True):
+    """Reads a TAP result incrementally
+
+    Parameters
+    ----------
+    response : HTTP(s) response or file object, mandatory
+        object providing the result through a 'read(size)' method
+    outputFormat : str, mandatory
+        result format ('votable', 'votable_plain', 'csv', 'fits'...)
+    chunk_rows : int, optional, default 10000
+        maximum number of rows of each yielded table
+    correct_units : bool, optional, default 'True'
+        flag to fix the column units, as done by read_http_response
+
+    Returns
+    -------
+    A generator of astropy.table objects holding at most 'chunk_rows' rows
+    each. At least one (possibly empty) table is produced.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive integer")
+    astropyFormat = get_suitable_astropy_format(outputFormat)
+    if astropyFormat == "votable":
+        chunks = streamparser.iter_votable_chunks(response, chunk_rows)
+    elif astropyFormat == "ascii.csv":
+        chunks = streamparser.iter_csv_chunks(response, chunk_rows)
+    else:
+        chunks = streamparser.iter_table_chunks(response, astropyFormat,
+                                                chunk_rows)
+    for chunk in chunks:
+        if correct_units:
+            correct_table_units(chunk)
+        yield chunk
+
+
+def correct_table_units(table):
+    for cn in table.colnames:
+        col = table[cn]
+        if isinstance(col.unit, u.UnrecognizedUnit):
+            try:
+                col.unit = u.Unit(col.unit.name.replace(".", " ").replace("'", ""))
+            except Exception as ex:
+                pass
+        elif isinstance(col.unit, str):
+            col.unit = col.unit.replace(".", " ").replace("'", "")
+
+
 def get_suitable_astropy_format(outputFormat):
-    if "csv" == outputFormat:
+    """Returns the astropy reader of a TAP output format
+
+    Parameters
+    ----------
+    outputFormat : str, mandatory
+        TAP output format, either a short name ('votable', 'votable_plain',
+        'fits', 'csv'...) or a MIME type
+        ('application/x-votable+xml;serialization=BINARY2'...)
+
+    Returns
+    -------
+    The astropy.table format name
+    """
+    fmt = outputFormat.lower()
+    if "votable" in fmt:
+        return "votable"
+    if "fits" in fmt:
+        return "fits"
+    if "csv" in fmt:
         return "ascii.csv"
+    if "tsv" in fmt or "tab-separated" in fmt:
+        return "ascii.tab"
     return outputFormat
 
 
@@ -1,12 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 from collections import OrderedDict
+import gzip
 import os
 import requests
 import pytest
 import tempfile
 import textwrap
 
+import numpy as np
 import astropy.coordinates as coord
 from six.moves import urllib
 import six
@@ -168,6 +170,35 @@ def test_TableDict_print_table_list(capsys):
                    "\n\t'2:t3' with 3 column(s) and 3 row(s) \n")
 
 
+def test_LazyTableList():
+    calls = []
+
+    def loader(table):
+        def load():
+            calls.append(table.meta['name'])
+            return table
+        return load
+
+    table_list = commons.LazyTableList([(t.meta['name'], loader(t))
+                                        for t in [t1, t2, t3]])
+    assert table_list.keys() == ['t1', 't2', 't3']
+    assert repr(table_list) == ("TableList with 3 tables:"
+                                "\n\t'0:t1' (not loaded yet)"
+                                "\n\t'1:t2' (not loaded yet)"
+                                "\n\t'2:t3' (not loaded yet)")
+    assert table_list['t2'] is t2
+    assert table_list[1] is t2
+    assert calls == ['t2']
+    assert table_list.is_loaded('t2') and not table_list.is_loaded(0)
+    assert table_list[-1] is t3
+    assert [t.meta['name'] for t in table_list[:2]] == ['t1', 't2']
+    assert table_list.load(max_workers=2) is table_list
+    assert [t.meta['name'] for t in table_list] == ['t1', 't2', 't3']
+    assert sorted(calls) == ['t1', 't2', 't3']
+    assert repr(table_list) == repr(commons.TableList(
+        create_in_odict([t1, t2, t3])))
+
+
 def create_in_odict(t_list):
     return OrderedDict([(t.meta['name'], t) for t in t_list])
 
@@ -461,6 +492,47 @@ def test_filecontainer_get(patch_getreadablefileobj):
     assert isinstance(ff, fits.HDUList)
 
 
+def test_filecontainer_memmap(tmpdir):
+    filename = tmpdir.join('image.fits').strpath
+    fits.PrimaryHDU(data=np.arange(10.)).writeto(filename)
+    with open(filename, 'rb') as f_in:
+        with gzip.open(filename + '.gz', 'wb') as f_out:
+            f_out.write(f_in.read())
+
+    ffile = commons.FileContainer(filename, encoding='binary', memmap=True)
+    ffile.prefetch()
+    assert not hasattr(ffile, '_string')
+    hdulist = ffile.get_fits()
+    assert hdulist._file.memmap
+    assert hdulist[0].data[3] == 3.
+    with open(filename, 'rb') as f:
+        assert ffile.get_string() == f.read()
+
+    # compressed files are read in memory
+    ffile = commons.FileContainer(filename + '.gz', encoding='binary',
+                                  memmap=True)
+    assert ffile.get_fits()[0].data[3] == 3.
+    assert not hasattr(ffile, '_local_path')
+
+
+def test_filecontainer_many_files(tmpdir):
+    resource = pytest.importorskip('resource')
+    filename = tmpdir.join('image.fits').strpath
+    fits.PrimaryHDU(data=np.arange(10.)).writeto(filename)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # room for the descriptors already open, but not for 500 more
+    limit = min(soft, 256)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    try:
+        hdulists = [commons.FileContainer(filename,
+                                          encoding='binary').get_fits()
+                    for i in range(500)]
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert all(hdulist[0].data[3] == 3. for hdulist in hdulists)
+
+
 @pytest.mark.parametrize(('coordinates', 'expected'),
                          [("5h0m0s 0d0m0s", True),
                           ("m1", False)
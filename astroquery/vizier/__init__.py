@@ -45,6 +45,17 @@ class Conf(_config.ConfigNamespace):
         'Maximum number of rows that will be fetched from the result '
         '(set to -1 for unlimited).')
 
+    lazy_parse = _config.ConfigItem(
+        False,
+        'Parse the tables of VOTable results only when they are first '
+        'accessed. Parsing errors are then raised when a table is accessed '
+        'instead of by the query.')
+
+    parse_workers = _config.ConfigItem(
+        1,
+        'Number of threads used to parse the tables of VOTable results when '
+        'lazy_parse is False.')
+
 
 conf = Conf()
 
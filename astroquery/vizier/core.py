@@ -6,6 +6,8 @@ import warnings
 import json
 import copy
 import re
+import threading
+from xml.sax.saxutils import unescape as xml_unescape
 
 import six
 from six import BytesIO
@@ -634,24 +636,32 @@ class VizierClass(BaseQuery):
         -------
         table_list : `astroquery.utils.TableList` or str
             If there are errors in the parsing, then returns the raw results
-            as a string.
+            as a string. With ``conf.lazy_parse``, this is a
+            `astroquery.utils.LazyTableList` whose tables are parsed when
+            first accessed, raising `~astroquery.exceptions.TableParseError`
+            on failure.
 
         """
+        def parse_error(ex):
+            self.response = response
+            self.table_parse_error = ex
+            return TableParseError("Failed to parse VIZIER result! The "
+                                   "raw response can be found in "
+                                   "self.response, and the error in "
+                                   "self.table_parse_error. The attempted "
+                                   "parsed result is in "
+                                   "self.parsed_result.\n Exception: " +
+                                   str(self.table_parse_error))
+
         if response.content[:5] == b'<?xml':
             try:
                 return parse_vizier_votable(
                     response.content, verbose=verbose, invalid=invalid,
-                    get_catalog_names=get_catalog_names)
+                    get_catalog_names=get_catalog_names,
+                    lazy=conf.lazy_parse, max_workers=conf.parse_workers,
+                    on_error=parse_error)
             except Exception as ex:
-                self.response = response
-                self.table_parse_error = ex
-                raise TableParseError("Failed to parse VIZIER result! The "
-                                      "raw response can be found in "
-                                      "self.response, and the error in "
-                                      "self.table_parse_error. The attempted "
-                                      "parsed result is in "
-                                      "self.parsed_result.\n Exception: " +
-                                      str(self.table_parse_error))
+                raise parse_error(ex)
         elif response.content[:5] == b'#\n#  ':
             return parse_vizier_tsvfile(response.content, verbose=verbose)
         elif response.content[:6] == b'SIMPLE':
@@ -693,14 +703,7 @@ def parse_vizier_tsvfile(data, verbose=False):
     return tables
 
 
-def parse_vizier_votable(data, verbose=False, invalid='warn',
-                         get_catalog_names=False):
-    """
-    Given a votable as string, parse it into dict or tables
-    """
-    if not verbose:
-        commons.suppress_vo_warnings()
-
+def _parse_votable(data, invalid):
     tf = BytesIO(data)
 
     if invalid == 'mask':
@@ -716,6 +719,147 @@ def parse_vizier_votable(data, verbose=False, invalid='warn',
     else:
         raise ValueError("Invalid keyword for 'invalid'. "
                          "Must be exception, mask, or warn")
+    return vo_tree
+
+
+_RESOURCE_RE = re.compile(br'<RESOURCE\b.*?</RESOURCE>', re.DOTALL)
+_TABLE_RE = re.compile(br'<TABLE\b([^>]*)>(.*?)</TABLE>', re.DOTALL)
+_ATTRIBUTE_RE = re.compile(
+    br'\b(name|ID|ref)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def _split_vizier_votable(data):
+    """
+    Splits a VizieR VOTable in a header, the byte ranges of its RESOURCE
+    elements and a footer, and lists the (name, resource index, table
+    index) of every TABLE holding rows.
+
+    Returns `None` if the document does not have the flat structure of
+    VizieR results (nested RESOURCEs, TABLEs referencing other TABLEs), or
+    if it holds BINARY, BINARY2 or FITS data, whose number of rows is only
+    known once parsed.
+    """
+    resources = [(m.start(), m.end()) for m in _RESOURCE_RE.finditer(data)]
+    if not resources:
+        return None
+    locations = []
+    for resource_index, (start, end) in enumerate(resources):
+        resource = data[start:end]
+        if resource.find(b'<RESOURCE', 1) >= 0:
+            return None
+        tables = list(_TABLE_RE.finditer(resource))
+        if resource.count(b'<TABLE') != \
+                len(tables) + resource.count(b'<TABLEDATA'):
+            return None
+        for table_index, table in enumerate(tables):
+            attributes = dict((key.decode('ascii'), (value1 or value2))
+                              for key, value1, value2 in
+                              _ATTRIBUTE_RE.findall(table.group(1)))
+            if 'ref' in attributes:
+                return None
+            body = table.group(2)
+            if b'<DATA' not in body:
+                continue
+            if b'<TABLEDATA' not in body:
+                return None
+            if b'<TR' not in body:
+                # empty tables are left out, as by a complete parsing
+                continue
+            name = attributes.get('name')
+            if name is not None:
+                name = xml_unescape(name.decode('utf-8'),
+                                    {'&quot;': '"', '&apos;': "'"})
+            locations.append((name, resource_index, table_index))
+    header = data[:resources[0][0]]
+    footer = data[resources[-1][1]:]
+    return header, [data[start:end] for start, end in resources], \
+        footer, locations
+
+
+def _lazy_vizier_tables(data, invalid, on_error=None):
+    """
+    Returns a `~astroquery.utils.commons.LazyTableList` of the tables of a
+    VizieR VOTable, or `None` if the document cannot be split.
+
+    Every RESOURCE is parsed on its own, as a small VOTable made of the
+    header of the document, the RESOURCE and the footer, the first time
+    one of its tables is accessed. ``on_error``, if given, is called with
+    the exception raised by a failed parsing and returns the exception to
+    raise instead.
+    """
+    split = _split_vizier_votable(data)
+    if split is None:
+        return None
+    header, resources, footer, locations = split
+
+    names = OrderedDict()
+    needed = [set() for _ in resources]
+    for name, resource_index, table_index in locations:
+        names.setdefault(name, []).append((resource_index, table_index))
+        needed[resource_index].add(table_index)
+
+    # tables of the parsed RESOURCEs not taken by their TableList entry yet
+    parsed = {}
+    locks = [threading.Lock() for _ in resources]
+
+    def get_table(resource_index, table_index):
+        with locks[resource_index]:
+            if resource_index not in parsed:
+                vo_tree = _parse_votable(
+                    header + resources[resource_index] + footer, invalid)
+                parsed[resource_index] = dict(
+                    (index, t) for index, t in enumerate(vo_tree.iter_tables())
+                    if index in needed[resource_index])
+            tables = parsed[resource_index]
+            table = tables.pop(table_index)
+            if not tables:
+                del parsed[resource_index]
+        return table
+
+    def loader(name):
+        def load():
+            try:
+                tables = [get_table(*location).to_table()
+                          for location in names[name]]
+            except Exception as ex:
+                if on_error is not None:
+                    raise on_error(ex)
+                raise TableParseError("Failed to parse table {0} of the "
+                                      "VIZIER result.\n Exception: {1}"
+                                      .format(name, ex))
+            if len(tables) > 1:
+                return tbl.vstack(tables)
+            return tables[0]
+        return load
+
+    return commons.LazyTableList([(name, loader(name)) for name in names])
+
+
+def parse_vizier_votable(data, verbose=False, invalid='warn',
+                         get_catalog_names=False, lazy=False,
+                         max_workers=1, on_error=None):
+    """
+    Given a votable as string, parse it into dict or tables
+
+    With ``lazy=True``, a `~astroquery.utils.commons.LazyTableList` is
+    returned, whose tables are only parsed when first accessed (when the
+    document can be split; it is parsed at once otherwise). A table failing
+    to parse then raises the exception returned by ``on_error(exception)``,
+    or a `~astroquery.exceptions.TableParseError`. Otherwise all the tables
+    are parsed at once, using up to ``max_workers`` threads.
+    """
+    if not verbose:
+        commons.suppress_vo_warnings()
+
+    if not get_catalog_names and (lazy or max_workers > 1):
+        table_list = _lazy_vizier_tables(data, invalid,
+                                         on_error if lazy else None)
+        if table_list is not None:
+            return table_list if lazy else \
+                commons.TableList(zip(table_list.keys(),
+                                      table_list.load(max_workers)))
+
+    vo_tree = _parse_votable(data, invalid)
 
     if get_catalog_names:
         return OrderedDict([(R.name, R) for R in vo_tree.resources])
@@ -1,13 +1,17 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import io
 import os
 import requests
 from numpy import testing as npt
 import pytest
+from astropy.io.votable.tree import (Resource, Table as VOTableTable,
+                                     VOTableFile)
 from astropy.table import Table
 import astropy.units as u
 import six
 from six.moves import urllib_parse as urlparse
 from ... import vizier
+from ...exceptions import TableParseError
 from ...utils import commons
 from ...utils.testing_tools import MockResponse
 
@@ -107,6 +111,84 @@ def test_parse_result(filepath, objlen):
     assert isinstance(result[result.keys()[0]], Table)
 
 
+@pytest.mark.parametrize(('filepath'),
+                         list(set(VO_DATA.values())))
+def test_parse_result_lazy(filepath):
+    with open(data_path(filepath), 'rb') as f:
+        table_contents = f.read()
+    eager = vizier.core.parse_vizier_votable(table_contents)
+    lazy = vizier.core.parse_vizier_votable(table_contents, lazy=True)
+    parallel = vizier.core.parse_vizier_votable(table_contents,
+                                                max_workers=4)
+    assert isinstance(lazy, commons.LazyTableList)
+    assert lazy.keys() == eager.keys() == parallel.keys()
+    assert not any(lazy.is_loaded(key) for key in lazy.keys())
+
+    key = eager.keys()[-1]
+    for result in (lazy, parallel):
+        assert result[key].colnames == eager[key].colnames
+        assert len(result[key]) == len(eager[key])
+    assert lazy.is_loaded(key)
+    assert not lazy.is_loaded(0) or len(lazy) == 1
+
+    for table, expected in zip(lazy, eager):
+        assert table.colnames == expected.colnames
+        assert len(table) == len(expected)
+
+
+def make_votable(tables, tabledata_format='tabledata'):
+    """A VizieR-like VOTable with one RESOURCE per (name, table)."""
+    votable = VOTableFile()
+    for name, table in tables:
+        resource = Resource()
+        votable.resources.append(resource)
+        vo_table = VOTableTable.from_table(votable, table)
+        vo_table.name = name
+        vo_table.format = tabledata_format
+        resource.tables.append(vo_table)
+    output = io.BytesIO()
+    votable.to_xml(output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize(('tabledata_format'), ['tabledata', 'binary'])
+def test_parse_result_lazy_empty_tables(tabledata_format):
+    data = make_votable([('full', Table({'a': [1, 2]})),
+                         ('empty', Table({'a': [1]})[:0])],
+                        tabledata_format)
+    eager = vizier.core.parse_vizier_votable(data)
+    lazy = vizier.core.parse_vizier_votable(data, lazy=True)
+    assert lazy.keys() == eager.keys() == ['full']
+    # binary data can only be split once parsed
+    assert isinstance(lazy, commons.LazyTableList) == \
+        (tabledata_format == 'tabledata')
+
+
+def test_parse_result_lazy_errors(monkeypatch):
+    with open(data_path('kang2010.xml'), 'rb') as f:
+        response = MockResponse(f.read())
+    # results are parsed when the query returns, unless asked otherwise
+    assert not vizier.conf.lazy_parse
+
+    def parse_votable(data, invalid):
+        raise ValueError('invalid VOTable')
+
+    monkeypatch.setattr(vizier.core, '_parse_votable', parse_votable)
+    viz = vizier.core.Vizier()
+    with pytest.raises(TableParseError):
+        viz._parse_result(response)
+    assert viz.response is response
+
+    viz = vizier.core.Vizier()
+    monkeypatch.setattr(vizier.conf, 'lazy_parse', True)
+    result = viz._parse_result(response)
+    assert not hasattr(viz, 'table_parse_error')
+    with pytest.raises(TableParseError):
+        result[0]
+    assert viz.response is response
+    assert str(viz.table_parse_error) == 'invalid VOTable'
+
+
 def test_query_region_async(patch_post):
     target = commons.ICRSCoordGenerator(ra=299.590, dec=35.201,
                                         unit=(u.deg, u.deg))
@@ -20,6 +20,14 @@ class Conf(_config.ConfigNamespace):
     # Config related to individual Cone Search query
     timeout = _config.ConfigItem(
         30.0, 'Time limit for connecting to Cone Search service.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Number of Cone Search requests run at the same time by search_all '
+        'and ConeSearch.query_regions.')
+    queries_per_second = _config.ConfigItem(
+        10,
+        'Maximum number of requests started per second by '
+        'ConeSearch.query_regions.')
     fallback_url = _config.ConfigItem(
         'http://gsss.stsci.edu/webservices/vo/ConeSearch.aspx?CAT=GSC23&',
         'Just ignore database above and use STScI HST Guide Star Catalog.')
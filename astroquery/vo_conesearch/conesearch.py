@@ -7,7 +7,6 @@ Support VO Simple Cone Search capabilities.
 """
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
-import six
 
 # STDLIB
 import warnings
@@ -25,7 +24,7 @@ from astropy.utils.exceptions import AstropyUserWarning
 from . import vos_catalog
 from .vo_async import AsyncBase
 from .core import ConeSearchClass, _validate_sr
-from .exceptions import ConeSearchError, VOSError
+from .exceptions import ConeSearchError, MissingCatalog, VOSError
 
 # Import configurable items declared in __init__.py
 from . import conf
@@ -88,7 +87,8 @@ class AsyncConeSearch(AsyncBase):
 
 
 def conesearch(center, radius, verb=1, catalog_db=None, pedantic=None,
-               verbose=True, cache=True, timeout=None, query_all=False):
+               verbose=True, cache=True, timeout=None, query_all=False,
+               max_workers=None, hedge=1):
     """
     Perform Cone Search and returns the result of the
     first successful query.
@@ -179,6 +179,19 @@ def conesearch(center, radius, verb=1, catalog_db=None, pedantic=None,
     query_all : bool
         This is used by :func:`search_all`.
 
+    max_workers : int or `None`
+        Number of services queried at the same time when ``query_all``
+        is `True`. If `None`, use
+        ``astroquery.vo_conesearch.conf.max_workers``.
+
+    hedge : int
+        Number of services queried at the same time when ``query_all``
+        is `False`. With the default of 1, services are tried one after
+        the other. Otherwise, the first ``hedge`` services are queried at
+        once, the next one is queried whenever one of them fails, and the
+        first valid result to arrive is returned, even if it is not from
+        the first service.
+
     Returns
     -------
     obj : `astropy.io.votable.tree.Table`
@@ -193,64 +206,54 @@ def conesearch(center, radius, verb=1, catalog_db=None, pedantic=None,
         If VO service request fails.
 
     """
-    # Not using default ConeSearch instance because the attributes are
-    # tweaked to match user inputs to this function.
-    cs = ConeSearchClass()
-
     n_timed_out = 0
     service_type = conf.conesearch_dbname
     catalogs = vos_catalog._get_catalogs(
         service_type, catalog_db, cache=cache, verbose=verbose)
-    if query_all:
-        result = {}
-    else:
-        result = None
-
-    if pedantic is not None:
-        cs.PEDANTIC = pedantic
-    if timeout is not None:
-        cs.TIMEOUT = timeout
-
-    for name, catalog in catalogs:
-        if isinstance(catalog, six.string_types):
-            if catalog.startswith('http'):
-                url = catalog
-            else:
-                remote_db = vos_catalog.get_remote_catalog_db(
-                    service_type, cache=cache, verbose=verbose)
-                catalog = remote_db.get_catalog(catalog)
-                url = catalog['url']
-        else:
-            url = catalog['url']
-
+    catalog_urls = vos_catalog._CatalogURLs(service_type, cache=cache,
+                                            verbose=verbose)
+
+    if max_workers is None:
+        max_workers = conf.max_workers
+
+    def query(catalog):
+        url = catalog_urls.url(catalog)
+        # Not using default ConeSearch instance because the attributes are
+        # tweaked to match user inputs to this function; one instance per
+        # service, as they may be queried from several threads.
+        cs = ConeSearchClass()
+        if pedantic is not None:
+            cs.PEDANTIC = pedantic
+        if timeout is not None:
+            cs.TIMEOUT = timeout
         cs.URL = url
 
         if verbose:  # pragma: no cover
             color_print('Trying {0}'.format(url), 'green')
 
-        try:
-            r = cs.query_region(center, radius, verb=verb, cache=cache,
-                                verbose=verbose)
-
-        except Exception as e:
-            err_msg = str(e)
-            vo_warn(W25, (url, err_msg))
-            if not query_all and 'ConnectTimeoutError' in err_msg:
-                n_timed_out += 1
-        else:
-            if query_all:
-                result[r.url] = r
-            else:
-                result = r
-                break
-
-    if result is None:
+        return cs.query_region(center, radius, verb=verb, cache=cache,
+                               verbose=verbose)
+
+    results, errors = vos_catalog._run_requests(
+        [catalog for name, catalog in catalogs], query, query_all=query_all,
+        max_workers=max_workers, hedge=hedge, abort_on=(MissingCatalog,))
+
+    for catalog, e in errors:
+        err_msg = str(e)
+        vo_warn(W25, (catalog_urls.label(catalog), err_msg))
+        if not query_all and 'ConnectTimeoutError' in err_msg:
+            n_timed_out += 1
+
+    if query_all:
+        return dict((r.url, r) for catalog, r in results)
+
+    if not results:
         err_msg = 'None of the available catalogs returned valid results.'
         if n_timed_out > 0:
             err_msg += ' ({0} URL(s) timed out.)'.format(n_timed_out)
         raise VOSError(err_msg)
 
-    return result
+    return results[0][1]
 
 
 class AsyncSearchAll(AsyncBase):
@@ -312,6 +315,9 @@ def search_all(*args, **kwargs):
         Could potentially take up significant run time and
         computing resources.
 
+    The services are queried concurrently, up to ``max_workers`` (see
+    :func:`conesearch`) at a time, each with its own ``timeout``.
+
     Parameters
     ----------
     args, kwargs
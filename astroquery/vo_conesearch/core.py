@@ -2,6 +2,7 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 import six
+import warnings
 from six import BytesIO
 from six.moves import urllib
 
@@ -11,11 +12,14 @@ from astropy import units as u
 from astropy.coordinates import (BaseCoordinateFrame, ICRS, SkyCoord,
                                  Longitude, Latitude)
 from astropy.io.votable import table
+from astropy.table import Column, Table, vstack
+from astropy.utils.exceptions import AstropyUserWarning
 
 from .exceptions import ConeSearchError, InvalidAccessURL
 from .vos_catalog import vo_tab_parse
 from ..query import BaseQuery
 from ..utils import commons
+from ..utils.concurrency import get_executor, RateLimiter
 
 # Import configurable items declared in __init__.py
 from . import conf
@@ -24,6 +28,9 @@ __all__ = ['ConeSearch', 'ConeSearchClass']
 
 __doctest_skip__ = ['ConeSearchClass']
 
+# shared by all the ConeSearchClass instances, to be polite to the services
+_rate_limiter = RateLimiter(conf.queries_per_second)
+
 
 class ConeSearchClass(BaseQuery):
     """
@@ -143,6 +150,140 @@ class ConeSearchClass(BaseQuery):
                                     verbose=verbose)
         return result
 
+    def query_regions(self, coordinates, radius, verb=1, cache=True,
+                      verbose=False, max_workers=None):
+        """
+        Perform Cone Searches around many positions and return all the
+        results in a single table.
+
+        The searches run concurrently, starting at most
+        ``astroquery.vo_conesearch.conf.queries_per_second`` of them per
+        second, and identical searches are only sent once. A search that
+        fails does not stop the others: a warning is issued and its
+        positions are listed in the ``errors`` metadata of the result.
+
+        Parameters
+        ----------
+        coordinates : list or `astropy.coordinates` object
+            Positions of the centers of the cones to search: an array
+            coordinate object, or a list of positions in any of the forms
+            accepted by :meth:`query_region`.
+
+        radius : float, `~astropy.units.quantity.Quantity` or list
+            Radius of the cones to search, either one for all the positions
+            or one per position, as in :meth:`query_region`.
+
+        verb : {1, 2, 3}, optional
+            Verbosity indicating how many columns are to be returned
+            in the resulting table, as in :meth:`query_region`.
+
+        cache : bool, optional
+            Use caching for VO Service database. Access to actual VO
+            websites referenced by the database still needs internet
+            connection.
+
+        verbose : bool, optional
+            Verbose output, including VO table warnings.
+
+        max_workers : int or `None`, optional
+            Number of searches run at the same time. If `None`, use
+            ``astroquery.vo_conesearch.conf.max_workers``.
+
+        Returns
+        -------
+        result : `~astropy.table.Table`
+            Stacked results of all the searches, with an ``input_index``
+            column giving the index of the position of each row.
+            Positions without any result, or whose search failed, have no
+            rows. ``result.meta['errors']`` maps the index of every position
+            whose search failed to the error message.
+
+        """
+        if (isinstance(coordinates, (SkyCoord, BaseCoordinateFrame)) and
+                not coordinates.isscalar):
+            icrscoords = coordinates.transform_to(ICRS)
+            positions = list(zip(icrscoords.ra.degree, icrscoords.dec.degree))
+        else:
+            positions = [_validate_coord(c) for c in coordinates]
+
+        if isinstance(radius, (list, tuple)) or (
+                isinstance(radius, u.Quantity) and not radius.isscalar):
+            if len(radius) != len(positions):
+                raise ConeSearchError(
+                    'There must be one radius, or one per position')
+            radii = [_validate_sr(r) for r in radius]
+        else:
+            radii = [_validate_sr(radius)] * len(positions)
+
+        v = _validate_verb(verb)
+        payloads = []
+        payload_indices = {}
+        indices = []
+        for (ra, dec), sr in zip(positions, radii):
+            payload = {'RA': ra, 'DEC': dec, 'SR': sr, 'VERB': v}
+            key = tuple(sorted(payload.items()))
+            if key not in payload_indices:
+                payload_indices[key] = len(payloads)
+                payloads.append(payload)
+            indices.append(payload_indices[key])
+
+        if self.URL.endswith('&'):
+            url = self.URL[:-1]
+        else:
+            url = self.URL
+
+        _rate_limiter.rate = conf.queries_per_second
+
+        def query(payload):
+            # errors are returned, so that one failed search does not
+            # discard the results of the others
+            _rate_limiter.wait()
+            try:
+                response = self._request('GET', url, params=payload,
+                                         timeout=self.TIMEOUT, cache=cache)
+                return self._parse_result(response, pars=payload,
+                                          verbose=verbose,
+                                          allow_empty=True).to_table()
+            except Exception as e:
+                return e
+
+        if max_workers is None:
+            max_workers = conf.max_workers
+        tables = []
+        if payloads:
+            executor = get_executor(min(max_workers, len(payloads)))
+            try:
+                tables = list(executor.map(query, payloads))
+            finally:
+                executor.shutdown(wait=True)
+
+        for payload, tab in zip(payloads, tables):
+            if isinstance(tab, Exception):
+                warnings.warn("'{0}?{1}' failed with: {2}".format(
+                    url, urllib.parse.urlencode(sorted(payload.items())), tab),
+                    AstropyUserWarning)
+
+        results = []
+        errors = {}
+        for input_index, payload_index in enumerate(indices):
+            result = tables[payload_index]
+            if isinstance(result, Exception):
+                errors[input_index] = str(result)
+                continue
+            if len(result) == 0:
+                continue
+            result = result.copy(copy_data=False)
+            result.add_column(
+                Column([input_index] * len(result), name='input_index'),
+                index=0)
+            results.append(result)
+        if results:
+            result = vstack(results, metadata_conflicts='silent')
+        else:
+            result = Table(names=['input_index'], dtype=[int])
+        result.meta['errors'] = errors
+        return result
+
     def _args_to_payload(self, coordinates, radius, verb):
         """
         Takes the arguments from any of the query functions and returns a
@@ -153,9 +294,11 @@ class ConeSearchClass(BaseQuery):
         v = _validate_verb(verb)
         return {'RA': ra, 'DEC': dec, 'SR': sr, 'VERB': v}
 
-    def _parse_result(self, response, pars={}, verbose=False):
+    def _parse_result(self, response, pars={}, verbose=False,
+                      allow_empty=False):
         """
         Parse the raw HTTP response and return it as a table.
+        An empty result is an error unless ``allow_empty`` is set.
         """
         # Suppress any VOTable related warnings.
         if not verbose:
@@ -170,6 +313,10 @@ class ConeSearchClass(BaseQuery):
         # Parse the result
         tab = table.parse(BytesIO(response.content), filename=parsed_url,
                           pedantic=self.PEDANTIC)
+        if allow_empty:
+            # vo_tab_parse only rejects empty results of non-zero radius
+            pars = dict((key, value) for key, value in six.iteritems(pars)
+                        if key.lower() != 'sr')
         return vo_tab_parse(tab, self.URL, pars)
 
 
@@ -4,7 +4,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 # STDLIB
+import io
 import os
+import threading
 import time
 
 # THIRD-PARTY
@@ -14,14 +16,17 @@ import pytest
 # ASTROPY
 from astropy import units as u
 from astropy.coordinates import ICRS, SkyCoord
+from astropy.io.votable import from_table
+from astropy.table import Table
 from astropy.tests.helper import remote_data
 from astropy.utils.data import get_pkg_data_filename
 from astropy.utils import data
+from astropy.utils.exceptions import AstropyUserWarning
 
 # LOCAL
 from .. import conf, conesearch, vos_catalog
-from ..core import _validate_coord
-from ..exceptions import VOSError, ConeSearchError
+from ..core import ConeSearchClass, _validate_coord
+from ..exceptions import VOSError, ConeSearchError, MissingCatalog
 
 __doctest_skip__ = ['*']
 
@@ -263,3 +268,144 @@ def test_validate_coord(c, ans):
     """Valid coordinates should not raise an error."""
     result = _validate_coord(c)
     np.testing.assert_allclose(result, ans)
+
+
+class FakeResult(object):
+    def __init__(self, url):
+        self.url = url
+
+
+@pytest.fixture
+def fake_services(request, monkeypatch):
+    """
+    Replace the Cone Search requests: the service at ``http://<speed>-ok?``
+    answers and ``http://<speed>-error?`` fails. ``slow`` services only
+    answer once the returned event is set, ``release`` services set it.
+    """
+    release = threading.Event()
+    request.addfinalizer(release.set)
+
+    def query_region(self, *args, **kwargs):
+        speed, status = self.URL[7:-1].split('-')
+        if speed == 'slow':
+            assert release.wait(10)
+        elif speed == 'release':
+            release.set()
+        if status == 'error':
+            raise VOSError('failed')
+        return FakeResult(self.URL)
+
+    monkeypatch.setattr(conesearch.ConeSearchClass, 'query_region',
+                        query_region)
+    return release
+
+
+def test_search_all_concurrent(fake_services):
+    # the first service only answers after the last one has been queried
+    urls = ['http://slow-ok?', 'http://fast-error?', 'http://release-ok?']
+    with pytest.warns(Warning) as warning_lines:
+        result = conesearch.search_all(SCS_CENTER, SCS_RADIUS,
+                                       catalog_db=urls, verbose=False)
+    assert list(result) == ['http://slow-ok?', 'http://release-ok?']
+    assert 'http://fast-error?' in str(warning_lines[0].message)
+
+    result = conesearch.search_all(SCS_CENTER, SCS_RADIUS, catalog_db=urls,
+                                   verbose=False, max_workers=1)
+    assert list(result) == ['http://slow-ok?', 'http://release-ok?']
+
+
+def test_conesearch_hedge(fake_services):
+    urls = ['http://slow-ok?', 'http://fast-error?', 'http://fast-ok?']
+    fake_services.set()
+    result = conesearch.conesearch(SCS_CENTER, SCS_RADIUS, catalog_db=urls,
+                                   verbose=False)
+    assert result.url == 'http://slow-ok?'
+
+    # the failure of the second service starts the third one, which answers
+    # while the first one is still blocked
+    fake_services.clear()
+    with pytest.warns(Warning):
+        result = conesearch.conesearch(SCS_CENTER, SCS_RADIUS,
+                                       catalog_db=urls, verbose=False,
+                                       hedge=2)
+    assert result.url == 'http://fast-ok?'
+    fake_services.set()
+
+    with pytest.raises(VOSError), pytest.warns(Warning):
+        conesearch.conesearch(SCS_CENTER, SCS_RADIUS, verbose=False,
+                              catalog_db=['http://fast-error?'] * 3, hedge=2)
+
+
+def test_conesearch_catalog_names(fake_services, monkeypatch):
+    """Catalog names are only resolved when their service is queried."""
+    loads = []
+
+    def get_remote_catalog_db(*args, **kwargs):
+        loads.append(args)
+        db = vos_catalog.VOSDatabase.create_empty()
+        db.add_catalog_by_url('bad', 'http://fast-error?')
+        db.add_catalog_by_url('good', 'http://fast-ok?')
+        return db
+
+    monkeypatch.setattr(vos_catalog, 'get_remote_catalog_db',
+                        get_remote_catalog_db)
+    with pytest.warns(Warning) as warning_lines:
+        result = conesearch.conesearch(SCS_CENTER, SCS_RADIUS,
+                                       catalog_db=['bad', 'good', 'missing'],
+                                       verbose=False)
+    assert result.url == 'http://fast-ok?'
+    assert 'http://fast-error?' in str(warning_lines[0].message)
+    assert len(loads) == 1
+
+    with pytest.raises(MissingCatalog):
+        conesearch.conesearch(SCS_CENTER, SCS_RADIUS, verbose=False,
+                              catalog_db=['missing', 'good'])
+
+
+def test_query_regions(monkeypatch):
+    """Many positions, with duplicates and positions without results."""
+    requests = []
+
+    class MockResponse(object):
+        def __init__(self, content):
+            self.content = content
+
+    def request(self, method, url, params=None, **kwargs):
+        requests.append(params)
+        if params['RA'] == 3:
+            raise IOError('Service unavailable')
+        nrows = int(params['RA'])
+        votable = from_table(Table({'ra': [params['RA']] * nrows,
+                                    'dec': [params['DEC']] * nrows}))
+        output = io.BytesIO()
+        votable.to_xml(output)
+        return MockResponse(output.getvalue())
+
+    monkeypatch.setattr(ConeSearchClass, '_request', request)
+    monkeypatch.setattr(conf, 'queries_per_second', 1000)
+    cs = ConeSearchClass()
+    coords = SkyCoord([2, 0, 2, 1] * u.degree, [10, 10, 10, 11] * u.degree)
+    result = cs.query_regions(coords, SCS_RADIUS, max_workers=2)
+
+    # the third position is the same as the first one
+    assert len(requests) == 3
+    assert result.colnames == ['input_index', 'ra', 'dec']
+    assert list(result['input_index']) == [0, 0, 2, 2, 3]
+    np.testing.assert_allclose(result['ra'], [2, 2, 2, 2, 1])
+
+    assert result.meta['errors'] == {}
+
+    result = cs.query_regions([(0, 0), (0, 1)], [0.1, 0.2] * u.degree)
+    assert len(result) == 0
+    assert result.colnames == ['input_index']
+
+    # a failed search does not discard the results of the others
+    coords = SkyCoord([2, 3, 1, 3] * u.degree, [10, 10, 11, 10] * u.degree)
+    with pytest.warns(AstropyUserWarning, match='Service unavailable'):
+        result = cs.query_regions(coords, SCS_RADIUS)
+    assert list(result['input_index']) == [0, 0, 2]
+    assert result.meta['errors'] == {1: 'Service unavailable',
+                                     3: 'Service unavailable'}
+
+    with pytest.raises(ConeSearchError):
+        cs.query_regions(coords, [0.1, 0.2])
@@ -13,6 +13,7 @@ from __future__ import (absolute_import, division, print_function,
 
 # STDLIB
 import os
+import threading
 
 # THIRD-PARTY
 import pytest
@@ -25,7 +26,7 @@ from astropy.utils.data import get_pkg_data_filename
 from ..exceptions import (VOSError, MissingCatalog, DuplicateCatalogName,
                           DuplicateCatalogURL)
 from ..validator import conf as validator_conf
-from ..vos_catalog import VOSCatalog, VOSDatabase
+from ..vos_catalog import VOSCatalog, VOSDatabase, _run_requests
 
 __doctest_skip__ = ['*']
 
@@ -191,6 +192,50 @@ def test_write_json(tmpdir):
     assert db.list_catalogs_by_url() == db2.list_catalogs_by_url()
 
 
+def test_run_requests():
+    """Test sequential, concurrent and hedged service requests."""
+    # the slow service only answers once released
+    release = threading.Event()
+
+    def request(url):
+        speed, status = url.split('-')
+        if speed == 'slow':
+            assert release.wait(10)
+        if status == 'error':
+            raise VOSError(url)
+        return url
+
+    urls = ['slow-ok', 'fast-error', 'fast-ok']
+    release.set()
+    for max_workers in (1, 3):
+        results, errors = _run_requests(urls, request, query_all=True,
+                                        max_workers=max_workers)
+        assert results == [('slow-ok', 'slow-ok'), ('fast-ok', 'fast-ok')]
+        assert [url for url, e in errors] == ['fast-error']
+
+    results, errors = _run_requests(urls, request)
+    assert results == [('slow-ok', 'slow-ok')]
+    assert errors == []
+
+    # the fastest valid result wins; failures start the next request
+    release.clear()
+    try:
+        results, errors = _run_requests(urls, request, hedge=2)
+    finally:
+        release.set()
+    assert results == [('fast-ok', 'fast-ok')]
+    assert [url for url, e in errors] == ['fast-error']
+
+    results, errors = _run_requests(['fast-error'] * 3, request, hedge=2)
+    assert results == []
+    assert len(errors) == 3
+
+    for hedge in (1, 2):
+        with pytest.raises(VOSError):
+            _run_requests(['fast-error', 'fast-ok'], request, hedge=hedge,
+                          abort_on=(VOSError,))
+
+
 @remote_data
 def test_db_from_registry():
     """Test database created from VO registry.
@@ -18,6 +18,7 @@ import json
 import os
 import re
 import socket
+import threading
 import warnings
 from collections import defaultdict
 from copy import deepcopy
@@ -33,6 +34,7 @@ from astropy.utils.xml.unescaper import unescape_all
 
 from .exceptions import (VOSError, MissingCatalog, DuplicateCatalogName,
                          DuplicateCatalogURL, InvalidAccessURL)
+from ..utils.concurrency import HAS_FUTURES, as_completed, get_executor
 from ..utils.url_helpers import urljoin_keep_path
 
 # Import configurable items declared in __init__.py
@@ -711,6 +713,145 @@ def _get_catalogs(service_type, catalog_db, **kwargs):
     return catalogs
 
 
+class _CatalogURLs(object):
+    """
+    Access URLs of the catalogs returned by :func:`_get_catalogs`.
+
+    Catalog names are only looked up when they are requested, in the
+    remote catalog database, which is loaded at most once.
+    """
+    def __init__(self, service_type, cache=True, verbose=True):
+        self.service_type = service_type
+        self.cache = cache
+        self.verbose = verbose
+        self._remote_db = None
+        self._urls = {}
+        self._lock = threading.Lock()
+
+    def url(self, catalog):
+        """Access URL of ``catalog``."""
+        if not isinstance(catalog, six.string_types):
+            return catalog['url']
+        if catalog.startswith('http'):
+            return catalog
+        with self._lock:
+            if catalog not in self._urls:
+                if self._remote_db is None:
+                    self._remote_db = get_remote_catalog_db(
+                        self.service_type, cache=self.cache,
+                        verbose=self.verbose)
+                self._urls[catalog] = \
+                    self._remote_db.get_catalog(catalog)['url']
+            return self._urls[catalog]
+
+    def label(self, catalog):
+        """Access URL of ``catalog`` if known, for messages."""
+        if not isinstance(catalog, six.string_types):
+            return catalog['url']
+        return self._urls.get(catalog, catalog)
+
+
+def _run_requests(catalogs, request, query_all=False, max_workers=1,
+                  hedge=1, abort_on=()):
+    """
+    Call ``request(catalog)`` for the given catalogs.
+
+    Parameters
+    ----------
+    catalogs : list
+        Catalogs or access URLs, in order of preference.
+
+    request : function
+        Function of a catalog returning the result of its service.
+
+    query_all : bool
+        Request all the catalogs, ``max_workers`` at a time. Otherwise, stop
+        at the first successful request, with up to ``hedge`` requests
+        running at a time: a catalog is only requested once the ones before
+        it have failed or while fewer than ``hedge`` requests are running.
+
+    max_workers, hedge : int
+        Number of concurrent requests; requests run in sequence, in the
+        calling thread, when 1.
+
+    abort_on : tuple of exception classes
+        Errors that are raised at once instead of moving on to the next
+        catalog.
+
+    Returns
+    -------
+    results : list of tuple
+        ``(catalog, result)`` of the successful requests, in the order of
+        ``catalogs`` (a single one, the first to succeed, unless
+        ``query_all``).
+
+    errors : list of tuple
+        ``(catalog, exception)`` of the failed requests.
+
+    """
+    results = []
+    errors = []
+    workers = min(max_workers if query_all else hedge, len(catalogs))
+
+    if workers <= 1 or not HAS_FUTURES:
+        for catalog in catalogs:
+            try:
+                result = request(catalog)
+            except abort_on:
+                raise
+            except Exception as e:
+                errors.append((catalog, e))
+            else:
+                results.append((catalog, result))
+                if not query_all:
+                    break
+        return results, errors
+
+    executor = get_executor(workers)
+    running = {}
+    try:
+        if query_all:
+            futures = [executor.submit(request, catalog)
+                       for catalog in catalogs]
+            running.update(zip(futures, catalogs))
+            for catalog, future in zip(catalogs, futures):
+                del running[future]
+                try:
+                    results.append((catalog, future.result()))
+                except abort_on:
+                    raise
+                except Exception as e:
+                    errors.append((catalog, e))
+            return results, errors
+
+        pending = iter(catalogs)
+        for catalog in pending:
+            running[executor.submit(request, catalog)] = catalog
+            if len(running) == workers:
+                break
+        while running:
+            future = next(as_completed(list(running)))
+            catalog = running.pop(future)
+            try:
+                results.append((catalog, future.result()))
+            except abort_on:
+                raise
+            except Exception as e:
+                errors.append((catalog, e))
+                for next_catalog in pending:
+                    running[executor.submit(request, next_catalog)] = \
+                        next_catalog
+                    break
+            else:
+                break
+    finally:
+        # the slower requests still running are abandoned
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=False)
+    return results, errors
+
+
 def _vo_service_request(url, pedantic, kwargs, cache=True, verbose=False):
     """
     This is called by :func:`call_vo_service`.
@@ -810,7 +951,7 @@ def vo_tab_parse(tab, url, kwargs):
 
 
 def call_vo_service(service_type, catalog_db=None, pedantic=None,
-                    verbose=True, cache=True, kwargs={}):
+                    verbose=True, cache=True, kwargs={}, hedge=1):
     """
     Makes a generic VO service call.
 
@@ -865,6 +1006,13 @@ def call_vo_service(service_type, catalog_db=None, pedantic=None,
         No checking is done that the arguments are accepted by
         the service, etc.
 
+    hedge : int
+        Number of catalogs requested at the same time. With the default
+        of 1, catalogs are tried one after the other. Otherwise, the first
+        ``hedge`` catalogs are requested at once, the next one is requested
+        whenever one of them fails, and the first valid result to arrive is
+        returned, even if it is not from the first catalog.
+
     Returns
     -------
     obj : `astropy.io.votable.tree.Table`
@@ -883,28 +1031,24 @@ def call_vo_service(service_type, catalog_db=None, pedantic=None,
     if pedantic is None:  # pragma: no cover
         pedantic = conf.pedantic
 
-    for name, catalog in catalogs:
-        if isinstance(catalog, six.string_types):
-            if catalog.startswith('http'):
-                url = catalog
-            else:
-                remote_db = get_remote_catalog_db(service_type, cache=cache,
-                                                  verbose=verbose)
-                catalog = remote_db.get_catalog(catalog)
-                url = catalog['url']
-        else:
-            url = catalog['url']
+    catalog_urls = _CatalogURLs(service_type, cache=cache, verbose=verbose)
 
+    def request(catalog):
+        url = catalog_urls.url(catalog)
         if verbose:  # pragma: no cover
             color_print('Trying {0}'.format(url), 'green')
-
-        try:
-            return _vo_service_request(url, pedantic, kwargs, cache=cache,
-                                       verbose=verbose)
-        except Exception as e:
-            vo_warn(W25, (url, str(e)))
-            if hasattr(e, 'reason') and isinstance(e.reason, socket.timeout):
-                n_timed_out += 1
+        return _vo_service_request(url, pedantic, kwargs, cache=cache,
+                                   verbose=verbose)
+
+    results, errors = _run_requests([catalog for name, catalog in catalogs],
+                                    request, hedge=hedge,
+                                    abort_on=(MissingCatalog,))
+    for catalog, e in errors:
+        vo_warn(W25, (catalog_urls.label(catalog), str(e)))
+        if hasattr(e, 'reason') and isinstance(e.reason, socket.timeout):
+            n_timed_out += 1
+    if results:
+        return results[0][1]
 
     err_msg = 'None of the available catalogs returned valid results.'
     if n_timed_out > 0: